@@ -1,17 +1,65 @@
 import json
 import re
-import difflib
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 
 import arxiv
 from google.genai import types
 
+import pdf_text
+import prefilter
+import response_schema
+import telemetry
+from harvest_cursor import HarvestCursor
+from history_store import HistoryStore
+from judgment_cache import JudgmentCache, profile_hash
+from log_store import JsonlLogStore
+from near_duplicates import NearDuplicateIndex
+from outbox import PostOutbox
+from pdf_downloader import PdfBuffer, PdfDownloader, PdfStore
+from response_schema import PaperSummary, ResponseValidator, Verdict
+from rules_engine import RuleSet
+from stage_pipeline import Stage, run_stages
+from title_index import TitleIndex
+from token_budget import DeferralQueue, TokenLedger
+from upload_cache import UploadCache
+
 
 SEARCH_QUERY = "cat:cs.LG OR cat:cs.AI OR cat:stat.ML OR cat:cs.CV OR cat:cs.NE"
 MAX_RESULTS = 3
-PAPERS_DIR = Path("papers")
-LOG_PATH = Path("log.json")
+ARXIV_PAGE_SIZE = 200
+LOG_PATH = Path("log.jsonl")
+LEGACY_LOG_PATH = Path("log.json")
+DUPLICATE_INDEX_PATH = Path("log.minhash.jsonl")
+OUTBOX_PATH = Path("outbox.jsonl")
+JUDGMENT_CACHE_PATH = Path(".cache/judgments.json")
+UPLOAD_CACHE_PATH = Path(".cache/uploads.json")
+HISTORY_DB_PATH = Path(".cache/history.db")
+HARVEST_CURSOR_PATH = Path(".cache/harvest_cursor.json")
+RULES_PATH = Path("rules.json")
+TRACE_PATH = Path(".cache/trace.json")
+DEFERRED_PATH = Path(".cache/deferred.json")
+JUDGE_MODEL = "gemini-2.5-flash-lite"
+SUMMARY_MODEL = "gemini-2.5-flash"
+JUDGE_MAX_WORKERS = 8
+JUDGE_BATCH_SIZE = 20
+JUDGE_BATCH_TOKEN_BUDGET = 12_000
+JUDGE_VERDICT_TOKENS = 200
+PREFILTER_TOP_K = 150
+PREFILTER_MIN_SCORE = 0.0
+DOWNLOAD_MAX_WORKERS = 4
+SUMMARY_MAX_WORKERS = 4
+STREAM_UPLOAD_WORKERS = 2
+STREAM_SUMMARY_WORKERS = 2
+STREAM_QUEUE_SIZE = 8
+BUDGET_SUMMARY_RESERVE = 0.6
+SUMMARY_TOKEN_ESTIMATE = 30_000
+SUMMARY_OUTPUT_ESTIMATE = 1_500
 
 INTERESTS_PROMPT = """
 - Strong Interests:
@@ -43,76 +91,94 @@ INTERESTS_PROMPT = """
 
 - Avoids / Not currently focused on:
 """
+SUMMARY_PROMPT = """
+You are an expert research analyst. You will be given a full research paper as a PDF. Your task is to extract as much valuable information as possible and provide a comprehensive but concise summary formatted as a JSON object. Each field must be at most 280 characters.
+
+Required fields:
+1. Title
+2. Field & Subfield
+3. Key Contributions (single string with bullet-style entries)
+4. Methodology
+5. Strengths
+6. Limitations
+7. Datasets / Benchmarks
+8. Results Summary
+9. Why It Matters
+10. Should Read Fully? (Yes/No)
+11. Key Figures or Tables (optional)
+"""
 
-def search_papers(client) -> list:
-    papers = _fetch_yesterdays_papers()
+@telemetry.traced("search_papers")
+def search_papers(
+    client,
+    cache: JudgmentCache | None = None,
+    history: HistoryStore | None = None,
+    cursor: HarvestCursor | None = None,
+    rules: RuleSet | None = None,
+    duplicates: NearDuplicateIndex | None = None,
+    ledger: TokenLedger | None = None,
+    deferred: DeferralQueue | None = None,
+    pdfs: PdfStore | None = None,
+    validator: ResponseValidator | None = None,
+    pending: list | None = None,
+) -> list:
+    papers = _candidate_papers(history, cursor, rules, duplicates, deferred, ledger)
     if not papers:
-        print("No machine learning papers found for yesterday\n")
         return []
 
-    reading_list = judge_papers(papers, client)
+    reading_list = judge_papers(
+        papers,
+        client,
+        cache=cache,
+        history=history,
+        rules=rules,
+        duplicates=duplicates,
+        ledger=ledger,
+        validator=validator,
+    )
     if not reading_list:
         return []
 
-    PAPERS_DIR.mkdir(exist_ok=True)
-
-    downloaded: list[arxiv.Result] = []
-    for entry in reading_list:
-        arxiv_id = _extract_arxiv_id(entry.get("id", ""))
-        if not arxiv_id:
-            print(f"Invalid arXiv ID or URL format: {entry.get('id', '')}")
-            continue
-
-        pdf = _download_pdf(arxiv_id)
-        if not pdf:
-            continue
-
-        pdf.download_pdf(dirpath=str(PAPERS_DIR), filename=f"{pdf.title}.pdf")
-        downloaded.append(pdf)
-        print(f"\rDownloaded: {len(downloaded)} papers", end="")
+    selected = _resolve_papers(reading_list, _build_registry(papers))
+    if ledger is not None and ledger.budgeted:
+        selected, later = _plan_summaries(selected, ledger)
+        if pending is not None:
+            pending.extend(later)
+        else:
+            _defer_summaries(later, len(selected), ledger)
 
-    if downloaded:
-        print()
+    downloaded = [paper for paper, _ in _download_papers(selected, pdfs)]
+    print(f"Downloaded: {len(downloaded)} papers")
+    if not downloaded and pending:
+        _defer_summaries(pending, 0, ledger)
+        pending.clear()
     return downloaded
 
-def judge_papers(papers, client, read_list=None) -> list | None:
+@telemetry.traced("judge_papers")
+def judge_papers(
+    papers,
+    client,
+    read_list=None,
+    max_workers=JUDGE_MAX_WORKERS,
+    batch_size=JUDGE_BATCH_SIZE,
+    cache: JudgmentCache | None = None,
+    history: HistoryStore | None = None,
+    rules: RuleSet | None = None,
+    duplicates: NearDuplicateIndex | None = None,
+    ledger: TokenLedger | None = None,
+    validator: ResponseValidator | None = None,
+) -> list | None:
     selections = [] if read_list is None else read_list
+    papers = list(papers)
+    validator = validator or ResponseValidator(max_repairs=0)
+    analyses = _judge_with_rules(papers, client, max_workers, batch_size, cache, rules, ledger, validator)
+    if cache is not None:
+        cache.save()
+    if history is not None:
+        history.record_judgments([(paper, analysis) for paper, analysis in zip(papers, analyses) if analysis])
+    remember_papers([paper for paper, analysis in zip(papers, analyses) if analysis], duplicates)
 
-    for paper in papers:
-        response = client.models.generate_content(
-            model="gemini-2.5-flash-lite",
-            config=types.GenerateContentConfig(
-                system_instruction=(
-                    "You are an expert AI research assistant with deep knowledge of the machine learning landscape. "
-                    "Your goal is to analyze a paper's abstract based on the user's stated research interests and provide "
-                    "a concise, structured recommendation.\n\n"
-                    "The user's interests will be provided, ranked by priority. Your analysis MUST be strictly guided by "
-                    f"these interests: {INTERESTS_PROMPT}. When rating papers, be extremely selective.\n\n"
-                    "OUTPUT REQUIREMENTS (must follow exactly):\n"
-                    "- Output EXACTLY ONE JSON object (not an array, not multiple objects).\n"
-                    "- NO markdown, NO code fences, NO surrounding text.\n"
-                    "- Keys (all required, none extra):\n"
-                    '  - "title": string\n'
-                    '  - "id": string\n'
-                    '  - "should_read": boolean\n'
-                    '  - "relevance_score": integer 1-10\n'
-                    '  - "one_sentence_summary": string\n'
-                    '  - "reasoning": string\n'
-                    '  - "keywords": array of strings\n'
-                )
-            ),
-            contents=[
-                (
-                    f"{paper.title},\n"
-                    f"{paper.entry_id},\n"
-                    f"{paper.summary},\n"
-                    f"{paper.authors},\n"
-                    f"{paper.primary_category},"
-                )
-            ],
-        )
-
-        analysis = _parse_model_response(response.text, paper.title)
+    for paper, analysis in zip(papers, analyses):
         if not analysis:
             continue
 
@@ -132,63 +198,177 @@ def judge_papers(papers, client, read_list=None) -> list | None:
 
     return sorted(selections, key=lambda item: item.get("relevance_score", 0), reverse=True)
 
-def summarize_reading_list(read_list, client) -> list:
-    system_prompt = """
-You are an expert research analyst. You will be given a full research paper as a PDF. Your task is to extract as much valuable information as possible and provide a comprehensive but concise summary formatted as a JSON object. Each field must be at most 280 characters.
+@telemetry.traced("summarize_reading_list")
+def summarize_reading_list(
+    read_list,
+    client,
+    max_workers=SUMMARY_MAX_WORKERS,
+    uploads: UploadCache | None = None,
+    ledger: TokenLedger | None = None,
+    text_tokens: int | None = None,
+    pdfs: PdfStore | None = None,
+    validator: ResponseValidator | None = None,
+    pending: list | None = None,
+) -> list[tuple[str, str]]:
+    validator = validator or ResponseValidator(max_repairs=0)
+    sources = sorted(pdfs.buffers(), key=lambda buffer: buffer.name) if pdfs is not None else []
+    if not sources and not pending:
+        return []
 
-Required fields:
-1. Title
-2. Field & Subfield
-3. Key Contributions (single string with bullet-style entries)
-4. Methodology
-5. Strengths
-6. Limitations
-7. Datasets / Benchmarks
-8. Results Summary
-9. Why It Matters
-10. Should Read Fully? (Yes/No)
-11. Key Figures or Tables (optional)
-"""
+    budgeted = ledger is not None and ledger.budgeted
+    if budgeted:
+        sources = _admit_for_summaries(sources, read_list, ledger)
+    summaries = _summarize_sources(sources, client, max_workers, uploads, text_tokens, validator)
 
-    summaries = []
-    if not PAPERS_DIR.exists():
-        return summaries
+    while budgeted and pending:
+        wave, later = _plan_summaries(pending, ledger)
+        if not wave:
+            break
+        pending[:] = later
+        downloaded = _download_papers(wave, pdfs)
+        read_list.extend(paper for paper, _ in downloaded)
+        summaries += _summarize_sources(
+            [source for _, source in downloaded], client, max_workers, uploads, text_tokens, validator
+        )
+    if budgeted and pending:
+        _defer_summaries(pending, len(summaries), ledger)
+        pending.clear()
 
-    for pdf_path in sorted(PAPERS_DIR.iterdir()):
-        if pdf_path.suffix.lower() != ".pdf":
-            continue
+    if uploads is not None:
+        uploads.save()
+    return summaries
 
-        uploaded = client.files.upload(file=str(pdf_path))
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
-            config=types.GenerateContentConfig(system_instruction=system_prompt),
-            contents=[
-                "Please analyze this research paper PDF and provide a comprehensive summary following the JSON format specified in the system instructions:",
-                uploaded,
-            ],
+def stream_reading_list(
+    client,
+    publish,
+    cache: JudgmentCache | None = None,
+    uploads: UploadCache | None = None,
+    history: HistoryStore | None = None,
+    cursor: HarvestCursor | None = None,
+    rules: RuleSet | None = None,
+    duplicates: NearDuplicateIndex | None = None,
+    ledger: TokenLedger | None = None,
+    deferred: DeferralQueue | None = None,
+    text_tokens: int | None = None,
+    validator: ResponseValidator | None = None,
+) -> list:
+    papers = _candidate_papers(history, cursor, rules, duplicates, deferred, ledger)
+    if not papers:
+        return []
+
+    validator = validator or ResponseValidator(max_repairs=0)
+    downloader = PdfDownloader(None, max_workers=DOWNLOAD_MAX_WORKERS)
+    extractor = pdf_text.extraction_pool(STREAM_UPLOAD_WORKERS) if text_tokens else None
+    log_lock = threading.Lock()
+
+    def judge(jobs: list[_PaperJob]) -> list[_PaperJob]:
+        analyses = _judge_with_rules(
+            [job.paper for job in jobs], client, 1, JUDGE_BATCH_SIZE, cache, rules, ledger, validator
         )
-        summaries.append(response.text)
-        print(response.text)
+        if history is not None:
+            history.record_judgments([(job.paper, analysis) for job, analysis in zip(jobs, analyses) if analysis])
+        remember_papers([job.paper for job, analysis in zip(jobs, analyses) if analysis], duplicates)
 
-    return summaries
+        selected = []
+        for job, analysis in zip(jobs, analyses):
+            if not analysis or not analysis.get("should_read"):
+                print(f"Skipped: {job.paper.title}")
+                continue
+            print(f"Selected: {analysis.get('title', job.paper.title)} ({analysis.get('relevance_score')}/10)")
+            job.verdict = analysis
+            selected.append(job)
+        return selected
+
+    def download(job: _PaperJob) -> _PaperJob | None:
+        if not _reserve_summary(job, ledger):
+            return None
+        try:
+            outcome = downloader.download(_download_id(job.paper), job.paper.pdf_url)
+        except Exception:
+            _release_summary(job, ledger)
+            raise
+        if outcome.error:
+            print(f"Failed to download paper with id {outcome.arxiv_id}: {outcome.error}")
+            _release_summary(job, ledger)
+            return None
+        job.pdf = outcome.buffer or outcome.path
+        return job
+
+    def upload(job: _PaperJob) -> _PaperJob | None:
+        try:
+            if extractor is not None:
+                job.text = _extract_text(extractor, job.pdf, text_tokens)
+            if job.text is None:
+                job.uploaded = _upload_pdf(job.pdf, client, uploads)
+        except Exception:
+            _release_summary(job, ledger)
+            raise
+        finally:
+            _release_pdf(job)
+        return job
+
+    def summarize(job: _PaperJob) -> _PaperJob:
+        try:
+            if job.text is not None:
+                job.summary = _summarize_text(job.text, client, job.name, validator)
+            else:
+                job.summary = _summarize_upload(job.uploaded, client, validator)
+        finally:
+            _release_summary(job, ledger)
+        print(job.summary)
+        return job
+
+    def post(job: _PaperJob) -> list | None:
+        with log_lock:
+            parsed = parse_summary([(_download_id(job.paper), job.summary)], [job.verdict], history=history)
+        if not parsed:
+            return None
+        publish(parsed)
+        return parsed[0]
+
+    failures = []
+    try:
+        parsed = run_stages(
+            (
+                [_PaperJob(paper) for paper in papers[start : start + JUDGE_BATCH_SIZE]]
+                for start in range(0, len(papers), JUDGE_BATCH_SIZE)
+            ),
+            [
+                Stage("judge", judge, workers=JUDGE_MAX_WORKERS, fan_out=True),
+                Stage("download", download, workers=DOWNLOAD_MAX_WORKERS),
+                Stage("upload", upload, workers=STREAM_UPLOAD_WORKERS),
+                Stage("summarize", summarize, workers=STREAM_SUMMARY_WORKERS),
+                Stage("post", post),
+            ],
+            queue_size=STREAM_QUEUE_SIZE,
+            failures=failures,
+        )
+    finally:
+        if extractor is not None:
+            extractor.shutdown()
+    _defer_failures(failures, ledger, deferred)
+    if cache is not None:
+        cache.save()
+    if uploads is not None:
+        uploads.save()
+    return parsed
 
-def parse_summary(summary, reading_list) -> list:
+def parse_summary(summary, reading_list, history: HistoryStore | None = None) -> list:
     parsed = []
-    log_entries = _load_log_entries()
-    reading_lookup = _build_reading_lookup(reading_list)
-    updated = False
+    documents = []
+    by_id, by_title = _build_reading_lookup(reading_list)
 
     for item in summary:
-        document = _coerce_json_document(item)
+        arxiv_id, text = item if isinstance(item, tuple) else (None, item)
+        document = _coerce_json_document(text)
         if document is None:
             continue
 
-        matched_id = _match_reading_entry(document, reading_lookup)
+        matched_id = _match_reading_entry(document, arxiv_id, by_id, by_title)
         if matched_id:
             document["arxiv_id"] = matched_id
 
-        log_entries.append(document)
-        updated = True
+        documents.append(document)
 
         kv_list = []
         for key, value in document.items():
@@ -199,25 +379,125 @@ def parse_summary(summary, reading_list) -> list:
             kv_list.append(f"{key}: {value_str}")
         parsed.append(kv_list)
 
-        if updated:
-            _write_log_entries(log_entries)
+    open_log_store().append(documents)
+    if history is not None:
+        history.record_summaries(documents, run_date=datetime.now().date().isoformat())
     return parsed
 
-def remove_downloaded_papers() -> None:
-    if not PAPERS_DIR.exists():
+def remember_papers(papers, duplicates: NearDuplicateIndex | None) -> None:
+    if duplicates is None:
         return
 
-    for path in PAPERS_DIR.iterdir():
-        if path.is_file():
-            try:
-                path.unlink()
-                print(f"Removed: {path}")
-            except OSError as exc:
-                print(f"Error removing {path}: {exc}")
+    for paper in papers:
+        duplicates.add(_download_id(paper), paper.title, _duplicate_text(paper))
+
+
+@dataclass
+class _PaperJob:
+    paper: arxiv.Result
+    verdict: dict | None = None
+    pdf: PdfBuffer | Path | None = None
+    name: str | None = None
+    uploaded: object = None
+    text: str | None = None
+    summary: str | None = None
+    reserved: tuple[int, int] | None = None
+
+
+def _candidate_papers(
+    history: HistoryStore | None,
+    cursor: HarvestCursor | None = None,
+    rules: RuleSet | None = None,
+    duplicates: NearDuplicateIndex | None = None,
+    deferred: DeferralQueue | None = None,
+    ledger: TokenLedger | None = None,
+) -> list[arxiv.Result]:
+    papers = _harvest_papers(cursor) if cursor is not None else _fetch_yesterdays_papers()
+    carried: set[str] = set()
+    if deferred is not None:
+        paper_ids = deferred.take()
+        carried = {_paper_key(paper_id) for paper_id in paper_ids}
+        papers = _with_deferred_papers(papers, paper_ids)
+    if not papers:
+        print("No machine learning papers found for yesterday\n")
+        return []
+
+    if history is not None:
+        fresh = [paper for paper in papers if not history.has_summary(paper.entry_id)]
+        if len(fresh) < len(papers):
+            print(f"Skipping {len(papers) - len(fresh)} papers that were already summarized.")
+        papers = fresh
+
+    if duplicates is not None:
+        papers = _skip_near_duplicates(papers, duplicates)
+
+    restored = [paper for paper in papers if _paper_key(paper.entry_id) in carried]
+    fresh = [paper for paper in papers if _paper_key(paper.entry_id) not in carried]
+    return restored + _prefilter_papers(fresh, rules, ranked=ledger is not None and ledger.budgeted)
+
+
+def _with_deferred_papers(papers: list[arxiv.Result], paper_ids: list[str]) -> list[arxiv.Result]:
+    known = {_paper_key(paper.entry_id) for paper in papers}
+    missing = [paper_id for paper_id in paper_ids if _paper_key(paper_id) not in known]
+    if not missing:
+        return papers
+
+    telemetry.count("api_calls.arxiv")
+    search = arxiv.Search(id_list=missing, max_results=len(missing))
+    restored = list(_arxiv_client().results(search))
+    print(f"Restored {len(restored)} papers deferred by an earlier run's budget.")
+    return restored + papers
+
+
+def _skip_near_duplicates(papers: list[arxiv.Result], duplicates: NearDuplicateIndex) -> list[arxiv.Result]:
+    fresh = []
+    for paper in papers:
+        match = duplicates.find(_duplicate_text(paper), paper.title)
+        if match is None:
+            fresh.append(paper)
+            continue
+        earlier_id, earlier_title, similarity = match
+        if _paper_key(earlier_id) == _paper_key(paper.entry_id):
+            fresh.append(paper)
+            continue
+        print(f"Skipping near-duplicate: {paper.title} matches {earlier_title} ({earlier_id}, {similarity:.0%} similar)")
+    return fresh
+
+
+def _duplicate_text(paper) -> str:
+    return f"{paper.title}\n{paper.summary}"
+
+
+@telemetry.traced("prefilter")
+def _prefilter_papers(
+    papers: list[arxiv.Result],
+    rules: RuleSet | None = None,
+    ranked: bool = False,
+) -> list[arxiv.Result]:
+    decided = [rules is not None and rules.decide(paper) is not None for paper in papers]
+    candidates = [paper for paper, is_decided in zip(papers, decided) if not is_decided]
+    if not candidates:
+        return papers
+
+    scores = prefilter.bm25_scores(
+        [f"{paper.title}\n{paper.summary}" for paper in candidates],
+        prefilter.parse_interests(INTERESTS_PROMPT),
+    )
+    indices = prefilter.select(scores, PREFILTER_TOP_K, PREFILTER_MIN_SCORE)
+    if len(indices) < len(candidates):
+        print(f"Pre-filter kept {len(indices)} of {len(candidates)} papers for judging.")
+    if ranked:
+        ranking = sorted(indices, key=lambda index: -scores[index])
+        return [paper for paper, is_decided in zip(papers, decided) if is_decided] + [
+            candidates[index] for index in ranking
+        ]
+
+    selected = {id(candidates[index]) for index in indices}
+    return [paper for paper, is_decided in zip(papers, decided) if is_decided or id(paper) in selected]
 
 
 def _fetch_yesterdays_papers() -> list[arxiv.Result]:
-    client = arxiv.Client()
+    client = _arxiv_client()
     search = arxiv.Search(
         query=SEARCH_QUERY,
         sort_by=arxiv.SortCriterion.SubmittedDate,
@@ -226,11 +506,36 @@ def _fetch_yesterdays_papers() -> list[arxiv.Result]:
     )
 
     yesterday = datetime.now().date() - timedelta(days=1)
-    results = [result for result in client.results(search) if result.published.date() == yesterday]
+    with telemetry.span("arxiv.fetch") as span:
+        telemetry.count("api_calls.arxiv")
+        results = [result for result in client.results(search) if result.published.date() == yesterday]
+        span["papers"] = len(results)
     print(f"Found {len(results)} papers published yesterday.\n")
     return results
 
 
+def _harvest_papers(cursor: HarvestCursor) -> list[arxiv.Result]:
+    start, end = cursor.window()
+    search = arxiv.Search(
+        query=f"({SEARCH_QUERY}) AND submittedDate:[{start:%Y%m%d%H%M} TO {end:%Y%m%d%H%M}]",
+        sort_by=arxiv.SortCriterion.SubmittedDate,
+        sort_order=arxiv.SortOrder.Ascending,
+        max_results=None,
+    )
+
+    with telemetry.span("arxiv.harvest") as span:
+        telemetry.count("api_calls.arxiv")
+        results = [
+            result
+            for result in _arxiv_client().results(search)
+            if cursor.is_new(_download_id(result), result.published)
+        ]
+        span["papers"] = len(results)
+    cursor.advance([(_download_id(result), result.published) for result in results])
+    print(f"Harvested {len(results)} new papers submitted since {start:%Y-%m-%d %H:%M} UTC.\n")
+    return results
+
+
 def _extract_arxiv_id(url: str) -> str | None:
     match = re.search(r"(?:arxiv\.org/abs/)?(\d{4}\.\d{5}v\d+|arxiv\.\d{4}\.\d{5}v\d+)", url)
     if not match:
@@ -242,75 +547,567 @@ def _extract_arxiv_id(url: str) -> str | None:
     return arxiv_id
 
 
-def _download_pdf(arxiv_id: str) -> arxiv.Result | None:
-    try:
-        return next(arxiv.Client().results(arxiv.Search(id_list=[arxiv_id])))
-    except StopIteration:
-        print(f"Failed to download paper with id {arxiv_id}")
+@lru_cache(maxsize=1)
+def _arxiv_client() -> arxiv.Client:
+    return arxiv.Client(page_size=ARXIV_PAGE_SIZE)
+
+
+def _build_registry(papers) -> dict[str, arxiv.Result]:
+    registry: dict[str, arxiv.Result] = {}
+    for paper in papers:
+        versioned = _extract_arxiv_id(paper.entry_id)
+        if versioned:
+            registry[versioned] = paper
+        registry.setdefault(_paper_key(paper.entry_id), paper)
+    return registry
+
+
+def _resolve_papers(reading_list, registry: dict[str, arxiv.Result]) -> list[arxiv.Result]:
+    arxiv_ids = []
+    for entry in reading_list:
+        arxiv_id = _extract_arxiv_id(entry.get("id", ""))
+        if not arxiv_id:
+            print(f"Invalid arXiv ID or URL format: {entry.get('id', '')}")
+            continue
+        arxiv_ids.append(arxiv_id)
+
+    missing = [arxiv_id for arxiv_id in arxiv_ids if _lookup_registry(registry, arxiv_id) is None]
+    if missing:
+        search = arxiv.Search(id_list=missing, max_results=len(missing))
+        telemetry.count("api_calls.arxiv")
+        for result in _arxiv_client().results(search):
+            registry[_extract_arxiv_id(result.entry_id) or result.entry_id] = result
+            registry.setdefault(_paper_key(result.entry_id), result)
+
+    resolved = []
+    for arxiv_id in arxiv_ids:
+        paper = _lookup_registry(registry, arxiv_id)
+        if paper is None:
+            print(f"Failed to download paper with id {arxiv_id}")
+            continue
+        resolved.append(paper)
+    return resolved
+
+
+def _download_id(paper) -> str:
+    return _extract_arxiv_id(paper.entry_id) or _paper_key(paper.entry_id)
+
+
+def _lookup_registry(registry: dict[str, arxiv.Result], arxiv_id: str) -> arxiv.Result | None:
+    return registry.get(arxiv_id) or registry.get(_paper_key(arxiv_id))
+
+
+def judge_instructions() -> list[str]:
+    return [_judge_instruction(batched=True), _judge_instruction(batched=False)]
+
+
+def open_judgment_cache(path: Path | None = None) -> JudgmentCache:
+    return JudgmentCache(path or JUDGMENT_CACHE_PATH, profile=profile_hash(JUDGE_MODEL, INTERESTS_PROMPT, _judge_instruction(batched=False)))
+
+
+def open_log_store() -> JsonlLogStore:
+    return JsonlLogStore(LOG_PATH, legacy_path=LEGACY_LOG_PATH)
+
+
+def open_history_store(path: Path | None = None) -> HistoryStore:
+    store = HistoryStore(path or HISTORY_DB_PATH)
+    if store.is_empty():
+        log_path = LOG_PATH if LOG_PATH.exists() else LEGACY_LOG_PATH
+        imported = store.import_log(log_path)
+        if imported:
+            print(f"Imported {imported} summaries from {log_path} into {store.path}")
+    return store
+
+
+def open_harvest_cursor(path: Path | None = None) -> HarvestCursor:
+    return HarvestCursor(path or HARVEST_CURSOR_PATH)
+
+
+def load_rules(path: Path | None = None) -> RuleSet | None:
+    path = path or RULES_PATH
+    if not path.exists():
         return None
 
+    rules = RuleSet.load(path)
+    print(f"Loaded {len(rules)} screening rules from {path}")
+    return rules
 
-def _parse_model_response(raw_text: str, title: str) -> dict | None:
-    try:
-        json_match = re.search(r"```json\s*(\{.*?\})\s*```", raw_text, re.DOTALL)
-        payload = json_match.group(1) if json_match else raw_text.strip()
-        return json.loads(payload)
-    except (json.JSONDecodeError, TypeError) as exc:
-        print(f"\n⚠ Error parsing response for paper: {title}")
-        print(f"Error: {exc}")
-        print(f"Raw response: {raw_text[:200]}...")
+
+def open_duplicate_index(path: Path | None = None) -> NearDuplicateIndex:
+    index = NearDuplicateIndex(path or DUPLICATE_INDEX_PATH)
+    if not len(index):
+        log_path = LOG_PATH if LOG_PATH.exists() else LEGACY_LOG_PATH
+        imported = index.import_log(log_path)
+        if imported:
+            print(f"Imported {imported} titles from {log_path} into the near-duplicate index")
+    return index
+
+
+def open_upload_cache(path: Path | None = None) -> UploadCache:
+    return UploadCache(path or UPLOAD_CACHE_PATH)
+
+
+def open_deferral_queue(path: Path | None = None) -> DeferralQueue:
+    return DeferralQueue(path or DEFERRED_PATH)
+
+
+def open_outbox(path: Path | None = None) -> PostOutbox:
+    outbox = PostOutbox(path or OUTBOX_PATH)
+    pending = outbox.pending()
+    if pending:
+        print(f"Outbox {outbox.path} has {len(pending)} unfinished threads to resume")
+    return outbox
+
+
+def _judge_with_rules(
+    papers, client, max_workers: int, batch_size: int, cache, rules, ledger=None, validator=None
+) -> list[dict | None]:
+    analyses = [_rule_verdict(paper, rules) for paper in papers] if rules is not None else [None] * len(papers)
+    pending = [index for index, analysis in enumerate(analyses) if analysis is None]
+    if len(pending) < len(papers):
+        print(f"Rules decided {len(papers) - len(pending)} papers without calling Gemini.")
+
+    fresh = _judge_with_cache(
+        [papers[index] for index in pending], client, max_workers, batch_size, cache, ledger, validator
+    )
+    for index, analysis in zip(pending, fresh):
+        analyses[index] = analysis
+    return analyses
+
+
+def _rule_verdict(paper, rules: RuleSet) -> dict | None:
+    rule = rules.decide(paper)
+    if rule is None:
         return None
 
+    return {
+        "title": paper.title,
+        "id": paper.entry_id,
+        "should_read": rule.action == "accept",
+        "relevance_score": rule.score,
+        "one_sentence_summary": "",
+        "reasoning": f"Matched rule '{rule.name}'.",
+        "keywords": [],
+        "decided_by": f"rule:{rule.name}",
+    }
 
-def _load_log_entries() -> list:
-    if not LOG_PATH.exists():
-        return []
+
+def _judge_with_cache(
+    papers, client, max_workers: int, batch_size: int, cache, ledger=None, validator=None
+) -> list[dict | None]:
+    analyses: list[dict | None] = [cache.get(_cache_key(paper)) if cache is not None else None for paper in papers]
+    pending = [index for index, analysis in enumerate(analyses) if analysis is None]
+    if len(pending) < len(papers):
+        print(f"Reused {len(papers) - len(pending)} cached judgments.")
+    held = []
+    if ledger is not None and ledger.budgeted:
+        pending, held = _admit_for_judging(pending, papers, batch_size, ledger)
 
     try:
-        content = json.loads(LOG_PATH.read_text(encoding="utf-8"))
-        if isinstance(content, list):
-            return content
-        return [content]
-    except (json.JSONDecodeError, OSError):
-        return []
+        fresh = _collect_judgments([papers[index] for index in pending], client, max_workers, batch_size, validator)
+    finally:
+        if held:
+            ledger.release(JUDGE_MODEL, held)
+    for index, analysis in zip(pending, fresh):
+        analyses[index] = analysis
+        if analysis and cache is not None:
+            cache.put(_cache_key(papers[index]), analysis)
+    return analyses
 
 
-def _write_log_entries(entries: list) -> None:
-    LOG_PATH.write_text(json.dumps(entries, indent=4, ensure_ascii=False), encoding="utf-8")
+def _admit_for_judging(
+    pending: list[int], papers, batch_size: int, ledger: TokenLedger
+) -> tuple[list[int], list[tuple[int, int]]]:
+    instruction = _estimate_tokens(_judge_instruction(batched=batch_size > 1)) // max(1, min(batch_size, len(pending)))
+    estimates = [
+        (_estimate_tokens(_format_paper(papers[index])) + instruction, JUDGE_VERDICT_TOKENS) for index in pending
+    ]
+    admitted = ledger.admit(JUDGE_MODEL, estimates, reserve=BUDGET_SUMMARY_RESERVE)
+    if admitted < len(pending):
+        ledger.defer([_download_id(papers[index]) for index in pending[admitted:]])
+        print(f"Budget: judging {admitted} of {len(pending)} papers, deferring the rest to the next run.")
+    return pending[:admitted], estimates[:admitted]
 
 
-def _build_reading_lookup(reading_list) -> dict[str, dict]:
-    lookup = {}
-    if not reading_list:
-        return lookup
+def _admit_for_summaries(sources: list, read_list, ledger: TokenLedger) -> list:
+    priority = {_paper_key(_download_id(paper)): rank for rank, paper in enumerate(read_list or [])}
+    ordered = sorted(sources, key=lambda source: priority.get(_paper_key(_pdf_name(source)), len(priority)))
+    admitted = ledger.plan(SUMMARY_MODEL, [_summary_estimate(ledger)] * len(ordered))
+    if admitted < len(ordered):
+        ledger.defer([_pdf_name(source) for source in ordered[admitted:]])
+        print(f"Budget: summarizing {admitted} of {len(ordered)} papers, deferring the rest to the next run.")
+    return ordered[:admitted]
 
-    for item in reading_list:
-        title_value = item.get("title") or item.get("Title")
-        normalized = _normalize_title(title_value)
-        if normalized:
-            lookup[normalized] = item
-    return lookup
 
+def _plan_summaries(papers: list, ledger: TokenLedger) -> tuple[list, list]:
+    admitted = ledger.plan(SUMMARY_MODEL, [_summary_estimate(ledger)] * len(papers))
+    return papers[:admitted], papers[admitted:]
 
-def _match_reading_entry(document: dict, lookup: dict[str, dict]) -> str | None:
-    if not lookup:
-        return None
 
-    title_candidate = document.get("Title") or document.get("title")
-    normalized = _normalize_title(title_candidate)
-    if not normalized:
+def _defer_summaries(papers: list, admitted: int, ledger: TokenLedger) -> None:
+    if not papers:
+        return
+    ledger.defer([_download_id(paper) for paper in papers])
+    print(f"Budget: summarizing {admitted} of {admitted + len(papers)} papers, deferring the rest to the next run.")
+
+
+def _defer_failures(failures: list, ledger: TokenLedger | None, deferred: DeferralQueue | None) -> None:
+    jobs = [job for _, item, _ in failures for job in (item if isinstance(item, list) else [item])]
+    paper_ids = [_download_id(job.paper) for job in jobs]
+    if not paper_ids or (ledger is None and deferred is None):
+        return
+    if ledger is not None:
+        ledger.defer(paper_ids)
+    elif deferred is not None:
+        deferred.extend(paper_ids)
+    print(f"Deferring {len(paper_ids)} papers that failed a streaming stage to the next run.")
+
+
+def _reserve_summary(job: _PaperJob, ledger: TokenLedger | None) -> bool:
+    if ledger is None or not ledger.budgeted:
+        return True
+    job.reserved = ledger.reserve(SUMMARY_MODEL, (SUMMARY_TOKEN_ESTIMATE, SUMMARY_OUTPUT_ESTIMATE), wait=True)
+    if job.reserved is None:
+        ledger.defer([_download_id(job.paper)])
+        print(f"Budget: deferring {job.paper.title} to the next run.")
+        return False
+    return True
+
+
+def _release_summary(job: _PaperJob, ledger: TokenLedger | None) -> None:
+    if ledger is not None and job.reserved is not None:
+        ledger.release(SUMMARY_MODEL, [job.reserved])
+        job.reserved = None
+
+
+def _summary_estimate(ledger: TokenLedger) -> tuple[int, int]:
+    return ledger.average_call(SUMMARY_MODEL) or (SUMMARY_TOKEN_ESTIMATE, SUMMARY_OUTPUT_ESTIMATE)
+
+
+def _collect_judgments(papers, client, max_workers: int, batch_size: int, validator=None) -> list[dict | None]:
+    validator = validator or ResponseValidator(max_repairs=0)
+    batches = [batch for batch in _plan_batches(papers, batch_size) if len(batch) > 1]
+    verdicts: dict[int, dict | None] = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        for batch_verdicts in executor.map(lambda batch: _judge_batch(batch, papers, client, validator), batches):
+            verdicts.update(batch_verdicts)
+
+        pending = [index for index in range(len(papers)) if index not in verdicts]
+        if batches and pending:
+            print(f"Retrying {len(pending)} papers missing from batch responses individually.")
+            telemetry.count("retries.judge", len(pending))
+        for index, analysis in zip(pending, executor.map(lambda i: _judge_paper(papers[i], client, validator), pending)):
+            verdicts[index] = analysis
+
+    return [verdicts.get(index) for index in range(len(papers))]
+
+
+def _plan_batches(papers, batch_size: int) -> list[list[int]]:
+    batches: list[list[int]] = []
+    current: list[int] = []
+    current_tokens = 0
+
+    for index, paper in enumerate(papers):
+        cost = _estimate_tokens(_format_paper(paper)) + JUDGE_VERDICT_TOKENS
+        if current and (len(current) >= batch_size or current_tokens + cost > JUDGE_BATCH_TOKEN_BUDGET):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(index)
+        current_tokens += cost
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _judge_batch(batch: list[int], papers, client, validator: ResponseValidator) -> dict[int, dict]:
+    contents = "\n\n".join(
+        f"[{position}]\n{_format_paper(papers[index])}" for position, index in enumerate(batch, start=1)
+    )
+    config = _json_config(_judge_instruction(batched=True), list[Verdict])
+    with telemetry.span("gemini.judge_batch", papers=len(batch)):
+        telemetry.count("api_calls.gemini.generate_content")
+        response = client.models.generate_content(model=JUDGE_MODEL, config=config, contents=[contents])
+
+    verdicts = validator.resolve("judge_batch", list[Verdict], response.text, _reask(client, JUDGE_MODEL, config))
+    by_key = {}
+    for verdict in response_schema.dump(verdicts or []):
+        key = _paper_key(verdict.get("id"))
+        if key:
+            by_key[key] = verdict
+
+    return {
+        index: by_key[_paper_key(papers[index].entry_id)]
+        for index in batch
+        if _paper_key(papers[index].entry_id) in by_key
+    }
+
+
+def _judge_paper(paper, client, validator: ResponseValidator) -> dict | None:
+    config = _json_config(_judge_instruction(batched=False), Verdict)
+    with telemetry.span("gemini.judge", arxiv_id=_cache_key(paper)):
+        telemetry.count("api_calls.gemini.generate_content")
+        response = client.models.generate_content(
+            model=JUDGE_MODEL,
+            config=config,
+            contents=[
+                (
+                    f"{paper.title},\n"
+                    f"{paper.entry_id},\n"
+                    f"{paper.summary},\n"
+                    f"{paper.authors},\n"
+                    f"{paper.primary_category},"
+                )
+            ],
+        )
+    verdict = validator.resolve("judge", Verdict, response.text, _reask(client, JUDGE_MODEL, config))
+    return response_schema.dump(verdict) if verdict is not None else None
+
+
+def _judge_instruction(batched: bool) -> str:
+    if batched:
+        output_shape = (
+            "- Output EXACTLY ONE JSON array with one object per paper, in the order the papers are given.\n"
+            "- NO markdown, NO code fences, NO surrounding text.\n"
+            '- Each object\'s "id" MUST repeat the paper\'s id exactly as provided.\n'
+            "- Keys of each object (all required, none extra):\n"
+        )
+    else:
+        output_shape = (
+            "- Output EXACTLY ONE JSON object (not an array, not multiple objects).\n"
+            "- NO markdown, NO code fences, NO surrounding text.\n"
+            "- Keys (all required, none extra):\n"
+        )
+
+    return (
+        "You are an expert AI research assistant with deep knowledge of the machine learning landscape. "
+        "Your goal is to analyze a paper's abstract based on the user's stated research interests and provide "
+        "a concise, structured recommendation.\n\n"
+        "The user's interests will be provided, ranked by priority. Your analysis MUST be strictly guided by "
+        f"these interests: {INTERESTS_PROMPT}. When rating papers, be extremely selective.\n\n"
+        "OUTPUT REQUIREMENTS (must follow exactly):\n"
+        f"{output_shape}"
+        '  - "title": string\n'
+        '  - "id": string\n'
+        '  - "should_read": boolean\n'
+        '  - "relevance_score": integer 1-10\n'
+        '  - "one_sentence_summary": string\n'
+        '  - "reasoning": string\n'
+        '  - "keywords": array of strings\n'
+    )
+
+
+def _format_paper(paper) -> str:
+    return (
+        f"id: {paper.entry_id}\n"
+        f"title: {paper.title}\n"
+        f"abstract: {paper.summary}\n"
+        f"authors: {paper.authors}\n"
+        f"category: {paper.primary_category}"
+    )
+
+
+def _cache_key(paper) -> str:
+    return _extract_arxiv_id(paper.entry_id) or paper.entry_id
+
+
+def _estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+def _paper_key(value) -> str | None:
+    if not value:
         return None
+    match = re.search(r"\d{4}\.\d{4,5}", str(value))
+    return match.group(0) if match else str(value).strip()
+
+
+def _upload_pdf(pdf: PdfBuffer | Path, client, uploads: UploadCache | None = None):
+    def upload():
+        with telemetry.span("gemini.upload", file=_pdf_name(pdf), in_memory=isinstance(pdf, PdfBuffer)) as span:
+            telemetry.count("api_calls.gemini.files.upload")
+            if isinstance(pdf, PdfBuffer):
+                config = types.UploadFileConfig(mime_type="application/pdf", display_name=pdf.name)
+                uploaded = client.files.upload(file=pdf.open(), config=config)
+            else:
+                uploaded = client.files.upload(file=str(pdf))
+            span["bytes"] = getattr(uploaded, "size_bytes", None) or 0
+            telemetry.count("bytes.uploaded", span["bytes"])
+            return uploaded
+
+    if uploads is None:
+        return upload()
+    if isinstance(pdf, PdfBuffer):
+        return uploads.fetch_digest(pdf.sha256, upload)
+    return uploads.fetch(pdf.read_bytes(), upload)
+
+
+def _pdf_name(pdf: PdfBuffer | Path) -> str:
+    return pdf.name if isinstance(pdf, PdfBuffer) else pdf.stem
 
-    if normalized in lookup:
-        matched = lookup.pop(normalized)
-        return matched.get("id")
 
-    close_match = difflib.get_close_matches(normalized, list(lookup.keys()), n=1, cutoff=0.8)
-    if close_match:
-        matched = lookup.pop(close_match[0])
-        return matched.get("id")
+def _pdf_source(pdf: PdfBuffer | Path) -> bytes | Path:
+    return pdf.getvalue() if isinstance(pdf, PdfBuffer) else pdf
 
-    return None
+
+def _release_pdf(job: _PaperJob) -> None:
+    job.name = _pdf_name(job.pdf)
+    if isinstance(job.pdf, PdfBuffer):
+        job.pdf.close()
+    job.pdf = None
+
+
+def _download_papers(papers: list, pdfs: PdfStore | None) -> list[tuple[arxiv.Result, PdfBuffer]]:
+    downloader = PdfDownloader(None, max_workers=DOWNLOAD_MAX_WORKERS)
+    outcomes = downloader.download_all([(_download_id(paper), paper.pdf_url) for paper in papers])
+
+    downloaded = []
+    for paper, outcome in zip(papers, outcomes):
+        if outcome.error:
+            print(f"Failed to download paper with id {outcome.arxiv_id}: {outcome.error}")
+            continue
+        if pdfs is not None:
+            pdfs.add(outcome.buffer)
+        downloaded.append((paper, outcome.buffer))
+    return downloaded
+
+
+def _summarize_sources(
+    sources: list, client, max_workers: int, uploads: UploadCache | None, text_tokens: int | None, validator
+) -> list[tuple[str, str]]:
+    extracted = _extract_texts(sources, text_tokens) if text_tokens else [None] * len(sources)
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        texts = list(
+            executor.map(
+                lambda item: _summarize_pdf(item[0], item[1], client, uploads, validator), zip(sources, extracted)
+            )
+        )
+
+    summaries = [(_pdf_name(source), text) for source, text in zip(sources, texts)]
+    for _, text in summaries:
+        print(text)
+    return summaries
+
+
+def _summarize_pdf(
+    pdf: PdfBuffer | Path, text: str | None, client, uploads: UploadCache | None = None, validator=None
+) -> str:
+    if text is not None:
+        return _summarize_text(text, client, _pdf_name(pdf), validator)
+    return _summarize_upload(_upload_pdf(pdf, client, uploads), client, validator)
+
+
+def _summarize_upload(uploaded, client, validator: ResponseValidator | None = None) -> str:
+    config = _json_config(SUMMARY_PROMPT, PaperSummary)
+    with telemetry.span("gemini.summarize", file=getattr(uploaded, "name", None), mode="upload"):
+        telemetry.count("api_calls.gemini.generate_content")
+        response = client.models.generate_content(
+            model=SUMMARY_MODEL,
+            config=config,
+            contents=[
+                "Please analyze this research paper PDF and provide a comprehensive summary following the JSON format specified in the system instructions:",
+                uploaded,
+            ],
+        )
+    return _validated_summary(response.text, client, config, validator)
+
+
+def _summarize_text(text: str, client, name: str, validator: ResponseValidator | None = None) -> str:
+    config = _json_config(SUMMARY_PROMPT, PaperSummary)
+    with telemetry.span("gemini.summarize", file=name, mode="text", chars=len(text)):
+        telemetry.count("api_calls.gemini.generate_content")
+        response = client.models.generate_content(
+            model=SUMMARY_MODEL,
+            config=config,
+            contents=[
+                "Please analyze this research paper and provide a comprehensive summary following the JSON format specified in the system instructions. "
+                "The abstract, introduction, method, results and conclusion were extracted from the PDF; appendices and references are omitted:",
+                text,
+            ],
+        )
+    return _validated_summary(response.text, client, config, validator)
+
+
+def _validated_summary(raw_text: str, client, config, validator: ResponseValidator | None) -> str:
+    validator = validator or ResponseValidator(max_repairs=0)
+    summary = validator.resolve("summary", PaperSummary, raw_text, _reask(client, SUMMARY_MODEL, config))
+    return response_schema.dumps(summary, exclude_unset=True) if summary is not None else raw_text
+
+
+def _json_config(instruction: str, schema) -> types.GenerateContentConfig:
+    return types.GenerateContentConfig(
+        system_instruction=instruction,
+        response_mime_type="application/json",
+        response_schema=schema,
+    )
+
+
+def _reask(client, model: str, config):
+    def reask(prompt: str, previous: str) -> str | None:
+        with telemetry.span("gemini.repair", model=model):
+            telemetry.count("api_calls.gemini.generate_content")
+            response = client.models.generate_content(model=model, config=config, contents=[prompt, previous])
+        return response.text
+
+    return reask
+
+
+def _extract_texts(sources: list, text_tokens: int) -> list[str | None]:
+    with telemetry.span("pdf.extract", files=len(sources)):
+        texts = pdf_text.extract_many([_pdf_source(source) for source in sources], text_tokens)
+    _count_extractions(texts)
+    return texts
+
+
+def _extract_text(executor: ProcessPoolExecutor, pdf: PdfBuffer | Path, text_tokens: int) -> str | None:
+    with telemetry.span("pdf.extract", files=1):
+        try:
+            text = executor.submit(pdf_text.extract_sections, _pdf_source(pdf), text_tokens).result()
+        except (BrokenProcessPool, OSError) as exc:
+            print(f"Text extraction failed for {_pdf_name(pdf)}, uploading the PDF instead: {exc}")
+            text = None
+    _count_extractions([text])
+    return text
+
+
+def _count_extractions(texts: list[str | None]) -> None:
+    fallbacks = sum(text is None for text in texts)
+    telemetry.count("pdf.extracted", len(texts) - fallbacks)
+    telemetry.count("pdf.extract_fallbacks", fallbacks)
+    telemetry.count("bytes.extracted", sum(len(text.encode("utf-8")) for text in texts if text))
+
+
+def _build_reading_lookup(reading_list) -> tuple[dict[str, dict], TitleIndex]:
+    by_id: dict[str, dict] = {}
+    by_title = TitleIndex()
+    for item in reading_list or []:
+        key = _paper_key(item.get("id"))
+        if key:
+            by_id.setdefault(key, item)
+        normalized = _normalize_title(item.get("title") or item.get("Title"))
+        if normalized:
+            by_title.add(normalized, item)
+    return by_id, by_title
+
+
+def _match_reading_entry(document: dict, arxiv_id: str | None, by_id: dict[str, dict], by_title: TitleIndex) -> str | None:
+    if arxiv_id:
+        matched = by_id.pop(_paper_key(arxiv_id), None)
+        if matched is None:
+            return arxiv_id
+        by_title.pop(_normalize_title(matched.get("title") or matched.get("Title")))
+        return matched.get("id") or arxiv_id
+
+    normalized = _normalize_title(document.get("Title") or document.get("title"))
+    if not normalized:
+        return None
+
+    matched = by_title.pop_closest(normalized)
+    if matched is None:
+        return None
+    by_id.pop(_paper_key(matched.get("id")), None)
+    return matched.get("id")
 
 
 def _normalize_title(value: str | None) -> str:
@@ -323,5 +1120,6 @@ def _coerce_json_document(raw: str) -> dict | None:
         payload = json_match.group(1) if json_match else raw.strip()
         return json.loads(payload)
     except json.JSONDecodeError as exc:
+        telemetry.count("parse_failures.summary")
         print(f"Error parsing summary: {exc}")
         return None
@@ -0,0 +1,437 @@
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from datetime import datetime, time as day_time, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import requests
+import tweepy
+from google.genai import errors, types
+
+
+DEFAULT_LATENCY = {
+    "arxiv": 0.5,
+    "judge": 0.8,
+    "download": 0.4,
+    "upload": 0.6,
+    "cache": 0.3,
+    "summarize": 4.0,
+    "post": 0.3,
+}
+PDF_SIZE = 256 * 1024
+CACHE_MIN_TOKENS = 1024
+PDF_CHUNK = 64 * 1024
+ON_TOPIC = (
+    "continual learning self-evolving agent memory adaptation time-series generative model multimodal video "
+    "understanding few-shot meta-learning bayesian probabilistic finance causal text-to-speech audio"
+).split()
+OFF_TOPIC = (
+    "protein folding graph coloring compiler scheduling database index wireless channel quantum circuit "
+    "lattice cryptography supply chain traffic routing soil moisture"
+).split()
+FILLER = "we propose method results show that our approach improves over strong baselines on several benchmarks".split()
+
+
+@dataclass
+class FakeAuthor:
+    name: str
+
+    def __str__(self) -> str:
+        return self.name
+
+
+@dataclass
+class FakePaper:
+    entry_id: str
+    title: str
+    summary: str
+    published: datetime
+    authors: list = field(default_factory=list)
+    primary_category: str = "cs.LG"
+
+    @property
+    def pdf_url(self) -> str:
+        return self.entry_id.replace("/abs/", "/pdf/")
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.calls: dict[str, int] = defaultdict(int)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float, failed: bool = False, size: int = 0) -> None:
+        with self._lock:
+            self.calls[stage] += 1
+            self.latencies[stage].append(seconds)
+            self.bytes_sent += size
+            if failed:
+                self.errors[stage] += 1
+
+
+class Quota:
+    def __init__(self, per_minute: int | None):
+        self.per_minute = per_minute
+        self._calls: deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float | None:
+        if not self.per_minute:
+            return None
+        with self._lock:
+            now = time.monotonic()
+            while self._calls and now - self._calls[0] >= 60:
+                self._calls.popleft()
+            if len(self._calls) >= self.per_minute:
+                return 60 - (now - self._calls[0])
+            self._calls.append(now)
+            return None
+
+
+class FakeService(ABC):
+    def __init__(
+        self,
+        recorder: Recorder,
+        latency: dict[str, float] | None = None,
+        error_rate: float = 0.0,
+        rate_limit: int | None = None,
+        seed: int = 0,
+    ):
+        self.recorder = recorder
+        self.latency = {**DEFAULT_LATENCY, **(latency or {})}
+        self.error_rate = error_rate
+        self.quota = Quota(rate_limit)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _call(self, stage: str, size: int = 0) -> None:
+        started = time.perf_counter()
+        retry_after = self.quota.acquire()
+        if retry_after is not None:
+            self.recorder.record(stage, time.perf_counter() - started, failed=True)
+            raise self._throttled(retry_after)
+
+        with self._lock:
+            jitter = self._random.uniform(0.8, 1.2)
+            failed = self._random.random() < self.error_rate
+        time.sleep(self.latency.get(stage, 0.0) * jitter)
+        self.recorder.record(stage, time.perf_counter() - started, failed=failed, size=size)
+        if failed:
+            raise self._unavailable()
+
+    @abstractmethod
+    def _throttled(self, retry_after: float) -> Exception:
+        ...
+
+    @abstractmethod
+    def _unavailable(self) -> Exception:
+        ...
+
+
+class FakeCorpus:
+    def __init__(self, size: int, accept_ratio: float = 0.2, seed: int = 0, published: datetime | None = None):
+        rng = random.Random(seed)
+        published = published or datetime.combine(
+            datetime.now().date() - timedelta(days=1), day_time(12), tzinfo=timezone.utc
+        )
+        self.accept_ratio = accept_ratio
+        self.papers: list[FakePaper] = []
+        for index in range(size):
+            topic = ON_TOPIC if rng.random() < 0.5 else OFF_TOPIC
+            title = " ".join(rng.choice(topic) for _ in range(6)).title() + f" {index}"
+            abstract = " ".join(rng.choice(topic + FILLER) for _ in range(160))
+            self.papers.append(
+                FakePaper(
+                    entry_id=f"http://arxiv.org/abs/2601.{index:05d}v1",
+                    title=title,
+                    summary=abstract,
+                    published=published,
+                    authors=[FakeAuthor(f"Author {rng.randrange(size * 3 + 1)}")],
+                )
+            )
+        self.by_key = {_key(paper.entry_id): paper for paper in self.papers}
+
+    def accepts(self, arxiv_id: str) -> bool:
+        return zlib.crc32(_key(arxiv_id).encode("utf-8")) % 1000 < self.accept_ratio * 1000
+
+    def verdict(self, arxiv_id: str) -> dict:
+        paper = self.by_key.get(_key(arxiv_id))
+        should_read = self.accepts(arxiv_id)
+        return {
+            "title": paper.title if paper else arxiv_id,
+            "id": paper.entry_id if paper else arxiv_id,
+            "should_read": should_read,
+            "relevance_score": 6 + zlib.crc32(arxiv_id.encode("utf-8")) % 5 if should_read else 2,
+            "one_sentence_summary": "A synthetic paper used for benchmarking.",
+            "reasoning": "Synthetic verdict.",
+            "keywords": ["benchmark"],
+        }
+
+    def summary(self, arxiv_id: str) -> dict:
+        paper = self.by_key.get(_key(arxiv_id))
+        sentence = " ".join(FILLER)[:200]
+        return {
+            "Title": paper.title if paper else arxiv_id,
+            "Field & Subfield": "Machine Learning / Benchmarks",
+            "Key Contributions": "- first contribution\n- second contribution\n- third contribution",
+            "Methodology": sentence,
+            "Strengths": sentence,
+            "Limitations": sentence,
+            "Datasets / Benchmarks": "Synthetic",
+            "Results Summary": sentence,
+            "Why It Matters": sentence,
+            "Should Read Fully?": "Yes",
+        }
+
+
+class FakeArxivClient(FakeService):
+    def __init__(self, corpus: FakeCorpus, recorder: Recorder, page_size: int = 200, **kwargs):
+        super().__init__(recorder, **kwargs)
+        self.corpus = corpus
+        self.page_size = page_size
+
+    def results(self, search):
+        if search.id_list:
+            wanted = {_key(arxiv_id) for arxiv_id in search.id_list}
+            papers = [paper for paper in self.corpus.papers if _key(paper.entry_id) in wanted]
+        else:
+            papers = list(self.corpus.papers)
+        if search.max_results is not None:
+            papers = papers[:search.max_results]
+
+        for offset in range(0, max(len(papers), 1), self.page_size):
+            self._call("arxiv")
+            yield from papers[offset:offset + self.page_size]
+
+    def _throttled(self, retry_after: float) -> Exception:
+        return requests.HTTPError(f"429 Too Many Requests; retry after {retry_after:.1f}s")
+
+    def _unavailable(self) -> Exception:
+        return requests.HTTPError("503 Service Unavailable")
+
+
+class FakeGeminiClient(FakeService):
+    def __init__(self, corpus: FakeCorpus, recorder: Recorder, **kwargs):
+        super().__init__(recorder, **kwargs)
+        self.corpus = corpus
+        self.models = SimpleNamespace(generate_content=self.generate_content)
+        self.files = SimpleNamespace(upload=self.upload)
+        self.caches = SimpleNamespace(create=self.create_cache, delete=self.delete_cache)
+        self.cached: dict[str, str] = {}
+
+    def generate_content(self, *, model, contents, config=None):
+        handles = [item for item in contents if not isinstance(item, str)]
+        prompt = "\n".join(item for item in contents if isinstance(item, str))
+        if handles:
+            self._call("summarize")
+            text = json.dumps(self.corpus.summary(Path(handles[0].name).name))
+        else:
+            self._call("judge")
+            ids = re.findall(r"^id: (\S+)$", prompt, re.MULTILINE)
+            if ids:
+                text = json.dumps([self.corpus.verdict(arxiv_id) for arxiv_id in ids])
+            else:
+                match = re.search(r"\d{4}\.\d{4,5}(?:v\d+)?", prompt)
+                text = json.dumps(self.corpus.verdict(match.group(0) if match else ""))
+
+        cached = self.cached.get(getattr(config, "cached_content", None) or "", "")
+        instruction = getattr(config, "system_instruction", None) or cached
+        return SimpleNamespace(
+            text=text,
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=(len(prompt) + len(str(instruction))) // 4 + 258 * len(handles),
+                cached_content_token_count=len(cached) // 4,
+                candidates_token_count=len(text) // 4,
+                total_token_count=(len(prompt) + len(str(instruction)) + len(text)) // 4 + 258 * len(handles),
+            ),
+        )
+
+    def create_cache(self, *, model, config):
+        self._call("cache")
+        tokens = len(config.system_instruction) // 4
+        if tokens < CACHE_MIN_TOKENS:
+            raise errors.ClientError(
+                400,
+                {
+                    "error": {
+                        "code": 400,
+                        "message": f"Cached content is too small. total_token_count={tokens}, "
+                        f"min_total_token_count={CACHE_MIN_TOKENS}",
+                        "status": "INVALID_ARGUMENT",
+                    }
+                },
+            )
+        with self._lock:
+            name = f"cachedContents/{len(self.cached) + 1}"
+            self.cached[name] = config.system_instruction
+        return SimpleNamespace(name=name, expire_time=datetime.now(timezone.utc) + timedelta(hours=1))
+
+    def delete_cache(self, *, name):
+        with self._lock:
+            self.cached.pop(name, None)
+
+    def upload(self, *, file, config=None):
+        path = Path(file) if isinstance(file, (str, Path)) else None
+        size = path.stat().st_size if path else len(file.read())
+        stem = path.stem if path else getattr(config, "display_name", None) or "upload"
+        self._call("upload", size=size)
+        return types.File(
+            name=f"files/{stem}",
+            uri=f"https://generativelanguage.example/files/{stem}",
+            mime_type="application/pdf",
+            size_bytes=size,
+            expiration_time=datetime.now(timezone.utc) + timedelta(hours=48),
+        )
+
+    def _throttled(self, retry_after: float) -> Exception:
+        return errors.ClientError(
+            429,
+            {
+                "error": {
+                    "code": 429,
+                    "message": "Resource has been exhausted (e.g. check quota).",
+                    "status": "RESOURCE_EXHAUSTED",
+                    "details": [
+                        {
+                            "@type": "type.googleapis.com/google.rpc.RetryInfo",
+                            "retryDelay": f"{max(1, round(retry_after))}s",
+                        }
+                    ],
+                }
+            },
+        )
+
+    def _unavailable(self) -> Exception:
+        return errors.ServerError(
+            503,
+            {"error": {"code": 503, "message": "The model is overloaded.", "status": "UNAVAILABLE"}},
+        )
+
+
+class FakePdfSession(FakeService):
+    def __init__(self, recorder: Recorder, pdf_size: int = PDF_SIZE, **kwargs):
+        super().__init__(recorder, **kwargs)
+        self.pdf_size = pdf_size
+
+    def payload(self, url: str) -> bytes:
+        header = f"%PDF-1.4\n% {url}\n".encode("utf-8")
+        return header + b"0" * max(0, self.pdf_size - len(header))
+
+    def get(self, url, headers=None, stream=True, timeout=None):
+        payload = self.payload(url)
+        self._call("download", size=len(payload))
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.url = url
+        response.headers["Content-Length"] = str(len(payload))
+        response.raw = _ChunkedBody(payload)
+        return response
+
+    def _throttled(self, retry_after: float) -> Exception:
+        return requests.HTTPError(f"429 Too Many Requests; retry after {retry_after:.1f}s")
+
+    def _unavailable(self) -> Exception:
+        return requests.ConnectionError("connection reset by peer")
+
+
+class FakeXClient(FakeService):
+    def __init__(self, recorder: Recorder, window_limit: int = 300, window_seconds: float = 900.0, **kwargs):
+        super().__init__(recorder, **kwargs)
+        self.session = requests.Session()
+        self.window_limit = window_limit
+        self.window_seconds = window_seconds
+        self.tweets: list[dict] = []
+        self._window_start = time.time()
+        self._window_used = 0
+
+    def create_tweet(self, text=None, in_reply_to_tweet_id=None, user_auth=True, **kwargs):
+        with self._lock:
+            now = time.time()
+            if now - self._window_start >= self.window_seconds:
+                self._window_start, self._window_used = now, 0
+            exhausted = self._window_used >= self.window_limit
+            if not exhausted:
+                self._window_used += 1
+            retry_after = self._window_start + self.window_seconds - now
+        if exhausted:
+            self.recorder.record("post", 0.0, failed=True)
+            raise self._throttled(retry_after)
+
+        self._call("post", size=len((text or "").encode("utf-8")))
+        with self._lock:
+            tweet_id = str(10**18 + len(self.tweets))
+            self.tweets.append({"id": tweet_id, "text": text, "in_reply_to_tweet_id": in_reply_to_tweet_id})
+            headers = self._rate_headers()
+
+        response = self._http_response(201, {"data": {"id": tweet_id, "text": text}}, headers)
+        for hook in self.session.hooks.get("response", []):
+            hook(response)
+        return tweepy.Response({"id": tweet_id, "text": text}, {}, [], {})
+
+    def _rate_headers(self) -> dict[str, str]:
+        return {
+            "x-rate-limit-limit": str(self.window_limit),
+            "x-rate-limit-remaining": str(max(0, self.window_limit - self._window_used)),
+            "x-rate-limit-reset": str(int(self._window_start + self.window_seconds)),
+        }
+
+    def _http_response(self, status: int, payload: dict, headers: dict[str, str]) -> requests.Response:
+        response = requests.Response()
+        response.status_code = status
+        response.reason = "Too Many Requests" if status == 429 else "OK"
+        response.url = "https://api.twitter.com/2/tweets"
+        response.headers.update(headers)
+        response._content = json.dumps(payload).encode("utf-8")
+        return response
+
+    def _throttled(self, retry_after: float) -> Exception:
+        headers = {
+            "x-rate-limit-limit": str(self.window_limit),
+            "x-rate-limit-remaining": "0",
+            "x-rate-limit-reset": str(int(time.time() + retry_after)),
+        }
+        return tweepy.TooManyRequests(
+            self._http_response(429, {"title": "Too Many Requests", "detail": "Too Many Requests"}, headers)
+        )
+
+    def _unavailable(self) -> Exception:
+        return tweepy.TwitterServerError(
+            self._http_response(503, {"title": "Service Unavailable", "detail": "Service Unavailable"}, {})
+        )
+
+
+class _ChunkedBody:
+    def __init__(self, payload: bytes):
+        self._payload = payload
+        self._offset = 0
+
+    def read(self, amount=None, **kwargs) -> bytes:
+        amount = amount or len(self._payload)
+        chunk = self._payload[self._offset:self._offset + amount]
+        self._offset += len(chunk)
+        return chunk
+
+    def stream(self, amount=PDF_CHUNK, decode_content=True):
+        while self._offset < len(self._payload):
+            yield self.read(amount)
+
+    def close(self) -> None:
+        pass
+
+    def release_conn(self) -> None:
+        pass
+
+
+def _key(value: str) -> str:
+    match = re.search(r"\d{4}\.\d{4,5}", str(value))
+    return match.group(0) if match else str(value)
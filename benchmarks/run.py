@@ -0,0 +1,216 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from unittest import mock
+
+import arxiv_pipeline
+import main
+import x_tweet_module
+from benchmarks.fakes import (
+    DEFAULT_LATENCY,
+    FakeArxivClient,
+    FakeCorpus,
+    FakeGeminiClient,
+    FakePdfSession,
+    FakeXClient,
+    Recorder,
+)
+from pdf_downloader import PdfBuffer, PdfDownloader, PdfStore
+
+
+DEFAULT_SIZES = (10, 100, 1_000, 5_000)
+TARGETS = ("batch", "streaming", "judge", "summarize", "post")
+PERCENTILES = (50, 95, 99)
+
+
+@dataclass
+class BenchmarkResult:
+    target: str
+    papers: int
+    seconds: float
+    papers_per_minute: float
+    peak_memory_mb: float
+    calls: dict[str, int]
+    errors: dict[str, int]
+    latency_ms: dict[str, dict[str, float]]
+    bytes_sent: int
+    tweets: int
+    failure: str | None = None
+
+
+def run_benchmark(
+    target: str,
+    size: int,
+    latency_scale: float = 0.01,
+    error_rate: float = 0.0,
+    rate_limit: int | None = None,
+    accept_ratio: float = 0.2,
+    seed: int = 0,
+) -> BenchmarkResult:
+    if target not in TARGETS:
+        raise ValueError(f"Unknown benchmark target {target!r}; expected one of {', '.join(TARGETS)}")
+
+    recorder = Recorder()
+    latency = {stage: seconds * latency_scale for stage, seconds in DEFAULT_LATENCY.items()}
+    options = {"latency": latency, "error_rate": error_rate, "rate_limit": rate_limit, "seed": seed}
+    corpus = FakeCorpus(size, accept_ratio=accept_ratio, seed=seed)
+    arxiv_client = FakeArxivClient(corpus, recorder, page_size=arxiv_pipeline.ARXIV_PAGE_SIZE, **options)
+    gemini = FakeGeminiClient(corpus, recorder, **options)
+    pdf_session = FakePdfSession(recorder, **options)
+    x_client = FakeXClient(recorder, window_seconds=900 * latency_scale, **options)
+
+    def downloader(directory, max_workers):
+        return PdfDownloader(directory, max_workers=max_workers, host_interval=0, session=pdf_session)
+
+    failure = None
+    original_cwd = Path.cwd()
+    with tempfile.TemporaryDirectory() as workdir, contextlib.ExitStack() as stack:
+        os.chdir(workdir)
+        stack.callback(os.chdir, original_cwd)
+        stack.enter_context(mock.patch.object(arxiv_pipeline, "_arxiv_client", lambda: arxiv_client))
+        stack.enter_context(mock.patch.object(arxiv_pipeline, "MAX_RESULTS", size))
+        stack.enter_context(mock.patch.object(arxiv_pipeline, "PdfDownloader", downloader))
+        stack.enter_context(mock.patch.object(main.genai, "Client", lambda **kwargs: gemini))
+        stack.enter_context(mock.patch.object(x_tweet_module, "authenticate", lambda: x_client))
+        stack.enter_context(
+            mock.patch.dict(
+                os.environ,
+                {
+                    "GEMINI_API_KEY": "benchmark",
+                    "DRY_RUN": "false",
+                    "HARVEST": "false",
+                    "PIPELINE_MODE": "streaming" if target == "streaming" else "batch",
+                },
+            )
+        )
+        inputs = _prepare_inputs(target, corpus, pdf_session)
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                _run_target(target, inputs, gemini, x_client)
+        except Exception as exc:
+            failure = f"{type(exc).__name__}: {exc}"
+        seconds = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return BenchmarkResult(
+        target=target,
+        papers=size,
+        seconds=seconds,
+        papers_per_minute=size / seconds * 60 if seconds else 0.0,
+        peak_memory_mb=peak / 2**20,
+        calls=dict(recorder.calls),
+        errors=dict(recorder.errors),
+        latency_ms={stage: _percentiles(values) for stage, values in recorder.latencies.items()},
+        bytes_sent=recorder.bytes_sent,
+        tweets=len(x_client.tweets),
+        failure=failure,
+    )
+
+
+def format_results(results: list[BenchmarkResult]) -> str:
+    lines = [f"{'target':<10} {'papers':>7} {'seconds':>8} {'papers/min':>11} {'peak MB':>8} {'tweets':>7}  status"]
+    for result in results:
+        lines.append(
+            f"{result.target:<10} {result.papers:>7} {result.seconds:>8.2f} {result.papers_per_minute:>11.1f} "
+            f"{result.peak_memory_mb:>8.1f} {result.tweets:>7}  {result.failure or 'ok'}"
+        )
+        for stage in sorted(result.calls):
+            latency = result.latency_ms.get(stage, {})
+            quantiles = " ".join(f"p{q}={latency.get(f'p{q}', 0.0):.1f}ms" for q in PERCENTILES)
+            lines.append(
+                f"    {stage:<10} calls={result.calls[stage]:<6} errors={result.errors.get(stage, 0):<4} {quantiles}"
+            )
+    return "\n".join(lines)
+
+
+def _prepare_inputs(target: str, corpus: FakeCorpus, pdf_session: FakePdfSession):
+    if target == "judge":
+        return corpus.papers
+    if target == "summarize":
+        pdfs = PdfStore()
+        for paper in corpus.papers:
+            buffer = PdfBuffer(arxiv_pipeline._download_id(paper))
+            buffer.write(pdf_session.payload(paper.pdf_url))
+            pdfs.add(buffer)
+        return corpus.papers, pdfs
+    if target == "post":
+        documents = []
+        for paper in corpus.papers:
+            document = corpus.summary(paper.entry_id)
+            document["arxiv_id"] = paper.entry_id
+            documents.append(document)
+        return arxiv_pipeline.parse_summary([json.dumps(document) for document in documents], [])
+    return None
+
+
+def _run_target(target: str, inputs, gemini, x_client) -> None:
+    if target in ("batch", "streaming"):
+        main.main()
+    elif target == "judge":
+        arxiv_pipeline.judge_papers(inputs, gemini)
+    elif target == "summarize":
+        papers, pdfs = inputs
+        arxiv_pipeline.summarize_reading_list(papers, gemini, pdfs=pdfs)
+    else:
+        x_tweet_module.post(x_client, inputs, dry_run=False)
+
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    ordered = sorted(values)
+    if not ordered:
+        return {}
+    return {
+        f"p{q}": ordered[min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))] * 1000
+        for q in PERCENTILES
+    }
+
+
+def main_cli(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Run the pipeline against latency-simulating fake services.")
+    parser.add_argument("--target", choices=TARGETS, nargs="+", default=["batch"])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--latency-scale", type=float, default=0.01, help="multiplier on the default per-call latencies")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of calls that fail with a 5xx")
+    parser.add_argument("--rate-limit", type=int, help="calls per minute each fake service accepts before a 429")
+    parser.add_argument("--accept-ratio", type=float, default=0.2, help="fraction of judged papers marked should_read")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="append the text report to this file")
+    parser.add_argument("--json", type=Path, help="write machine-readable results to this file")
+    args = parser.parse_args(argv)
+
+    results = [
+        run_benchmark(
+            target,
+            size,
+            latency_scale=args.latency_scale,
+            error_rate=args.error_rate,
+            rate_limit=args.rate_limit,
+            accept_ratio=args.accept_ratio,
+            seed=args.seed,
+        )
+        for target in args.target
+        for size in args.sizes
+    ]
+
+    report = format_results(results)
+    print(report)
+    if args.output:
+        with args.output.open("a", encoding="utf-8") as handle:
+            handle.write(report + "\n")
+    if args.json:
+        args.json.write_text(json.dumps([asdict(result) for result in results], indent=4), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main_cli()
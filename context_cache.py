@@ -0,0 +1,143 @@
+import hashlib
+import threading
+import time
+from datetime import datetime
+
+from google.genai import errors, types
+
+import telemetry
+
+
+DEFAULT_TTL = 3600
+REFRESH_MARGIN = 300
+MIN_CACHED_TOKENS = 1024
+CHARS_PER_TOKEN = 4
+STALE_CACHE_STATUS = frozenset({403, 404})
+
+
+class ContextCache:
+    def __init__(
+        self,
+        client,
+        models,
+        ttl: int = DEFAULT_TTL,
+        margin: float = REFRESH_MARGIN,
+        min_tokens: int = MIN_CACHED_TOKENS,
+        clock=time.time,
+    ):
+        self._client = client
+        self.cached_models = frozenset(models)
+        self.ttl = ttl
+        self.margin = margin
+        self.min_tokens = min_tokens
+        self._clock = clock
+        self._handles: dict[str, tuple[str, float]] = {}
+        self._skipped: set[str] = set()
+        self._lock = threading.Lock()
+        self._key_locks: dict[str, threading.Lock] = {}
+
+    @property
+    def models(self):
+        return _CachingModels(self)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    def handle(self, model: str, instruction: str) -> str | None:
+        if model not in self.cached_models:
+            return None
+
+        key = instruction_hash(model, instruction)
+        with self._key_lock(key):
+            if key in self._skipped:
+                return None
+            cached = self._handles.get(key)
+            now = self._clock()
+            if cached is not None and cached[1] - self.margin > now:
+                return cached[0]
+            if not cacheable(instruction, self.min_tokens):
+                self._skipped.add(key)
+                return None
+
+            try:
+                with telemetry.span("gemini.cache_create", model=model):
+                    telemetry.count("api_calls.gemini.caches.create")
+                    created = self._client.caches.create(
+                        model=model,
+                        config=types.CreateCachedContentConfig(
+                            system_instruction=instruction,
+                            ttl=f"{self.ttl}s",
+                            display_name=f"instruction-{key[:12]}",
+                        ),
+                    )
+            except errors.APIError as exc:
+                print(f"Context caching unavailable for {model}, sending the instruction inline: {exc}")
+                self._skipped.add(key)
+                return None
+
+            if cached is not None:
+                self._delete(cached[0])
+            expires_at = _expiration(created) or now + self.ttl
+            self._handles[key] = (created.name, expires_at)
+            return created.name
+
+    def invalidate(self, model: str, instruction: str) -> None:
+        with self._lock:
+            cached = self._handles.pop(instruction_hash(model, instruction), None)
+        if cached is not None:
+            self._delete(cached[0])
+
+    def close(self) -> None:
+        with self._lock:
+            names, self._handles = [name for name, _ in self._handles.values()], {}
+        for name in names:
+            self._delete(name)
+
+    def _delete(self, name: str) -> None:
+        try:
+            self._client.caches.delete(name=name)
+        except errors.APIError as exc:
+            print(f"Could not delete context cache {name}: {exc}")
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+
+class _CachingModels:
+    def __init__(self, owner: ContextCache):
+        self._owner = owner
+
+    def generate_content(self, *, model, config=None, **kwargs):
+        instruction = getattr(config, "system_instruction", None)
+        name = self._owner.handle(model, instruction) if isinstance(instruction, str) else None
+        if name is None:
+            return self._owner._client.models.generate_content(model=model, config=config, **kwargs)
+
+        cached_config = config.model_copy(update={"system_instruction": None, "cached_content": name})
+        try:
+            return self._owner._client.models.generate_content(model=model, config=cached_config, **kwargs)
+        except errors.ClientError as exc:
+            if exc.code not in STALE_CACHE_STATUS:
+                raise
+            print(f"Context cache {name} was rejected ({exc.code}), retrying with the inline instruction.")
+            self._owner.invalidate(model, instruction)
+            return self._owner._client.models.generate_content(model=model, config=config, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._owner._client.models, name)
+
+
+def cacheable(instruction: str, min_tokens: int = MIN_CACHED_TOKENS) -> bool:
+    return len(instruction) // CHARS_PER_TOKEN >= min_tokens
+
+
+def instruction_hash(model: str, instruction: str) -> str:
+    return hashlib.sha256(f"{model}\n{instruction}".encode("utf-8")).hexdigest()
+
+
+def _expiration(handle) -> float | None:
+    expire_time = getattr(handle, "expire_time", None)
+    if isinstance(expire_time, datetime):
+        return expire_time.timestamp()
+    return None
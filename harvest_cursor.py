@@ -0,0 +1,71 @@
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+
+DEFAULT_LOOKBACK = timedelta(days=2)
+
+
+class HarvestCursor:
+    def __init__(self, path: Path, lookback: timedelta = DEFAULT_LOOKBACK):
+        self.path = Path(path)
+        self.lookback = lookback
+        self.high_water_mark: datetime | None = None
+        self.boundary_ids: set[str] = set()
+        self._load()
+
+    def window(self, now: datetime | None = None) -> tuple[datetime, datetime]:
+        end = now or datetime.now(timezone.utc)
+        start = _minute(self.high_water_mark) if self.high_water_mark else end - self.lookback
+        return start, end
+
+    def is_new(self, paper_id: str, published: datetime) -> bool:
+        if self.high_water_mark is None:
+            return True
+        if published > self.high_water_mark:
+            return True
+        return published >= _minute(self.high_water_mark) and paper_id not in self.boundary_ids
+
+    def advance(self, papers: list[tuple[str, datetime]]) -> None:
+        if not papers:
+            return
+
+        latest = max(published for _, published in papers)
+        if self.high_water_mark is not None and latest < self.high_water_mark:
+            return
+
+        if self.high_water_mark is None or _minute(latest) != _minute(self.high_water_mark):
+            self.boundary_ids = set()
+        self.high_water_mark = latest
+        self.boundary_ids.update(
+            paper_id for paper_id, published in papers if _minute(published) == _minute(latest)
+        )
+
+    def save(self) -> None:
+        if self.high_water_mark is None:
+            return
+        payload = {
+            "high_water_mark": self.high_water_mark.isoformat(),
+            "boundary_ids": sorted(self.boundary_ids),
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(payload, indent=4), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+            self.high_water_mark = datetime.fromisoformat(payload["high_water_mark"])
+            self.boundary_ids = set(payload.get("boundary_ids", []))
+        except (json.JSONDecodeError, OSError, KeyError, TypeError, ValueError) as exc:
+            print(f"Ignoring unreadable harvest cursor {self.path}: {exc}")
+            self.high_water_mark = None
+            self.boundary_ids = set()
+
+
+def _minute(value: datetime) -> datetime:
+    return value.replace(second=0, microsecond=0)
@@ -0,0 +1,214 @@
+import argparse
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+from datetime import date
+from pathlib import Path
+
+from log_store import read_log
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS summaries (
+    digest TEXT PRIMARY KEY,
+    arxiv_id TEXT,
+    arxiv_version TEXT,
+    title TEXT,
+    field TEXT,
+    run_date TEXT,
+    document TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS summaries_arxiv_id ON summaries (arxiv_id);
+CREATE INDEX IF NOT EXISTS summaries_run_date ON summaries (run_date);
+
+CREATE TABLE IF NOT EXISTS judgments (
+    arxiv_id TEXT NOT NULL,
+    arxiv_version TEXT,
+    title TEXT,
+    category TEXT,
+    relevance_score INTEGER,
+    should_read INTEGER,
+    run_date TEXT NOT NULL,
+    verdict TEXT NOT NULL,
+    PRIMARY KEY (arxiv_id, run_date)
+);
+CREATE INDEX IF NOT EXISTS judgments_run_date ON judgments (run_date);
+CREATE INDEX IF NOT EXISTS judgments_score ON judgments (relevance_score);
+CREATE INDEX IF NOT EXISTS judgments_category_date ON judgments (category, run_date);
+"""
+
+
+class HistoryStore:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT (SELECT COUNT(*) FROM summaries) + (SELECT COUNT(*) FROM judgments)"
+            ).fetchone()
+        return row[0] == 0
+
+    def record_summaries(self, documents: list[dict], run_date: str | None = None) -> int:
+        rows = []
+        for document in documents:
+            arxiv_id, version = split_arxiv_id(document.get("arxiv_id") or document.get("id"))
+            payload = json.dumps(document, ensure_ascii=False, sort_keys=True)
+            rows.append(
+                (
+                    hashlib.sha256(payload.encode("utf-8")).hexdigest(),
+                    arxiv_id,
+                    version,
+                    document.get("Title") or document.get("title"),
+                    document.get("Field & Subfield") or document.get("field"),
+                    run_date,
+                    payload,
+                )
+            )
+
+        with self._lock, self._conn:
+            cursor = self._conn.executemany(
+                "INSERT OR IGNORE INTO summaries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return cursor.rowcount
+
+    def record_judgments(self, judged: list[tuple[object, dict]], run_date: str | None = None) -> None:
+        run_date = run_date or date.today().isoformat()
+        rows = []
+        for paper, verdict in judged:
+            arxiv_id, version = split_arxiv_id(getattr(paper, "entry_id", None) or verdict.get("id"))
+            if not arxiv_id:
+                continue
+            rows.append(
+                (
+                    arxiv_id,
+                    version,
+                    verdict.get("title") or getattr(paper, "title", None),
+                    getattr(paper, "primary_category", None),
+                    _as_int(verdict.get("relevance_score")),
+                    int(bool(verdict.get("should_read"))),
+                    run_date,
+                    json.dumps(verdict, ensure_ascii=False),
+                )
+            )
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO judgments VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def has_summary(self, arxiv_id: str) -> bool:
+        base_id, _ = split_arxiv_id(arxiv_id)
+        if not base_id:
+            return False
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM summaries WHERE arxiv_id = ? LIMIT 1", (base_id,)).fetchone()
+        return row is not None
+
+    def summaries_for(self, arxiv_id: str) -> list[dict]:
+        base_id, _ = split_arxiv_id(arxiv_id)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT document FROM summaries WHERE arxiv_id = ? ORDER BY run_date", (base_id,)
+            ).fetchall()
+        return [json.loads(row["document"]) for row in rows]
+
+    def top_papers(
+        self,
+        field: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        limit: int = 10,
+    ) -> list[dict]:
+        clauses = []
+        params: list = []
+        if field:
+            clauses.append("category = ?")
+            params.append(field)
+        if since:
+            clauses.append("run_date >= ?")
+            params.append(since)
+        if until:
+            clauses.append("run_date <= ?")
+            params.append(until)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        query = (
+            "SELECT arxiv_id, arxiv_version, title, category, relevance_score, should_read, run_date "
+            f"FROM judgments {where} ORDER BY relevance_score DESC, run_date DESC LIMIT ?"
+        )
+        with self._lock:
+            rows = self._conn.execute(query, (*params, limit)).fetchall()
+        return [dict(row) for row in rows]
+
+    def import_log(self, path: Path) -> int:
+        return self.record_summaries(read_log(path))
+
+
+def split_arxiv_id(value) -> tuple[str | None, str | None]:
+    if not value:
+        return None, None
+    match = re.search(r"(\d{4}\.\d{4,5})(v\d+)?", str(value))
+    if not match:
+        return None, None
+    return match.group(1), match.group(2)
+
+
+def _as_int(value) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Query the indexed run history.")
+    parser.add_argument("--db", type=Path, default=Path(".cache/history.db"))
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="import summaries from log.json or log.jsonl")
+    import_parser.add_argument("log", type=Path)
+
+    seen_parser = commands.add_parser("seen", help="show earlier summaries of an arXiv id")
+    seen_parser.add_argument("arxiv_id")
+
+    top_parser = commands.add_parser("top", help="list the highest scored judgments")
+    top_parser.add_argument("--field", help="primary arXiv category, e.g. cs.CV")
+    top_parser.add_argument("--since", help="first run date (YYYY-MM-DD)")
+    top_parser.add_argument("--until", help="last run date (YYYY-MM-DD)")
+    top_parser.add_argument("--limit", type=int, default=10)
+
+    args = parser.parse_args(argv)
+    store = HistoryStore(args.db)
+    try:
+        if args.command == "import":
+            print(f"Imported {store.import_log(args.log)} summaries.")
+        elif args.command == "seen":
+            documents = store.summaries_for(args.arxiv_id)
+            if not documents:
+                print(f"No summaries for {args.arxiv_id}.")
+            for document in documents:
+                print(json.dumps(document, indent=4, ensure_ascii=False))
+        else:
+            for row in store.top_papers(args.field, args.since, args.until, args.limit):
+                version = row["arxiv_version"] or ""
+                print(f"{row['relevance_score']}/10  {row['arxiv_id']}{version}  {row['category']}  {row['title']}")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+
+DEFAULT_MAX_ENTRIES = 20_000
+DEFAULT_MAX_AGE_DAYS = 30
+
+
+class JudgmentCache:
+    def __init__(
+        self,
+        path: Path,
+        profile: str,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_age_days: float = DEFAULT_MAX_AGE_DAYS,
+    ):
+        self.path = Path(path)
+        self.profile = profile
+        self.max_entries = max_entries
+        self.max_age = max_age_days * 86400
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, paper_id: str) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(paper_id)
+            if entry is None or self._expired(entry):
+                return None
+            return dict(entry["verdict"])
+
+    def put(self, paper_id: str, verdict: dict) -> None:
+        with self._lock:
+            self._entries[paper_id] = {"stored_at": time.time(), "verdict": dict(verdict)}
+
+    def save(self) -> None:
+        with self._lock:
+            self._evict()
+            payload = {"profile": self.profile, "entries": self._entries}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+
+    def _load(self) -> dict[str, dict]:
+        if not self.path.exists():
+            return {}
+
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError):
+            return {}
+
+        if not isinstance(payload, dict) or payload.get("profile") != self.profile:
+            return {}
+
+        entries = payload.get("entries")
+        if not isinstance(entries, dict):
+            return {}
+        return {key: value for key, value in entries.items() if not self._expired(value)}
+
+    def _expired(self, entry: dict) -> bool:
+        return time.time() - entry.get("stored_at", 0) > self.max_age
+
+    def _evict(self) -> None:
+        self._entries = {key: value for key, value in self._entries.items() if not self._expired(value)}
+        overflow = len(self._entries) - self.max_entries
+        if overflow <= 0:
+            return
+
+        oldest = sorted(self._entries, key=lambda key: self._entries[key].get("stored_at", 0))
+        for key in oldest[:overflow]:
+            del self._entries[key]
+
+
+def profile_hash(*parts: str) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
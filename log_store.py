@@ -0,0 +1,133 @@
+import argparse
+import json
+import os
+import threading
+from pathlib import Path
+
+
+class JsonlLogStore:
+    def __init__(self, path: Path, legacy_path: Path | None = None):
+        self.path = Path(path)
+        self.legacy_path = Path(legacy_path) if legacy_path else None
+        self._lock = threading.Lock()
+
+    def append(self, entries: list[dict]) -> None:
+        if not entries:
+            return
+
+        with self._lock:
+            self._migrate_if_needed()
+            lines = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+            with self.path.open("a+", encoding="utf-8") as handle:
+                if handle.tell() and not self._ends_with_newline():
+                    lines = "\n" + lines
+                handle.write(lines)
+                handle.flush()
+                os.fsync(handle.fileno())
+
+    def entries(self) -> list[dict]:
+        with self._lock:
+            self._migrate_if_needed()
+            return list(self._read())
+
+    def migrate(self) -> int:
+        with self._lock:
+            return self._migrate_if_needed()
+
+    def compact(self) -> int:
+        with self._lock:
+            self._migrate_if_needed()
+            if not self.path.exists():
+                return 0
+
+            seen = set()
+            lines = []
+            for entry in self._read():
+                line = json.dumps(entry, ensure_ascii=False)
+                if line in seen:
+                    continue
+                seen.add(line)
+                lines.append(line + "\n")
+
+            _atomic_write(self.path, "".join(lines))
+            return len(lines)
+
+    def _migrate_if_needed(self) -> int:
+        if self.path.exists() or self.legacy_path is None or not self.legacy_path.exists():
+            return 0
+
+        try:
+            content = json.loads(self.legacy_path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError) as exc:
+            print(f"Error migrating {self.legacy_path}: {exc}")
+            return 0
+
+        entries = content if isinstance(content, list) else [content]
+        _atomic_write(self.path, "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries))
+        print(f"Migrated {len(entries)} entries from {self.legacy_path} to {self.path}")
+        return len(entries)
+
+    def _read(self):
+        if not self.path.exists():
+            return
+        with self.path.open(encoding="utf-8") as handle:
+            for line in handle:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+    def _ends_with_newline(self) -> bool:
+        with self.path.open("rb") as handle:
+            handle.seek(-1, os.SEEK_END)
+            return handle.read(1) == b"\n"
+
+
+def read_log(path: Path) -> list[dict]:
+    path = Path(path)
+    if not path.exists():
+        return []
+
+    text = path.read_text(encoding="utf-8")
+    try:
+        content = json.loads(text)
+        documents = content if isinstance(content, list) else [content]
+    except json.JSONDecodeError:
+        documents = []
+        for line in text.splitlines():
+            try:
+                documents.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return [document for document in documents if isinstance(document, dict)]
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with tmp_path.open("w", encoding="utf-8") as handle:
+        handle.write(text)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp_path, path)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Maintain the append-only summary log.")
+    parser.add_argument("command", choices=["migrate", "compact"])
+    parser.add_argument("--path", type=Path, default=Path("log.jsonl"))
+    parser.add_argument("--legacy", type=Path, default=Path("log.json"))
+    args = parser.parse_args(argv)
+
+    store = JsonlLogStore(args.path, legacy_path=args.legacy)
+    if args.command == "migrate":
+        if not store.migrate():
+            print("Nothing to migrate.")
+    else:
+        print(f"Compacted log to {store.compact()} entries.")
+
+
+if __name__ == "__main__":
+    main()
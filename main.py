@@ -1,29 +1,125 @@
 import arxiv_pipeline
+import pdf_text
+import telemetry
 import x_tweet_module
+from context_cache import ContextCache, cacheable
 from google import genai
 import os
+from pdf_downloader import PdfStore
+from response_schema import DEFAULT_MAX_REPAIRS, ResponseValidator
+from resilient_client import DEFAULT_REQUESTS_PER_MINUTE, ResilientClient
+from token_budget import MeteredClient, TokenLedger
 
 def main():
+    telemetry.start_run()
+    try:
+        run()
+    finally:
+        telemetry.finish_run(arxiv_pipeline.TRACE_PATH)
+
+def run():
     x_auth = x_tweet_module.authenticate()
 
     api_key = os.getenv('GEMINI_API_KEY')
     if not api_key:
         raise ValueError("GEMINI_API_KEY environment variable not set") 
     
-    client = genai.Client(api_key=api_key)
+    ledger = TokenLedger(max_tokens=_env_number("TOKEN_BUDGET", int), max_cost=_env_number("COST_BUDGET", float))
+    requests_per_minute = _env_number("GEMINI_REQUESTS_PER_MINUTE", float) or DEFAULT_REQUESTS_PER_MINUTE
+    gemini = ResilientClient(genai.Client(api_key=api_key), requests_per_minute)
+    contexts = None
+    if any(cacheable(instruction) for instruction in arxiv_pipeline.judge_instructions()):
+        contexts = ContextCache(gemini, models={arxiv_pipeline.JUDGE_MODEL})
+    client = MeteredClient(contexts if contexts else gemini, ledger)
+    max_repairs = _env_number("MAX_REPAIRS", int)
+    validator = ResponseValidator(DEFAULT_MAX_REPAIRS if max_repairs is None else max_repairs)
     
-    result = arxiv_pipeline.search_papers(client)
-    if not result: return
+    judgment_cache = arxiv_pipeline.open_judgment_cache()
+    upload_cache = arxiv_pipeline.open_upload_cache()
+    history = arxiv_pipeline.open_history_store()
+    dry_run = os.getenv("DRY_RUN", "true").lower() not in {"false", "0", "no"}
+    harvest = os.getenv("HARVEST", "false").lower() in {"true", "1", "yes"}
+    cursor = arxiv_pipeline.open_harvest_cursor() if harvest else None
+    rules = arxiv_pipeline.load_rules()
+    duplicates = arxiv_pipeline.open_duplicate_index()
+    deferred = arxiv_pipeline.open_deferral_queue()
+    outbox = arxiv_pipeline.open_outbox()
+    text_tokens = None
+    if os.getenv("SUMMARY_MODE", "upload").lower() == "text":
+        text_tokens = _env_number("SUMMARY_TEXT_TOKENS", int) or pdf_text.DEFAULT_TOKEN_CAP
 
-    summaries = arxiv_pipeline.summarize_reading_list(result, client)
+    if os.getenv("PIPELINE_MODE", "batch").lower() == "streaming":
+        post_scheduler = x_tweet_module.RateLimitScheduler()
+        arxiv_pipeline.stream_reading_list(
+            client,
+            lambda parsed: x_tweet_module.post(
+                x_auth, parsed, dry_run=dry_run, scheduler=post_scheduler, outbox=outbox
+            ),
+            cache=judgment_cache,
+            uploads=upload_cache,
+            history=history,
+            cursor=cursor,
+            rules=rules,
+            duplicates=duplicates,
+            ledger=ledger,
+            deferred=deferred,
+            text_tokens=text_tokens,
+            validator=validator,
+        )
+        _finish(cursor, ledger, deferred, contexts, validator)
+        return
 
-    reading_list = arxiv_pipeline.judge_papers([r for r in result], client)
-    parsed_summaries = arxiv_pipeline.parse_summary(summaries, reading_list)
+    pdfs = PdfStore()
+    pending = []
+    result = arxiv_pipeline.search_papers(
+        client,
+        cache=judgment_cache,
+        history=history,
+        cursor=cursor,
+        rules=rules,
+        duplicates=duplicates,
+        ledger=ledger,
+        deferred=deferred,
+        pdfs=pdfs,
+        validator=validator,
+        pending=pending,
+    )
+    if not result:
+        _finish(cursor, ledger, deferred, contexts, validator)
+        return
 
-    dry_run = os.getenv("DRY_RUN", "true").lower() not in {"false", "0", "no"}
-    x_tweet_module.post(x_auth, parsed_summaries, dry_run=dry_run)
+    summaries = arxiv_pipeline.summarize_reading_list(
+        result,
+        client,
+        uploads=upload_cache,
+        ledger=ledger,
+        text_tokens=text_tokens,
+        pdfs=pdfs,
+        validator=validator,
+        pending=pending,
+    )
+    pdfs.close()
+
+    reading_list = arxiv_pipeline.judge_papers(
+        [r for r in result], client, cache=judgment_cache, rules=rules, validator=validator
+    )
+    parsed_summaries = arxiv_pipeline.parse_summary(summaries, reading_list, history=history)
+
+    x_tweet_module.post(x_auth, parsed_summaries, dry_run=dry_run, outbox=outbox)
     
-    arxiv_pipeline.remove_downloaded_papers()
+    _finish(cursor, ledger, deferred, contexts, validator)
+
+def _finish(cursor, ledger, deferred, contexts, validator):
+    if contexts: contexts.close()
+    if cursor: cursor.save()
+    deferred.extend(ledger.deferred)
+    deferred.save()
+    print(ledger.report())
+    print(validator.report())
+
+def _env_number(name, cast):
+    value = os.getenv(name)
+    return cast(value) if value else None
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,155 @@
+import base64
+import re
+import threading
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from log_store import JsonlLogStore, read_log
+
+
+NUM_PERM = 128
+BANDS = 16
+SHINGLE_SIZE = 3
+DEFAULT_THRESHOLD = 0.8
+MERSENNE_PRIME = (1 << 31) - 1
+SEED = 20240501
+
+
+class NearDuplicateIndex:
+    def __init__(self, path: Path | None = None, threshold: float = DEFAULT_THRESHOLD):
+        if NUM_PERM % BANDS:
+            raise ValueError("NUM_PERM must be divisible by BANDS")
+
+        self.threshold = threshold
+        self._store = JsonlLogStore(path) if path else None
+        self._rows = NUM_PERM // BANDS
+        rng = np.random.default_rng(SEED)
+        self._a = rng.integers(1, MERSENNE_PRIME, size=NUM_PERM, dtype=np.uint64)
+        self._b = rng.integers(0, MERSENNE_PRIME, size=NUM_PERM, dtype=np.uint64)
+        self._ids: list[str] = []
+        self._titles: list[str] = []
+        self._signatures: list[np.ndarray] = []
+        self._buckets: dict[tuple[int, bytes], list[int]] = {}
+        self._known: set[str] = set()
+        self._by_title: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def signature(self, text: str) -> np.ndarray:
+        shingles = _shingles(text)
+        if not shingles:
+            return np.full(NUM_PERM, MERSENNE_PRIME, dtype=np.uint64)
+
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) & MERSENNE_PRIME for shingle in shingles),
+            dtype=np.uint64,
+            count=len(shingles),
+        )
+        permuted = (hashes[:, None] * self._a + self._b) % MERSENNE_PRIME
+        return permuted.min(axis=0)
+
+    def find(self, text: str, title: str | None = None) -> tuple[str, str, float] | None:
+        signature = self.signature(text)
+        with self._lock:
+            index = self._by_title.get(_normalize_title(title or ""))
+            if index is not None:
+                return self._ids[index], self._titles[index], 1.0
+            if (signature == MERSENNE_PRIME).all():
+                return None
+            candidates = set()
+            for band, key in self._band_keys(signature):
+                candidates.update(self._buckets.get((band, key), ()))
+            if not candidates:
+                return None
+            candidates = sorted(candidates)
+
+            matrix = np.stack([self._signatures[index] for index in candidates])
+            similarity = (matrix == signature).mean(axis=1)
+            best = int(similarity.argmax())
+            if similarity[best] < self.threshold:
+                return None
+            index = candidates[best]
+            return self._ids[index], self._titles[index], float(similarity[best])
+
+    def add(self, paper_id: str, title: str, text: str) -> bool:
+        with self._lock:
+            if paper_id in self._known:
+                return False
+        signature = self.signature(text)
+        with self._lock:
+            if paper_id in self._known:
+                return False
+            self._insert(paper_id, title, signature)
+        if self._store is not None:
+            self._store.append([_record(paper_id, title, signature)])
+        return True
+
+    def import_log(self, path: Path) -> int:
+        records = []
+        for document in read_log(path):
+            title = document.get("Title") or document.get("title")
+            if not title:
+                continue
+            paper_id = _log_id(document.get("arxiv_id")) or title
+            signature = self.signature(title)
+            with self._lock:
+                if paper_id in self._known:
+                    continue
+                self._insert(paper_id, title, signature)
+            records.append(_record(paper_id, title, signature))
+        if self._store is not None:
+            self._store.append(records)
+        return len(records)
+
+    def _insert(self, paper_id: str, title: str, signature: np.ndarray) -> None:
+        index = len(self._ids)
+        self._ids.append(paper_id)
+        self._titles.append(title)
+        self._signatures.append(signature)
+        self._known.add(paper_id)
+        if _normalize_title(title):
+            self._by_title.setdefault(_normalize_title(title), index)
+        for band, key in self._band_keys(signature):
+            self._buckets.setdefault((band, key), []).append(index)
+
+    def _band_keys(self, signature: np.ndarray):
+        for band in range(BANDS):
+            yield band, signature[band * self._rows:(band + 1) * self._rows].tobytes()
+
+    def _load(self) -> None:
+        if self._store is None:
+            return
+        for record in self._store.entries():
+            try:
+                signature = np.frombuffer(base64.b64decode(record["signature"]), dtype=np.uint32)
+            except (KeyError, TypeError, ValueError):
+                continue
+            if signature.size != NUM_PERM or record.get("id") in self._known:
+                continue
+            self._insert(record.get("id"), record.get("title", ""), signature.astype(np.uint64))
+
+
+def _record(paper_id: str, title: str, signature: np.ndarray) -> dict:
+    encoded = base64.b64encode(signature.astype(np.uint32).tobytes()).decode("ascii")
+    return {"id": paper_id, "title": title, "signature": encoded}
+
+
+def _log_id(value) -> str | None:
+    match = re.search(r"\d{4}\.\d{4,5}(v\d+)?", str(value or ""))
+    return match.group(0) if match else None
+
+
+def _normalize_title(title: str) -> str:
+    return " ".join(re.findall(r"\w+", title.lower()))
+
+
+def _shingles(text: str) -> set[str]:
+    words = re.findall(r"\w+", text.lower())
+    if len(words) < SHINGLE_SIZE:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[index:index + SHINGLE_SIZE]) for index in range(len(words) - SHINGLE_SIZE + 1)}
@@ -0,0 +1,108 @@
+import hashlib
+import json
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+from log_store import JsonlLogStore
+
+
+class PostOutbox:
+    def __init__(self, path: Path):
+        self.store = JsonlLogStore(path)
+        self.threads: dict[str, dict] = {}
+        self.subjects: dict[str, str] = {}
+        self._resumable: list[str] = []
+        self._lock = threading.Lock()
+        self._load()
+
+    @property
+    def path(self) -> Path:
+        return self.store.path
+
+    def schedule(self, threads: list[tuple[str | None, list[str]]]) -> list[tuple[str, list[str]]]:
+        with self._lock:
+            resumed, self._resumable = self._resumable, []
+            scheduled = [(key, self.threads[key]["tweets"]) for key in resumed if not self._published(key)]
+            keys = {key for key, _ in scheduled}
+            planned = []
+
+            for subject, tweets in threads:
+                key = thread_key(tweets)
+                known = key if key in self.threads else self.subjects.get(subject) if subject else None
+                if known is not None:
+                    if self._published(known):
+                        print(f"Skipped already published thread: {tweets[0][:50]}...")
+                    elif known not in keys:
+                        scheduled.append((known, self.threads[known]["tweets"]))
+                        keys.add(known)
+                    continue
+
+                record = {
+                    "thread": key,
+                    "subject": subject,
+                    "tweets": tweets,
+                    "planned_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                }
+                self._apply(record)
+                planned.append(record)
+                scheduled.append((key, tweets))
+                keys.add(key)
+
+            self.store.append(planned)
+
+        if resumed:
+            print(f"Resuming {len(resumed)} unfinished threads from {self.path}")
+        return scheduled
+
+    def posted_ids(self, key: str) -> list[str]:
+        with self._lock:
+            return list(self.threads[key]["ids"])
+
+    def record(self, key: str, index: int, tweet_id: str) -> None:
+        with self._lock:
+            record = {"thread": key, "index": index, "tweet_id": str(tweet_id)}
+            self._apply(record)
+            self.store.append([record])
+
+    def close(self, key: str, reason: str) -> None:
+        with self._lock:
+            record = {"thread": key, "closed": reason}
+            self._apply(record)
+            self.store.append([record])
+
+    def pending(self) -> list[str]:
+        with self._lock:
+            return [key for key in self.threads if not self._published(key)]
+
+    def _published(self, key: str) -> bool:
+        thread = self.threads[key]
+        return thread["closed"] is not None or len(thread["ids"]) >= len(thread["tweets"])
+
+    def _apply(self, record: dict) -> None:
+        key = record.get("thread")
+        if not key:
+            return
+        if "tweets" in record:
+            if key not in self.threads:
+                self.threads[key] = {"tweets": list(record["tweets"]), "ids": [], "closed": None}
+            if record.get("subject"):
+                self.subjects[record["subject"]] = key
+            return
+
+        thread = self.threads.get(key)
+        if thread is None:
+            return
+        if record.get("closed"):
+            thread["closed"] = record["closed"]
+        elif record.get("index") == len(thread["ids"]):
+            thread["ids"].append(record["tweet_id"])
+
+    def _load(self) -> None:
+        for record in self.store.entries():
+            self._apply(record)
+        self._resumable = [key for key in self.threads if not self._published(key)]
+
+
+def thread_key(tweets: list[str]) -> str:
+    return hashlib.sha256(json.dumps(tweets, ensure_ascii=False).encode("utf-8")).hexdigest()
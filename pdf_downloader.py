@@ -0,0 +1,318 @@
+import hashlib
+import io
+import mmap
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import telemetry
+
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_HOST_INTERVAL = 1.0
+DEFAULT_ATTEMPTS = 3
+CHUNK_SIZE = 256 * 1024
+REQUEST_TIMEOUT = 60
+PDF_MAGIC = b"%PDF"
+SPILL_THRESHOLD = 32 * 2**20
+
+
+class PdfBuffer:
+    def __init__(self, arxiv_id: str, spill_threshold: int = SPILL_THRESHOLD):
+        self.arxiv_id = arxiv_id
+        self.name = Path(safe_filename(arxiv_id)).stem
+        self.spill_threshold = spill_threshold
+        self.size = 0
+        self._handle = io.BytesIO()
+        self._spilled = False
+        self._digest = hashlib.sha256()
+
+    @property
+    def spilled(self) -> bool:
+        return self._spilled
+
+    @property
+    def sha256(self) -> str:
+        return self._digest.hexdigest()
+
+    def write(self, chunk: bytes) -> None:
+        if not self._spilled and self.size + len(chunk) > self.spill_threshold:
+            spill = tempfile.TemporaryFile(prefix=f"{self.name}-", suffix=".pdf")
+            spill.write(self._handle.getbuffer())
+            self._handle = spill
+            self._spilled = True
+        self._handle.seek(0, os.SEEK_END)
+        self._handle.write(chunk)
+        self._digest.update(chunk)
+        self.size += len(chunk)
+
+    def reset(self) -> None:
+        self._handle.seek(0)
+        self._handle.truncate()
+        self._digest = hashlib.sha256()
+        self.size = 0
+
+    def view(self):
+        if not self._spilled:
+            return self._handle.getbuffer()
+        self._handle.flush()
+        if not self.size:
+            return memoryview(b"")
+        return mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def getvalue(self) -> bytes:
+        with self.view() as view:
+            return bytes(view)
+
+    def open(self):
+        self._handle.seek(0)
+        return self._handle
+
+    def close(self) -> None:
+        self._handle.close()
+
+
+class PdfStore:
+    def __init__(self):
+        self._buffers: dict[str, PdfBuffer] = {}
+        self._lock = threading.Lock()
+
+    def add(self, buffer: PdfBuffer) -> None:
+        with self._lock:
+            previous = self._buffers.pop(buffer.name, None)
+            self._buffers[buffer.name] = buffer
+        if previous is not None and previous is not buffer:
+            previous.close()
+
+    def buffers(self) -> list[PdfBuffer]:
+        with self._lock:
+            return list(self._buffers.values())
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._buffers)
+
+    def close(self) -> None:
+        with self._lock:
+            buffers, self._buffers = list(self._buffers.values()), {}
+        for buffer in buffers:
+            buffer.close()
+
+
+@dataclass
+class DownloadResult:
+    arxiv_id: str
+    path: Path | None = None
+    size: int = 0
+    sha256: str | None = None
+    error: str | None = None
+    buffer: PdfBuffer | None = None
+
+
+class HostRateLimiter:
+    def __init__(self, min_interval: float = DEFAULT_HOST_INTERVAL):
+        self.min_interval = min_interval
+        self._next_slot: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host: str) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class PdfDownloader:
+    def __init__(
+        self,
+        directory: Path | None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        host_interval: float = DEFAULT_HOST_INTERVAL,
+        attempts: int = DEFAULT_ATTEMPTS,
+        session: requests.Session | None = None,
+        spill_threshold: int = SPILL_THRESHOLD,
+    ):
+        self.directory = Path(directory) if directory is not None else None
+        self.spill_threshold = spill_threshold
+        self.max_workers = max(1, max_workers)
+        self.attempts = max(1, attempts)
+        self.limiter = HostRateLimiter(host_interval)
+        self.session = session or _pooled_session(self.max_workers)
+
+    def download_all(self, items: list[tuple[str, str]]) -> list[DownloadResult]:
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(lambda item: self.download(*item), items))
+
+    def download(self, arxiv_id: str, url: str, expected_sha256: str | None = None) -> DownloadResult:
+        with telemetry.span("pdf.download", arxiv_id=arxiv_id) as span:
+            result = self._download(arxiv_id, url, expected_sha256)
+            span["bytes"] = result.size
+            if result.error:
+                span["error"] = result.error
+        return result
+
+    def _download(self, arxiv_id: str, url: str, expected_sha256: str | None) -> DownloadResult:
+        if self.directory is None:
+            return self._download_to_memory(arxiv_id, url, expected_sha256)
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        target = self.directory / safe_filename(arxiv_id)
+        if target.exists() and _looks_like_pdf(target):
+            return _verified(arxiv_id, target, expected_sha256)
+
+        partial = target.with_name(target.name + ".part")
+        error = None
+        for attempt in range(self.attempts):
+            if attempt:
+                telemetry.count("retries.download")
+            try:
+                self._fetch(url, partial)
+                break
+            except (requests.RequestException, OSError, ValueError) as exc:
+                error = str(exc)
+        else:
+            return DownloadResult(arxiv_id, error=error)
+
+        if not _looks_like_pdf(partial):
+            partial.unlink(missing_ok=True)
+            return DownloadResult(arxiv_id, error="downloaded file is not a PDF")
+
+        result = _verified(arxiv_id, partial, expected_sha256)
+        if result.error:
+            partial.unlink(missing_ok=True)
+            return result
+
+        os.replace(partial, target)
+        result.path = target
+        return result
+
+    def _download_to_memory(self, arxiv_id: str, url: str, expected_sha256: str | None) -> DownloadResult:
+        buffer = PdfBuffer(arxiv_id, self.spill_threshold)
+        error = None
+        for attempt in range(self.attempts):
+            if attempt:
+                telemetry.count("retries.download")
+            try:
+                self._fetch_into(url, buffer)
+                break
+            except (requests.RequestException, OSError, ValueError) as exc:
+                error = str(exc)
+        else:
+            buffer.close()
+            return DownloadResult(arxiv_id, error=error)
+
+        with buffer.view() as view:
+            is_pdf = view[: len(PDF_MAGIC)] == PDF_MAGIC
+        if not is_pdf:
+            buffer.close()
+            return DownloadResult(arxiv_id, error="downloaded file is not a PDF")
+        if expected_sha256 and buffer.sha256 != expected_sha256.lower():
+            buffer.close()
+            return DownloadResult(arxiv_id, error=f"checksum mismatch for {buffer.name}")
+        if buffer.spilled:
+            telemetry.count("pdf.spilled")
+        return DownloadResult(arxiv_id, size=buffer.size, sha256=buffer.sha256, buffer=buffer)
+
+    def _fetch(self, url: str, partial: Path) -> None:
+        offset = partial.stat().st_size if partial.exists() else 0
+        with self._request(url, offset) as response:
+            if response.status_code == 416 and offset:
+                return
+            response.raise_for_status()
+            append, expected_size = _response_plan(response)
+
+            with partial.open("ab" if append else "wb") as handle:
+                for chunk in _chunks(response):
+                    handle.write(chunk)
+                handle.flush()
+                os.fsync(handle.fileno())
+
+        _check_size(expected_size, partial.stat().st_size)
+
+    def _fetch_into(self, url: str, buffer: PdfBuffer) -> None:
+        offset = buffer.size
+        with self._request(url, offset) as response:
+            if response.status_code == 416 and offset:
+                return
+            response.raise_for_status()
+            append, expected_size = _response_plan(response)
+
+            if not append:
+                buffer.reset()
+            for chunk in _chunks(response):
+                buffer.write(chunk)
+
+        _check_size(expected_size, buffer.size)
+
+    def _request(self, url: str, offset: int):
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        self.limiter.wait(urlparse(url).netloc)
+        telemetry.count("api_calls.pdf.get")
+        return self.session.get(url, headers=headers, stream=True, timeout=REQUEST_TIMEOUT)
+
+
+def safe_filename(arxiv_id: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]", "_", arxiv_id).strip("._") + ".pdf"
+
+
+def _pooled_session(pool_size: int) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _response_plan(response) -> tuple[bool, int | None]:
+    if response.status_code == 206:
+        return True, _total_from_content_range(response.headers.get("Content-Range"))
+    length = response.headers.get("Content-Length")
+    return False, int(length) if length else None
+
+
+def _chunks(response):
+    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+        if chunk:
+            telemetry.count("bytes.downloaded", len(chunk))
+            yield chunk
+
+
+def _check_size(expected_size: int | None, actual_size: int) -> None:
+    if expected_size is not None and actual_size != expected_size:
+        raise ValueError(f"size mismatch: expected {expected_size} bytes, got {actual_size}")
+
+
+def _total_from_content_range(value: str | None) -> int | None:
+    match = re.search(r"/(\d+)$", value or "")
+    return int(match.group(1)) if match else None
+
+
+def _looks_like_pdf(path: Path) -> bool:
+    try:
+        with path.open("rb") as handle:
+            return handle.read(len(PDF_MAGIC)) == PDF_MAGIC
+    except OSError:
+        return False
+
+
+def _verified(arxiv_id: str, path: Path, expected_sha256: str | None) -> DownloadResult:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+
+    checksum = digest.hexdigest()
+    if expected_sha256 and checksum != expected_sha256.lower():
+        return DownloadResult(arxiv_id, error=f"checksum mismatch for {path.name}")
+    return DownloadResult(arxiv_id, path=path, size=path.stat().st_size, sha256=checksum)
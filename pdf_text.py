@@ -0,0 +1,131 @@
+import io
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from pypdf import PdfReader
+
+
+DEFAULT_TOKEN_CAP = 12_000
+CHARS_PER_TOKEN = 4
+MIN_TEXT_CHARS = 2_000
+EXTRACT_MAX_WORKERS = 4
+EXTRACT_START_METHOD = "spawn"
+KEEP_SECTIONS = {
+    "abstract": "abstract",
+    "introduction": "introduction",
+    "method": "method",
+    "methods": "method",
+    "methodology": "method",
+    "approach": "method",
+    "model": "method",
+    "experiments": "results",
+    "experimental results": "results",
+    "experimental setup": "results",
+    "evaluation": "results",
+    "results": "results",
+    "discussion": "results",
+    "conclusion": "conclusion",
+    "conclusions": "conclusion",
+}
+STOP_SECTIONS = {"references", "bibliography", "acknowledgments", "acknowledgements", "appendix", "appendices"}
+HEADING_PATTERN = re.compile(
+    r"^\s*(?:(?:\d+(?:\.\d+)*|[IVX]+)\.?\s+)?([A-Za-z][A-Za-z ]{2,40}?)\s*:?\s*$",
+)
+
+
+def extract_sections(source: Path | bytes, max_tokens: int = DEFAULT_TOKEN_CAP) -> str | None:
+    try:
+        reader = PdfReader(io.BytesIO(source) if isinstance(source, bytes) else str(source))
+        text = "\n".join(page.extract_text() or "" for page in reader.pages)
+    except Exception as exc:
+        name = "in-memory PDF" if isinstance(source, bytes) else Path(source).name
+        print(f"Could not extract text from {name}: {exc}")
+        return None
+
+    if len(text.strip()) < MIN_TEXT_CHARS:
+        return None
+    return select_sections(text, max_tokens)
+
+
+def extract_many(
+    sources: list[Path | bytes], max_tokens: int = DEFAULT_TOKEN_CAP, max_workers: int = EXTRACT_MAX_WORKERS
+) -> list[str | None]:
+    if not sources:
+        return []
+    try:
+        with extraction_pool(min(max_workers, len(sources))) as executor:
+            return list(executor.map(extract_sections, sources, [max_tokens] * len(sources)))
+    except (BrokenProcessPool, OSError) as exc:
+        print(f"Text extraction pool failed, falling back to PDF uploads: {exc}")
+        return [None] * len(sources)
+
+
+def extraction_pool(max_workers: int = EXTRACT_MAX_WORKERS) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=max(1, max_workers), mp_context=multiprocessing.get_context(EXTRACT_START_METHOD)
+    )
+
+
+def select_sections(text: str, max_tokens: int = DEFAULT_TOKEN_CAP) -> str:
+    sections = split_sections(text)
+    kept = [(heading, body) for heading, body in sections if heading is None or _section_kind(heading)]
+    if not any(heading for heading, _ in kept):
+        kept = sections[:1]
+
+    budgets = _share_budget([len(body) for _, body in kept], max_tokens * CHARS_PER_TOKEN)
+    parts = []
+    for (heading, body), budget in zip(kept, budgets):
+        body = _trim(body, budget)
+        if body:
+            parts.append(f"{heading}\n{body}" if heading else body)
+    return "\n\n".join(parts)
+
+
+def split_sections(text: str) -> list[tuple[str | None, str]]:
+    sections: list[tuple[str | None, list[str]]] = [(None, [])]
+    for line in text.replace("\r", "").split("\n"):
+        match = HEADING_PATTERN.match(line)
+        name = match.group(1).strip().lower() if match else None
+        if name in STOP_SECTIONS:
+            break
+        if name in KEEP_SECTIONS or (name and _looks_like_heading(line, match)):
+            sections.append((match.group(1).strip(), []))
+            continue
+        sections[-1][1].append(line)
+
+    return [(heading, _normalize(lines)) for heading, lines in sections if heading or _normalize(lines)]
+
+
+def _section_kind(heading: str) -> str | None:
+    return KEEP_SECTIONS.get(heading.strip().lower())
+
+
+def _looks_like_heading(line: str, match) -> bool:
+    return bool(re.match(r"^\s*(?:\d+|[IVX]+)\.?\s+[A-Z]", line)) and len(match.group(1).split()) <= 5
+
+
+def _share_budget(lengths: list[int], total: int) -> list[int]:
+    budgets = [0] * len(lengths)
+    remaining = total
+    order = sorted(range(len(lengths)), key=lambda index: lengths[index])
+    for position, index in enumerate(order):
+        share = remaining // (len(order) - position)
+        budgets[index] = min(lengths[index], share)
+        remaining -= budgets[index]
+    return budgets
+
+
+def _trim(text: str, limit: int) -> str:
+    if len(text) <= limit:
+        return text
+    cut = text.rfind(" ", 0, limit)
+    return text[: cut if cut > 0 else limit].rstrip()
+
+
+def _normalize(lines: list[str]) -> str:
+    text = "\n".join(lines)
+    text = re.sub(r"-\n(?=[a-z])", "", text)
+    return re.sub(r"[ \t]+", " ", text).strip()
@@ -0,0 +1,105 @@
+import re
+
+import numpy as np
+
+
+SECTION_WEIGHTS = {
+    "strong": 1.0,
+    "moderate": 0.5,
+    "general": 0.25,
+    "avoid": -1.0,
+}
+STOPWORDS = frozenset(
+    "a an and are as at be by e g eg especially for from in into is it its of on or such that the their "
+    "these this to unless via with without while when where which who whose within".split()
+)
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def parse_interests(prompt: str) -> list[tuple[str, float]]:
+    interests = []
+    weight = SECTION_WEIGHTS["general"]
+    for line in prompt.splitlines():
+        stripped = line.strip()
+        if not stripped.startswith("-"):
+            continue
+
+        text = stripped.lstrip("- ").strip()
+        if text.endswith(":"):
+            header = text.lower()
+            weight = next(
+                (value for key, value in SECTION_WEIGHTS.items() if key in header),
+                SECTION_WEIGHTS["general"],
+            )
+            continue
+        if text:
+            interests.append((text, weight))
+    return interests
+
+
+def tokenize(text: str) -> list[str]:
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        if token in STOPWORDS or len(token) < 2:
+            continue
+        if len(token) > 4 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def bm25_scores(
+    documents: list[str],
+    interests: list[tuple[str, float]],
+    k1: float = 1.5,
+    b: float = 0.75,
+) -> np.ndarray:
+    if not documents or not interests:
+        return np.zeros(len(documents))
+
+    vocabulary: dict[str, int] = {}
+    interest_terms = []
+    for text, _ in interests:
+        terms = {vocabulary.setdefault(token, len(vocabulary)) for token in tokenize(text)}
+        interest_terms.append(sorted(terms))
+
+    doc_rows, term_cols, lengths = [], [], np.empty(len(documents))
+    for row, document in enumerate(documents):
+        tokens = tokenize(document)
+        lengths[row] = len(tokens)
+        for token in tokens:
+            column = vocabulary.get(token)
+            if column is not None:
+                doc_rows.append(row)
+                term_cols.append(column)
+
+    size = len(vocabulary)
+    flat = np.asarray(doc_rows, dtype=np.int64) * size + np.asarray(term_cols, dtype=np.int64)
+    counts = np.bincount(flat, minlength=len(documents) * size).reshape(len(documents), size).astype(float)
+
+    doc_freq = (counts > 0).sum(axis=0)
+    idf = np.log1p((len(documents) - doc_freq + 0.5) / (doc_freq + 0.5))
+    average_length = max(lengths.mean(), 1.0)
+    norm = k1 * (1 - b + b * lengths / average_length)
+    weighted = counts * (k1 + 1) / (counts + norm[:, None]) * idf
+
+    queries = np.zeros((size, len(interests)))
+    for column, terms in enumerate(interest_terms):
+        queries[terms, column] = 1.0
+    per_interest = weighted @ queries
+
+    weights = np.array([weight for _, weight in interests])
+    positive = weights > 0
+    score = (per_interest[:, positive] * weights[positive]).max(axis=1) if positive.any() else 0.0
+    if (~positive).any():
+        score = score - (per_interest[:, ~positive] * -weights[~positive]).max(axis=1)
+    return np.asarray(score, dtype=float)
+
+
+def select(scores: np.ndarray, top_k: int | None = None, min_score: float | None = None) -> list[int]:
+    order = np.argsort(-scores, kind="stable")
+    if min_score is not None:
+        order = order[scores[order] > min_score]
+    if top_k is not None:
+        order = order[:top_k]
+    return sorted(order.tolist())
@@ -0,0 +1,236 @@
+import random
+import re
+import threading
+import time
+
+import httpx
+from google.genai import errors
+
+import telemetry
+
+
+RETRYABLE_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+DEFAULT_REQUESTS_PER_MINUTE = 600
+DEFAULT_MAX_ATTEMPTS = 6
+BASE_DELAY = 1.0
+MAX_DELAY = 60.0
+INITIAL_CONCURRENCY = 4
+MAX_CONCURRENCY = 32
+DECREASE_FACTOR = 0.5
+DECREASE_COOLDOWN = 5.0
+
+
+class TokenBucket:
+    def __init__(self, rate_per_second: float, capacity: float | None = None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate_per_second
+        self.capacity = capacity or max(1.0, rate_per_second)
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
+
+
+class AimdLimiter:
+    def __init__(
+        self,
+        initial: float = INITIAL_CONCURRENCY,
+        minimum: float = 1,
+        maximum: float = MAX_CONCURRENCY,
+        decrease: float = DECREASE_FACTOR,
+        cooldown: float = DECREASE_COOLDOWN,
+        clock=time.monotonic,
+    ):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self._clock = clock
+        self._last_decrease = float("-inf")
+        self._condition = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+
+    def release(self, throttled: bool = False) -> None:
+        with self._condition:
+            self.in_flight -= 1
+            if throttled:
+                now = self._clock()
+                if now - self._last_decrease >= self.cooldown:
+                    self.limit = max(self.minimum, self.limit * self.decrease)
+                    self._last_decrease = now
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+
+class ResilientClient:
+    def __init__(
+        self,
+        client,
+        requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        initial_concurrency: float = INITIAL_CONCURRENCY,
+        max_concurrency: float = MAX_CONCURRENCY,
+        sleep=time.sleep,
+    ):
+        self._client = client
+        self.requests_per_minute = requests_per_minute
+        self.max_attempts = max(1, max_attempts)
+        self.initial_concurrency = initial_concurrency
+        self.max_concurrency = max_concurrency
+        self._sleep = sleep
+        self._controls: dict[str, tuple[TokenBucket, AimdLimiter]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def models(self):
+        return _ResilientModels(self)
+
+    @property
+    def files(self):
+        return _ResilientFiles(self)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    def limiter(self, key: str) -> AimdLimiter:
+        return self._control(key)[1]
+
+    def call(self, key: str, func, *args, **kwargs):
+        bucket, limiter = self._control(key)
+        for attempt in range(self.max_attempts):
+            bucket.acquire()
+            limiter.acquire()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as exc:
+                throttled = _status(exc) == 429
+                limiter.release(throttled=throttled)
+                if not is_retryable(exc) or attempt + 1 >= self.max_attempts:
+                    raise
+
+                delay = backoff_delay(attempt, retry_after(exc))
+                telemetry.count("retries.gemini")
+                if throttled:
+                    telemetry.count("throttled.gemini")
+                print(
+                    f"Gemini {key} call failed ({_status(exc) or type(exc).__name__}), "
+                    f"retrying in {delay:.1f}s (attempt {attempt + 2}/{self.max_attempts}, "
+                    f"concurrency limit {int(limiter.limit)})"
+                )
+                self._sleep(delay)
+                continue
+
+            limiter.release()
+            return result
+
+    def _control(self, key: str) -> tuple[TokenBucket, AimdLimiter]:
+        with self._lock:
+            control = self._controls.get(key)
+            if control is None:
+                control = (
+                    TokenBucket(self.requests_per_minute / 60, sleep=self._sleep),
+                    AimdLimiter(self.initial_concurrency, maximum=self.max_concurrency),
+                )
+                self._controls[key] = control
+            return control
+
+
+class _ResilientModels:
+    def __init__(self, owner: ResilientClient):
+        self._owner = owner
+
+    def generate_content(self, *, model, **kwargs):
+        return self._owner.call(model, self._owner._client.models.generate_content, model=model, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._owner._client.models, name)
+
+
+class _ResilientFiles:
+    def __init__(self, owner: ResilientClient):
+        self._owner = owner
+
+    def upload(self, **kwargs):
+        file = kwargs.get("file")
+
+        def upload():
+            if hasattr(file, "seek"):
+                file.seek(0)
+            return self._owner._client.files.upload(**kwargs)
+
+        return self._owner.call("files.upload", upload)
+
+    def __getattr__(self, name):
+        return getattr(self._owner._client.files, name)
+
+
+def is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, errors.APIError):
+        return _status(exc) in RETRYABLE_STATUS
+    return isinstance(exc, (httpx.TransportError, ConnectionError, TimeoutError))
+
+
+def retry_after(exc: Exception) -> float | None:
+    delay = _find_retry_delay(getattr(exc, "details", None))
+    if delay is not None:
+        return delay
+
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, hint: float | None = None) -> float:
+    ceiling = min(MAX_DELAY, BASE_DELAY * 2**attempt)
+    if hint is not None:
+        return min(MAX_DELAY, hint) + random.uniform(0, BASE_DELAY)
+    return random.uniform(ceiling / 2, ceiling)
+
+
+def _status(exc: Exception) -> int | None:
+    code = getattr(exc, "code", None)
+    return code if isinstance(code, int) else None
+
+
+def _find_retry_delay(value) -> float | None:
+    if isinstance(value, dict):
+        delay = value.get("retryDelay")
+        if isinstance(delay, str):
+            match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)s\s*", delay)
+            if match:
+                return float(match.group(1))
+        children = value.values()
+    elif isinstance(value, list):
+        children = value
+    else:
+        return None
+
+    for child in children:
+        delay = _find_retry_delay(child)
+        if delay is not None:
+            return delay
+    return None
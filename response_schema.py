@@ -0,0 +1,136 @@
+import json
+import re
+import threading
+
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError
+
+import telemetry
+
+
+DEFAULT_MAX_REPAIRS = 10
+REPAIR_ERROR_LIMIT = 3
+FENCE_PATTERN = re.compile(r"```(?:json)?\s*(.*?)\s*```", re.DOTALL)
+OUTCOMES = ("checked", "invalid", "repaired", "dropped")
+
+
+class Verdict(BaseModel):
+    title: str
+    id: str
+    should_read: bool
+    relevance_score: int = Field(ge=1, le=10)
+    one_sentence_summary: str = ""
+    reasoning: str = ""
+    keywords: list[str] = Field(default_factory=list)
+
+
+class PaperSummary(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    title: str = Field(alias="Title")
+    field: str = Field("", alias="Field & Subfield")
+    key_contributions: str = Field("", alias="Key Contributions")
+    methodology: str = Field("", alias="Methodology")
+    strengths: str = Field("", alias="Strengths")
+    limitations: str = Field("", alias="Limitations")
+    datasets: str = Field("", alias="Datasets / Benchmarks")
+    results_summary: str = Field("", alias="Results Summary")
+    why_it_matters: str = Field("", alias="Why It Matters")
+    should_read_fully: str = Field("", alias="Should Read Fully?")
+    key_figures: str = Field("", alias="Key Figures or Tables")
+
+
+class ResponseValidator:
+    def __init__(self, max_repairs: int = DEFAULT_MAX_REPAIRS):
+        self.max_repairs = max_repairs
+        self.repairs_used = 0
+        self.stats: dict[str, dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, kind: str, schema, text: str | None, reask=None):
+        value, error = validate(schema, text)
+        self._record(kind, "checked")
+        if error is None:
+            return value
+
+        self._record(kind, "invalid")
+        telemetry.count(f"parse_failures.{kind}")
+        if reask is not None and self._take_repair():
+            telemetry.count(f"repairs.{kind}")
+            print(f"Invalid {kind} response ({error}), asking the model to repair it.")
+            value, error = validate(schema, reask(repair_prompt(error), text or ""))
+            if error is None:
+                self._record(kind, "repaired")
+                return value
+
+        self._record(kind, "dropped")
+        print(f"\n⚠ Error parsing response ({kind}), dropping it: {error}")
+        print(f"Raw response: {str(text)[:200]}...")
+        return None
+
+    def failure_rate(self) -> float:
+        with self._lock:
+            checked = sum(entry["checked"] for entry in self.stats.values())
+            invalid = sum(entry["invalid"] for entry in self.stats.values())
+        return invalid / checked if checked else 0.0
+
+    def report(self) -> str:
+        with self._lock:
+            stats = {kind: dict(entry) for kind, entry in sorted(self.stats.items())}
+        parts = [
+            f"{kind} {entry['invalid']}/{entry['checked']} invalid, {entry['repaired']} repaired, {entry['dropped']} dropped"
+            for kind, entry in stats.items()
+        ]
+        summary = f"Parse failure rate: {self.failure_rate():.1%}"
+        if parts:
+            summary += f" ({'; '.join(parts)}; {self.repairs_used} of {self.max_repairs} repairs used)"
+        return summary
+
+    def _take_repair(self) -> bool:
+        with self._lock:
+            if self.repairs_used >= self.max_repairs:
+                return False
+            self.repairs_used += 1
+            return True
+
+    def _record(self, kind: str, outcome: str) -> None:
+        with self._lock:
+            entry = self.stats.setdefault(kind, {name: 0 for name in OUTCOMES})
+            entry[outcome] += 1
+
+
+def validate(schema, text: str | None):
+    if not isinstance(text, str) or not text.strip():
+        return None, "empty response"
+
+    match = FENCE_PATTERN.search(text)
+    payload = match.group(1) if match else text.strip()
+    try:
+        return TypeAdapter(schema).validate_json(payload), None
+    except ValidationError as exc:
+        return None, _describe(exc)
+
+
+def dump(value, exclude_unset: bool = False) -> dict | list:
+    if isinstance(value, list):
+        return [dump(item, exclude_unset) for item in value]
+    return value.model_dump(by_alias=True, exclude_unset=exclude_unset)
+
+
+def dumps(value, exclude_unset: bool = False) -> str:
+    return json.dumps(dump(value, exclude_unset), ensure_ascii=False)
+
+
+def repair_prompt(error: str) -> str:
+    return (
+        "Your previous reply did not match the required JSON schema: "
+        f"{error}. Reply again with only the corrected JSON, keeping the original content. "
+        "Your previous reply was:"
+    )
+
+
+def _describe(exc: ValidationError) -> str:
+    problems = []
+    for detail in exc.errors()[:REPAIR_ERROR_LIMIT]:
+        location = ".".join(str(part) for part in detail["loc"]) or "response"
+        problems.append(f"{location}: {detail['msg']}")
+    return "; ".join(problems)
@@ -0,0 +1,78 @@
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+
+ACTIONS = ("accept", "reject")
+DEFAULT_SCORES = {"accept": 10, "reject": 1}
+
+
+@dataclass(frozen=True)
+class Rule:
+    name: str
+    action: str
+    score: int
+
+
+class RuleSet:
+    def __init__(self, rules: list[dict]):
+        self.rules: list[Rule] = []
+        self._categories: dict[str, int] = {}
+        self._authors: dict[str, int] = {}
+        self._group_rules: dict[str, int] = {}
+        alternatives = []
+
+        for index, spec in enumerate(rules):
+            action = spec.get("action")
+            if action not in ACTIONS:
+                raise ValueError(f"Rule {index} must have action 'accept' or 'reject', got {action!r}")
+            name = spec.get("name") or f"rule-{index}"
+            self.rules.append(Rule(name, action, int(spec.get("score", DEFAULT_SCORES[action]))))
+
+            for category in spec.get("categories", []):
+                self._categories.setdefault(category.strip().lower(), index)
+            for author in spec.get("authors", []):
+                self._authors.setdefault(_normalize_author(author), index)
+
+            sources = [rf"\b{re.escape(keyword)}\b" for keyword in spec.get("keywords", [])]
+            sources += spec.get("patterns", [])
+            for source in sources:
+                group = f"r{len(self._group_rules)}"
+                re.compile(source)
+                self._group_rules[group] = index
+                alternatives.append(f"(?P<{group}>{source})")
+
+        self._matcher = re.compile(f"(?=(?:{'|'.join(alternatives)}))", re.IGNORECASE) if alternatives else None
+
+    @classmethod
+    def load(cls, path: Path) -> "RuleSet":
+        payload = json.loads(Path(path).read_text(encoding="utf-8"))
+        rules = payload.get("rules", []) if isinstance(payload, dict) else payload
+        return cls(rules)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def decide(self, paper) -> Rule | None:
+        matched = []
+
+        category = getattr(paper, "primary_category", None)
+        if category and category.lower() in self._categories:
+            matched.append(self._categories[category.lower()])
+
+        for author in getattr(paper, "authors", None) or []:
+            index = self._authors.get(_normalize_author(getattr(author, "name", author)))
+            if index is not None:
+                matched.append(index)
+
+        if self._matcher is not None:
+            text = f"{getattr(paper, 'title', '')}\n{getattr(paper, 'summary', '')}"
+            for match in self._matcher.finditer(text):
+                matched.append(self._group_rules[match.lastgroup])
+
+        return self.rules[min(matched)] if matched else None
+
+
+def _normalize_author(name) -> str:
+    return " ".join(str(name).split()).casefold()
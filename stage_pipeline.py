@@ -0,0 +1,88 @@
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+
+
+DEFAULT_QUEUE_SIZE = 8
+
+_DONE = object()
+
+
+@dataclass
+class Stage:
+    name: str
+    func: Callable[[Any], Any]
+    workers: int = 1
+    fan_out: bool = False
+
+
+def run_stages(
+    items: Iterable, stages: list[Stage], queue_size: int = DEFAULT_QUEUE_SIZE, failures: list | None = None
+) -> list:
+    if not stages:
+        return list(items)
+
+    queues = [queue.Queue(maxsize=max(1, queue_size)) for _ in stages]
+    results: list[tuple[int, Any]] = []
+    results_lock = threading.Lock()
+    threads = []
+
+    for position, stage in enumerate(stages):
+        workers = max(1, stage.workers)
+        remaining = [workers]
+        remaining_lock = threading.Lock()
+        inbox = queues[position]
+        outbox = queues[position + 1] if position + 1 < len(stages) else None
+        downstream = max(1, stages[position + 1].workers) if outbox is not None else 0
+
+        def work(stage=stage, inbox=inbox, outbox=outbox, downstream=downstream,
+                 remaining=remaining, remaining_lock=remaining_lock):
+            while True:
+                message = inbox.get()
+                if message is _DONE:
+                    with remaining_lock:
+                        remaining[0] -= 1
+                        last = remaining[0] == 0
+                    if last and outbox is not None:
+                        for _ in range(downstream):
+                            outbox.put(_DONE)
+                    return
+
+                index, item = message
+                try:
+                    output = stage.func(item)
+                except Exception as exc:
+                    print(f"Stage '{stage.name}' failed: {exc}")
+                    if failures is not None:
+                        with results_lock:
+                            failures.append((stage.name, item, exc))
+                    continue
+                if output is None:
+                    continue
+
+                if stage.fan_out:
+                    emitted = [((index, position), part) for position, part in enumerate(output)]
+                else:
+                    emitted = [(index, output)]
+                for message in emitted:
+                    if outbox is not None:
+                        outbox.put(message)
+                    else:
+                        with results_lock:
+                            results.append(message)
+
+        for _ in range(workers):
+            thread = threading.Thread(target=work, name=f"stage-{stage.name}", daemon=True)
+            thread.start()
+            threads.append(thread)
+
+    for index, item in enumerate(items):
+        queues[0].put((index, item))
+    for _ in range(max(1, stages[0].workers)):
+        queues[0].put(_DONE)
+
+    for thread in threads:
+        thread.join()
+
+    return [output for _, output in sorted(results, key=lambda pair: pair[0])]
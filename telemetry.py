@@ -0,0 +1,162 @@
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+
+class Tracer:
+    def __init__(self):
+        self.trace_id = uuid.uuid4().hex
+        self.root_id = uuid.uuid4().hex[:16]
+        self.started_ns = time.time_ns()
+        self.spans: list[dict] = []
+        self.counters: dict[str, float] = {}
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        stack = self._stack()
+        record = {
+            "name": name,
+            "span_id": uuid.uuid4().hex[:16],
+            "parent_id": stack[-1] if stack else self.root_id,
+            "thread": threading.current_thread().name,
+            "start_time_unix_nano": time.time_ns(),
+            "attributes": attributes,
+            "status": "ok",
+        }
+        stack.append(record["span_id"])
+        started = time.perf_counter()
+        try:
+            yield attributes
+        except BaseException as exc:
+            record["status"] = "error"
+            record["error"] = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            stack.pop()
+            record["duration_ms"] = (time.perf_counter() - started) * 1000
+            record["end_time_unix_nano"] = record["start_time_unix_nano"] + int(record["duration_ms"] * 1e6)
+            with self._lock:
+                self.spans.append(record)
+
+    def count(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def stages(self) -> dict[str, dict]:
+        durations: dict[str, list[float]] = {}
+        with self._lock:
+            for record in self.spans:
+                durations.setdefault(record["name"], []).append(record["duration_ms"])
+
+        summary = {}
+        for name, values in sorted(durations.items()):
+            values.sort()
+            summary[name] = {
+                "count": len(values),
+                "total_ms": sum(values),
+                "p50_ms": _percentile(values, 50),
+                "p95_ms": _percentile(values, 95),
+                "max_ms": values[-1],
+            }
+        return summary
+
+    def export(self, path: Path) -> Path:
+        duration_ms = (time.perf_counter() - self._started) * 1000
+        with self._lock:
+            spans = list(self.spans)
+            counters = dict(sorted(self.counters.items()))
+        payload = {
+            "trace_id": self.trace_id,
+            "root_span": {
+                "name": "run",
+                "span_id": self.root_id,
+                "start_time_unix_nano": self.started_ns,
+                "end_time_unix_nano": self.started_ns + int(duration_ms * 1e6),
+                "duration_ms": duration_ms,
+            },
+            "counters": counters,
+            "stages": self.stages(),
+            "spans": sorted(spans, key=lambda record: record["start_time_unix_nano"]),
+        }
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(payload, indent=2, default=str), encoding="utf-8")
+        os.replace(tmp_path, path)
+        return path
+
+    def _stack(self) -> list[str]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+
+_active: Tracer | None = None
+
+
+def start_run() -> Tracer:
+    global _active
+    _active = Tracer()
+    return _active
+
+
+def finish_run(path: Path) -> Tracer | None:
+    global _active
+    tracer, _active = _active, None
+    if tracer is None:
+        return None
+
+    tracer.export(path)
+    print(f"Run trace written to {path}")
+    for name, stage in tracer.stages().items():
+        print(
+            f"  {name}: {stage['count']} spans, {stage['total_ms'] / 1000:.2f}s total, "
+            f"p50 {stage['p50_ms']:.0f}ms, p95 {stage['p95_ms']:.0f}ms"
+        )
+    for name, value in sorted(tracer.counters.items()):
+        print(f"  {name} = {value:g}")
+    return tracer
+
+
+def active() -> Tracer | None:
+    return _active
+
+
+def span(name: str, **attributes):
+    tracer = _active
+    if tracer is None:
+        return nullcontext(attributes)
+    return tracer.span(name, **attributes)
+
+
+def traced(name: str):
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def count(name: str, value: float = 1) -> None:
+    tracer = _active
+    if tracer is not None:
+        tracer.count(name, value)
+
+
+def _percentile(ordered: list[float], q: int) -> float:
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))
+    return ordered[index]
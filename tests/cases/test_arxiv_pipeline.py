@@ -1,10 +1,15 @@
 import json
+import threading
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from types import SimpleNamespace
 
 import pytest
 
 import arxiv_pipeline
+from pdf_downloader import PdfBuffer, PdfStore
+from response_schema import ResponseValidator
+from tests.cases.test_pdf_text import build_pdf, paper_lines
 
 
 class DummyPaper:
@@ -32,7 +37,10 @@ class StubFiles:
     def __init__(self, captures):
         self._captures = captures
 
-    def upload(self, file):
+    def upload(self, file, config=None):
+        if config is not None:
+            self._captures.append(file.read())
+            return f"uploaded::{config.display_name}"
         self._captures.append(Path(file))
         return f"uploaded::{Path(file).name}"
 
@@ -47,6 +55,15 @@ class StubClient:
         self.files = StubFiles(upload_captures)
 
 
+def _pdf_store(**contents):
+    pdfs = PdfStore()
+    for name, content in contents.items():
+        buffer = PdfBuffer(name)
+        buffer.write(content)
+        pdfs.add(buffer)
+    return pdfs
+
+
 def _kv_list_to_dict(kv_list):
     result = {}
     for item in kv_list:
@@ -78,7 +95,7 @@ def test_judge_papers_prioritises_high_scores(capsys):
     client = StubClient(responses=responses)
     papers = [DummyPaper("Paper Low", "id-low"), DummyPaper("Paper High", "id-high")]
 
-    reading_list = arxiv_pipeline.judge_papers(papers, client)
+    reading_list = arxiv_pipeline.judge_papers(papers, client, max_workers=1, batch_size=1)
 
     captured = capsys.readouterr()
     assert "Skipped: Paper Low" in captured.out
@@ -95,6 +112,122 @@ def test_judge_papers_prioritises_high_scores(capsys):
     ]
 
 
+def test_judge_papers_runs_concurrently_in_stable_order(capsys):
+    barrier = threading.Barrier(3, timeout=5)
+    scores = {"Paper A": 4, "Paper B": 8, "Paper C": 8}
+
+    class KeyedModels:
+        def generate_content(self, *args, contents, **kwargs):
+            title = contents[0].split(",\n", 1)[0]
+            barrier.wait()
+            return SimpleNamespace(
+                text=json.dumps(
+                    {
+                        "title": title,
+                        "id": f"id-{title}",
+                        "should_read": True,
+                        "relevance_score": scores[title],
+                        "one_sentence_summary": "",
+                        "reasoning": "",
+                        "keywords": [],
+                    }
+                )
+            )
+
+    client = SimpleNamespace(models=KeyedModels())
+    papers = [DummyPaper(title, f"id-{title}") for title in scores]
+
+    reading_list = arxiv_pipeline.judge_papers(papers, client, max_workers=3, batch_size=1)
+
+    captured = capsys.readouterr()
+    assert [item["title"] for item in reading_list] == ["Paper B", "Paper C", "Paper A"]
+    assert captured.out.index("Paper A, id-Paper A") < captured.out.index("Paper B, id-Paper B")
+
+
+def test_judge_papers_batches_and_retries_missing_verdicts():
+    def verdict(paper_id, score):
+        return {
+            "title": f"Paper {paper_id}",
+            "id": f"http://arxiv.org/abs/{paper_id}",
+            "should_read": True,
+            "relevance_score": score,
+            "one_sentence_summary": "",
+            "reasoning": "",
+            "keywords": [],
+        }
+
+    responses = [
+        json.dumps([verdict("0001.00001", 3), verdict("0003.00003v1", 7)]),
+        json.dumps(verdict("0002.00002v1", 9)),
+    ]
+    client = StubClient(responses=responses)
+    papers = [
+        DummyPaper("Paper 0001.00001", "http://arxiv.org/abs/0001.00001v1"),
+        DummyPaper("Paper 0002.00002", "http://arxiv.org/abs/0002.00002v1"),
+        DummyPaper("Paper 0003.00003", "http://arxiv.org/abs/0003.00003v1"),
+    ]
+
+    reading_list = arxiv_pipeline.judge_papers(papers, client, batch_size=3)
+
+    assert [item["relevance_score"] for item in reading_list] == [9, 7, 3]
+
+
+def test_plan_batches_respects_token_budget(monkeypatch):
+    monkeypatch.setattr(arxiv_pipeline, "JUDGE_BATCH_TOKEN_BUDGET", 500)
+    papers = [DummyPaper("Paper", f"id-{index}") for index in range(5)]
+
+    batches = arxiv_pipeline._plan_batches(papers, batch_size=4)
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert sum(batches, []) == list(range(5))
+
+
+def test_judge_papers_reuses_cached_judgments(tmp_path):
+    verdict = {
+        "title": "Paper",
+        "id": "http://arxiv.org/abs/0001.00001v1",
+        "should_read": True,
+        "relevance_score": 6,
+        "one_sentence_summary": "",
+        "reasoning": "",
+        "keywords": [],
+    }
+    papers = [DummyPaper("Paper", "http://arxiv.org/abs/0001.00001v1")]
+    cache_path = tmp_path / "judgments.json"
+
+    first = arxiv_pipeline.judge_papers(
+        papers, StubClient(responses=[json.dumps(verdict)]), cache=arxiv_pipeline.open_judgment_cache(cache_path)
+    )
+    second = arxiv_pipeline.judge_papers(
+        papers, StubClient(responses=[]), cache=arxiv_pipeline.open_judgment_cache(cache_path)
+    )
+
+    assert first == second == [verdict]
+
+
+def test_judge_papers_applies_rules_before_calling_gemini(capsys):
+    from rules_engine import RuleSet
+
+    rules = RuleSet(
+        [
+            {"name": "watched", "action": "accept", "authors": ["Author"], "score": 9},
+            {"name": "off-topic", "action": "reject", "keywords": ["graphene"]},
+        ]
+    )
+    accepted = DummyPaper("Watched Paper", "http://arxiv.org/abs/0001.00001v1")
+    rejected = DummyPaper("Graphene sheets", "http://arxiv.org/abs/0002.00002v1")
+    rejected.authors = ["Someone Else"]
+
+    reading_list = arxiv_pipeline.judge_papers([accepted, rejected], StubClient(responses=[]), rules=rules)
+
+    assert [(item["title"], item["decided_by"], item["relevance_score"]) for item in reading_list] == [
+        ("Watched Paper", "rule:watched", 9)
+    ]
+    out = capsys.readouterr().out
+    assert "Skipped: Graphene sheets" in out
+    assert "Matched rule 'off-topic'" in out
+
+
 def test_judge_papers_handles_invalid_response(capsys):
     client = StubClient(responses=["not-json"])
     papers = [DummyPaper("Paper", "id")]
@@ -106,33 +239,210 @@ def test_judge_papers_handles_invalid_response(capsys):
     assert "Error parsing response" in captured.out
 
 
-def test_summarize_reading_list_processes_pdfs(tmp_path, monkeypatch):
+def test_judge_papers_reasks_with_schema_error():
+    verdict = {"title": "Paper", "id": "0001.00001", "should_read": True, "relevance_score": 7}
+    client = StubClient(responses=[json.dumps({**verdict, "should_read": "maybe"}), json.dumps(verdict)])
+    validator = ResponseValidator(max_repairs=1)
+
+    result = arxiv_pipeline.judge_papers([DummyPaper("Paper", "0001.00001")], client, validator=validator)
+
+    assert [item["relevance_score"] for item in result] == [7]
+    assert validator.stats["judge"]["repaired"] == 1
+
+
+def test_resolve_papers_reuses_fetched_results_and_batches_lookups(monkeypatch, capsys):
+    fetched = DummyPaper("Fetched", "http://arxiv.org/abs/0001.00001v1")
+    remote = DummyPaper("Remote", "http://arxiv.org/abs/0002.00002v2")
+    searches = []
+
+    class FakeArxivClient:
+        def results(self, search):
+            searches.append(list(search.id_list))
+            return iter([remote])
+
+    monkeypatch.setattr(arxiv_pipeline, "_arxiv_client", lambda: FakeArxivClient())
+
+    reading_list = [
+        {"id": "http://arxiv.org/abs/0002.00002v2"},
+        {"id": "http://arxiv.org/abs/0001.00001v1"},
+        {"id": "http://arxiv.org/abs/0003.00003v1"},
+        {"id": "not-an-id"},
+    ]
+    resolved = arxiv_pipeline._resolve_papers(reading_list, arxiv_pipeline._build_registry([fetched]))
+
+    captured = capsys.readouterr()
+    assert resolved == [remote, fetched]
+    assert searches == [["0002.00002v2", "0003.00003v1"]]
+    assert "Failed to download paper with id 0003.00003v1" in captured.out
+    assert "Invalid arXiv ID or URL format: not-an-id" in captured.out
+
+
+def test_harvest_papers_queries_window_and_advances_cursor(tmp_path, monkeypatch):
+    published = datetime(2026, 10, 16, 9, 0, tzinfo=timezone.utc)
+    cursor = arxiv_pipeline.open_harvest_cursor(tmp_path / "cursor.json")
+    cursor.advance([("0001.00001v1", published)])
+
+    seen = DummyPaper("Seen", "http://arxiv.org/abs/0001.00001v1")
+    fresh = DummyPaper("Fresh", "http://arxiv.org/abs/0002.00002v1")
+    seen.published, fresh.published = published, published + timedelta(hours=2)
+    searches = []
+
+    class FakeArxivClient:
+        def results(self, search):
+            searches.append(search)
+            return iter([seen, fresh])
+
+    monkeypatch.setattr(arxiv_pipeline, "_arxiv_client", lambda: FakeArxivClient())
+
+    assert arxiv_pipeline._harvest_papers(cursor) == [fresh]
+    assert "submittedDate:[202610160900 TO " in searches[0].query
+    assert searches[0].max_results is None
+    assert cursor.high_water_mark == fresh.published
+
+
+def test_summarize_reading_list_ignores_a_stale_papers_dir(tmp_path, monkeypatch):
     monkeypatch.chdir(tmp_path)
     papers_dir = Path("papers")
     papers_dir.mkdir()
-    (papers_dir / "paper-one.pdf").write_bytes(b"dummy pdf content")
-    (papers_dir / "ignore.txt").write_text("not a pdf")
+    (papers_dir / "stale.pdf").write_bytes(b"%PDF left over from an old run")
 
     uploads = []
-    responses = ["{\"Title\": \"Paper One\"}"]
-    client = StubClient(responses=responses, upload_captures=uploads)
-    summaries = arxiv_pipeline.summarize_reading_list([], client)
+    client = StubClient(responses=["{}"], upload_captures=uploads)
 
-    assert summaries == responses
-    assert uploads == [papers_dir / "paper-one.pdf"]
+    assert arxiv_pipeline.summarize_reading_list([], client) == []
+    assert arxiv_pipeline.summarize_reading_list([], client, pdfs=_pdf_store()) == []
+    assert uploads == []
 
 
-def test_remove_downloaded_papers(tmp_path, monkeypatch):
+def test_summarize_reading_list_uploads_in_memory_buffers_without_a_papers_dir(tmp_path, monkeypatch):
     monkeypatch.chdir(tmp_path)
-    papers_dir = Path("papers")
-    papers_dir.mkdir()
-    file_path = papers_dir / "temp.pdf"
-    file_path.write_bytes(b"binary")
+    pdfs = PdfStore()
+    for arxiv_id in ("0002.00002v1", "0001.00001v1"):
+        buffer = PdfBuffer(arxiv_id)
+        buffer.write(f"%PDF {arxiv_id}".encode())
+        pdfs.add(buffer)
 
-    arxiv_pipeline.remove_downloaded_papers()
+    uploads = []
+    client = StubClient(responses=["{}", "{}"], upload_captures=uploads)
+    summaries = arxiv_pipeline.summarize_reading_list([], client, max_workers=1, pdfs=pdfs)
+
+    assert [arxiv_id for arxiv_id, _ in summaries] == ["0001.00001v1", "0002.00002v1"]
+    assert uploads == [b"%PDF 0001.00001v1", b"%PDF 0002.00002v1"]
+    assert not Path("papers").exists()
 
-    assert papers_dir.exists()
-    assert not file_path.exists()
+
+def test_summarize_reading_list_text_mode_sends_sections_and_falls_back_to_upload():
+    pdfs = _pdf_store(a=build_pdf(paper_lines()), b=b"scanned image only")
+
+    uploads = []
+    sent = []
+
+    class RecordingModels:
+        def generate_content(self, *args, contents, **kwargs):
+            sent.append(contents[-1])
+            return SimpleNamespace(text="{}")
+
+    client = SimpleNamespace(models=RecordingModels(), files=StubFiles(uploads))
+
+    summaries = arxiv_pipeline.summarize_reading_list([], client, text_tokens=2_000, pdfs=pdfs)
+
+    assert [arxiv_id for arxiv_id, _ in summaries] == ["a", "b"]
+    assert uploads == [b"scanned image only"]
+    [text] = [content for content in sent if content != "uploaded::b"]
+    assert "method lorem" in text and "citation" not in text
+    assert len(sent) == 2
+
+
+def test_summarize_reading_list_deduplicates_uploads_in_stable_order(tmp_path):
+    pdfs = _pdf_store(a=b"same content", b=b"same content", c=b"other content")
+
+    uploads = []
+
+    class EchoModels:
+        def generate_content(self, *args, contents, **kwargs):
+            return SimpleNamespace(text=f"summary of {contents[-1]}")
+
+    client = SimpleNamespace(models=EchoModels(), files=StubFiles(uploads))
+    cache = arxiv_pipeline.open_upload_cache(tmp_path / "uploads.json")
+
+    summaries = arxiv_pipeline.summarize_reading_list([], client, max_workers=3, uploads=cache, pdfs=pdfs)
+
+    assert len(uploads) == 2
+    assert [arxiv_id for arxiv_id, _ in summaries] == ["a", "b", "c"]
+    assert summaries[0][1] == summaries[1][1]
+    assert summaries[2][1] == "summary of uploaded::c"
+
+
+def test_stream_reading_list_moves_papers_through_every_stage(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(arxiv_pipeline, "PREFILTER_MIN_SCORE", None)
+    papers = [
+        DummyPaper("Paper Keep", "http://arxiv.org/abs/0001.00001v1"),
+        DummyPaper("Paper Drop", "http://arxiv.org/abs/0002.00002v1"),
+    ]
+    for paper in papers:
+        paper.pdf_url = paper.entry_id.replace("abs", "pdf")
+    monkeypatch.setattr(arxiv_pipeline, "_fetch_yesterdays_papers", lambda: papers)
+
+    class FakeDownloader:
+        def __init__(self, directory, max_workers):
+            assert directory is None
+
+        def download(self, arxiv_id, url):
+            buffer = PdfBuffer(arxiv_id)
+            buffer.write(b"%PDF " + url.encode())
+            return SimpleNamespace(arxiv_id=arxiv_id, path=None, buffer=buffer, error=None)
+
+    monkeypatch.setattr(arxiv_pipeline, "PdfDownloader", FakeDownloader)
+
+    class RoutingModels:
+        def generate_content(self, *args, contents, **kwargs):
+            if isinstance(contents[-1], str) and contents[-1].startswith("uploaded::"):
+                return SimpleNamespace(text=json.dumps({"Title": "Paper Keep"}))
+            keep = contents[0].startswith("Paper Keep")
+            return SimpleNamespace(
+                text=json.dumps(
+                    {
+                        "title": "Paper Keep" if keep else "Paper Drop",
+                        "id": "http://arxiv.org/abs/0001.00001v1",
+                        "should_read": keep,
+                        "relevance_score": 8,
+                        "one_sentence_summary": "",
+                        "reasoning": "",
+                        "keywords": [],
+                    }
+                )
+            )
+
+    uploads = []
+    client = SimpleNamespace(models=RoutingModels(), files=StubFiles(uploads))
+    published = []
+
+    parsed = arxiv_pipeline.stream_reading_list(client, published.append)
+
+    assert uploads == [b"%PDF http://arxiv.org/pdf/0001.00001v1"]
+    assert not Path("papers").exists()
+    assert [_kv_list_to_dict(entry)["arxiv_id"] for entry in parsed] == ["http://arxiv.org/abs/0001.00001v1"]
+    assert published == [[parsed[0]]]
+
+
+def test_stream_reading_list_defers_papers_from_a_failed_judge_batch(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(arxiv_pipeline, "PREFILTER_MIN_SCORE", None)
+    papers = [DummyPaper(f"Paper {index}", f"http://arxiv.org/abs/0001.0000{index}v1") for index in range(3)]
+    monkeypatch.setattr(arxiv_pipeline, "_fetch_yesterdays_papers", lambda: papers)
+
+    class FailingModels:
+        def generate_content(self, *args, **kwargs):
+            raise RuntimeError("retries exhausted")
+
+    deferred = arxiv_pipeline.open_deferral_queue(tmp_path / "deferred.json")
+
+    parsed = arxiv_pipeline.stream_reading_list(SimpleNamespace(models=FailingModels()), print, deferred=deferred)
+
+    assert parsed == []
+    assert deferred.paper_ids == [arxiv_pipeline._download_id(paper) for paper in papers]
+    assert "Deferring 3 papers that failed a streaming stage" in capsys.readouterr().out
 
 
 def test_parse_summary_matches_titles(tmp_path, monkeypatch):
@@ -168,15 +478,37 @@ def test_parse_summary_matches_titles(tmp_path, monkeypatch):
     assert first_entry["arxiv_id"] == "http://arxiv.org/abs/0001.00001v1"
     assert second_entry["arxiv_id"] == "http://arxiv.org/abs/0002.00002v1"
 
-    log_path = Path("log.json")
+    log_path = Path("log.jsonl")
     assert log_path.exists()
-    contents = json.loads(log_path.read_text())
+    contents = [json.loads(line) for line in log_path.read_text().splitlines()]
     assert [item["arxiv_id"] for item in contents] == [
         "http://arxiv.org/abs/0001.00001v1",
         "http://arxiv.org/abs/0002.00002v1",
     ]
 
 
+def test_parse_summary_matches_carried_ids_before_titles(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    summary_payload = [
+        ("0002.00002v1", json.dumps({"Title": "A Title The Model Rewrote"})),
+        ("0003.00003v2", json.dumps({"Title": "Paper One"})),
+        (None, json.dumps({"Title": "Paper Onee"})),
+    ]
+    reading_list = [
+        {"title": "Paper One", "id": "http://arxiv.org/abs/0001.00001v1"},
+        {"title": "Paper Two", "id": "http://arxiv.org/abs/0002.00002v1"},
+    ]
+
+    parsed = arxiv_pipeline.parse_summary(summary_payload, reading_list)
+
+    assert [_kv_list_to_dict(entry)["arxiv_id"] for entry in parsed] == [
+        "http://arxiv.org/abs/0002.00002v1",
+        "0003.00003v2",
+        "http://arxiv.org/abs/0001.00001v1",
+    ]
+
+
 def test_parse_summary_handles_unmatched_titles(tmp_path, monkeypatch):
     monkeypatch.chdir(tmp_path)
 
@@ -194,10 +526,171 @@ def test_parse_summary_handles_unmatched_titles(tmp_path, monkeypatch):
     entry = _kv_list_to_dict(parsed[0])
     assert "arxiv_id" not in entry
 
-    log_contents = json.loads(Path("log.json").read_text())
+    log_contents = [json.loads(line) for line in Path("log.jsonl").read_text().splitlines()]
     assert "arxiv_id" not in log_contents[0]
 
 
+def test_parse_summary_appends_after_migrating_legacy_log(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    Path("log.json").write_text(json.dumps([{"Title": "Old"}], indent=4))
+
+    arxiv_pipeline.parse_summary([json.dumps({"Title": "New"})], [])
+    arxiv_pipeline.parse_summary([json.dumps({"Title": "Newer"})], [])
+
+    lines = Path("log.jsonl").read_text().splitlines()
+    assert [json.loads(line)["Title"] for line in lines] == ["Old", "New", "Newer"]
+
+
+def test_search_skips_papers_already_in_history(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(arxiv_pipeline, "PREFILTER_MIN_SCORE", None)
+    history = arxiv_pipeline.open_history_store(tmp_path / "history.db")
+    arxiv_pipeline.parse_summary(
+        [json.dumps({"Title": "Seen"})],
+        [{"title": "Seen", "id": "http://arxiv.org/abs/0001.00001v1"}],
+        history=history,
+    )
+
+    papers = [
+        DummyPaper("Seen", "http://arxiv.org/abs/0001.00001v2"),
+        DummyPaper("New", "http://arxiv.org/abs/0002.00002v1"),
+    ]
+    monkeypatch.setattr(arxiv_pipeline, "_fetch_yesterdays_papers", lambda: papers)
+
+    assert arxiv_pipeline._candidate_papers(history) == [papers[1]]
+    assert "Skipping 1 papers that were already summarized." in capsys.readouterr().out
+
+
+def test_prefilter_drops_papers_unrelated_to_interests(monkeypatch, capsys):
+    monkeypatch.setattr(arxiv_pipeline, "PREFILTER_TOP_K", 2)
+    papers = [DummyPaper(title, f"id-{index}") for index, title in enumerate(
+        [
+            "Continual learning for self-evolving agents",
+            "Thermal conductivity of graphene",
+            "Diffusion models for time-series generation",
+            "Meta-learning for few-shot video understanding",
+        ]
+    )]
+
+    kept = arxiv_pipeline._prefilter_papers(papers)
+
+    assert papers[1] not in kept
+    assert len(kept) == 2
+    assert "Pre-filter kept 2 of 4 papers" in capsys.readouterr().out
+
+
+def test_budget_judges_highest_prefilter_scores_and_defers_the_rest(monkeypatch, capsys):
+    monkeypatch.setattr(arxiv_pipeline, "PREFILTER_MIN_SCORE", None)
+    papers = [DummyPaper(title, f"http://arxiv.org/abs/000{index}.0000{index}v1") for index, title in enumerate(
+        [
+            "Thermal conductivity of graphene",
+            "Continual learning for self-evolving agents",
+            "Soil moisture sensing",
+        ]
+    )]
+    ranked = arxiv_pipeline._prefilter_papers(papers, ranked=True)
+    assert ranked[0] is papers[1]
+
+    judged = []
+
+    class KeyedModels:
+        def generate_content(self, *args, contents, **kwargs):
+            title = contents[0].split(",\n", 1)[0]
+            judged.append(title)
+            return SimpleNamespace(text=json.dumps({"title": title, "id": title, "should_read": False}))
+
+    ledger = arxiv_pipeline.TokenLedger(max_tokens=2_000)
+    monkeypatch.setattr(arxiv_pipeline, "BUDGET_SUMMARY_RESERVE", 0.0)
+    monkeypatch.setattr(arxiv_pipeline, "_estimate_tokens", lambda text: 400)
+
+    arxiv_pipeline.judge_papers(ranked, SimpleNamespace(models=KeyedModels()), batch_size=1, ledger=ledger)
+
+    assert sorted(judged) == sorted(paper.title for paper in ranked[:2])
+    assert ledger.deferred == [arxiv_pipeline._download_id(ranked[2])]
+    assert "Budget: judging 2 of 3 papers" in capsys.readouterr().out
+
+
+def test_search_defers_selected_papers_when_no_summary_fits(tmp_path, monkeypatch, capsys):
+    papers = [DummyPaper(f"Paper {index}", f"http://arxiv.org/abs/0001.0000{index}v1") for index in range(3)]
+    for paper in papers:
+        paper.pdf_url = paper.entry_id.replace("abs", "pdf")
+    reading_list = [{"title": paper.title, "id": paper.entry_id, "should_read": True} for paper in papers]
+    monkeypatch.setattr(arxiv_pipeline, "_candidate_papers", lambda *args: papers)
+    monkeypatch.setattr(arxiv_pipeline, "judge_papers", lambda *args, **kwargs: reading_list)
+    ledger = arxiv_pipeline.TokenLedger(max_tokens=1_000)
+    pending = []
+
+    result = arxiv_pipeline.search_papers(None, ledger=ledger, pdfs=PdfStore(), pending=pending)
+
+    assert result == [] and pending == []
+    assert ledger.deferred == [arxiv_pipeline._download_id(paper) for paper in papers]
+    assert "Budget: summarizing 0 of 3 papers" in capsys.readouterr().out
+
+
+def test_deferred_papers_are_judged_first_and_skip_the_prefilter(tmp_path, monkeypatch):
+    monkeypatch.setattr(arxiv_pipeline, "PREFILTER_TOP_K", 1)
+    monkeypatch.setattr(arxiv_pipeline, "PREFILTER_MIN_SCORE", None)
+    papers = [
+        DummyPaper("Continual learning for self-evolving agents", "http://arxiv.org/abs/0001.00001v1"),
+        DummyPaper("Thermal conductivity of graphene", "http://arxiv.org/abs/0002.00002v1"),
+        DummyPaper("Diffusion models for time-series generation", "http://arxiv.org/abs/0003.00003v1"),
+    ]
+    monkeypatch.setattr(arxiv_pipeline, "_fetch_yesterdays_papers", lambda: papers)
+    deferred = arxiv_pipeline.open_deferral_queue(tmp_path / "deferred.json")
+    deferred.extend(["0002.00002v1"])
+    ledger = arxiv_pipeline.TokenLedger(max_tokens=10_000)
+
+    candidates = arxiv_pipeline._candidate_papers(None, deferred=deferred, ledger=ledger)
+
+    assert candidates[0] is papers[1]
+    assert len(candidates) == 2
+
+
+def test_near_duplicates_of_remembered_papers_are_skipped(tmp_path, capsys):
+    duplicates = arxiv_pipeline.open_duplicate_index(tmp_path / "log.minhash.jsonl")
+    original = DummyPaper("Unified Reasoning for Video Agents", "http://arxiv.org/abs/0001.00001v1")
+    original.summary = "We unify temporal reasoning and tool use for video agents across twelve benchmarks."
+    arxiv_pipeline.remember_papers([original], duplicates)
+
+    cross_listed = DummyPaper("Unified Reasoning for Video Agents", "http://arxiv.org/abs/0009.00009v1")
+    cross_listed.summary = original.summary
+    unrelated = DummyPaper("Graphene", "http://arxiv.org/abs/0002.00002v1")
+
+    assert arxiv_pipeline._skip_near_duplicates([cross_listed, unrelated], duplicates) == [unrelated]
+    assert "matches Unified Reasoning for Video Agents (0001.00001v1" in capsys.readouterr().out
+
+
+def test_duplicate_index_is_seeded_from_the_log_by_title(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    entries = [
+        {"Title": "Unified Reasoning for Video Agents", "arxiv_id": "http://arxiv.org/abs/0001.00001v1"},
+        {"Title": "Graphene Phonons"},
+    ]
+    Path("log.jsonl").write_text("".join(json.dumps(entry) + "\n" for entry in entries))
+
+    duplicates = arxiv_pipeline.open_duplicate_index()
+    retitled = DummyPaper("Unified reasoning for video agents", "http://arxiv.org/abs/0009.00009v1")
+    unrelated = DummyPaper("Sparse Attention", "http://arxiv.org/abs/0002.00002v1")
+
+    assert len(duplicates) == 2
+    assert "Imported 2 titles from log.jsonl" in capsys.readouterr().out
+    assert arxiv_pipeline._skip_near_duplicates([retitled, unrelated], duplicates) == [unrelated]
+    assert len(arxiv_pipeline.open_duplicate_index()) == 2
+    assert "Imported" not in capsys.readouterr().out
+
+
+def test_judge_papers_remembers_rejected_papers(tmp_path):
+    duplicates = arxiv_pipeline.open_duplicate_index(tmp_path / "log.minhash.jsonl")
+    verdict = {"title": "Paper", "id": "0001.00001v1", "should_read": False, "relevance_score": 2}
+    client = StubClient(responses=[json.dumps(verdict)])
+    paper = DummyPaper("Paper", "http://arxiv.org/abs/0001.00001v1")
+
+    assert arxiv_pipeline.judge_papers([paper], client, max_workers=1, batch_size=1, duplicates=duplicates) is None
+
+    cross_listed = DummyPaper("Paper", "http://arxiv.org/abs/0009.00009v1")
+    assert arxiv_pipeline._skip_near_duplicates([paper, cross_listed], duplicates) == [paper]
+
+
 def test_parse_summary_skips_invalid_json(tmp_path, monkeypatch, capsys):
     monkeypatch.chdir(tmp_path)
 
@@ -206,4 +699,4 @@ def test_parse_summary_skips_invalid_json(tmp_path, monkeypatch, capsys):
 
     assert parsed == []
     assert "Error parsing summary" in captured.out
-    assert not Path("log.json").exists()
+    assert not Path("log.jsonl").exists()
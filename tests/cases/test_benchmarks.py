@@ -0,0 +1,52 @@
+import pytest
+
+from benchmarks.fakes import FakeService, Recorder
+from benchmarks.run import format_results, run_benchmark
+
+
+def test_batch_benchmark_runs_end_to_end_offline(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    result = run_benchmark("batch", 20, latency_scale=0, accept_ratio=0.5)
+
+    assert result.failure is None
+    assert result.calls["arxiv"] == 1
+    assert result.calls["summarize"] == result.calls["download"] > 0
+    assert result.tweets == result.calls["post"]
+    assert set(result.latency_ms["judge"]) == {"p50", "p95", "p99"}
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_benchmark_reports_failures_instead_of_raising():
+    result = run_benchmark("judge", 10, latency_scale=0, error_rate=1.0)
+
+    assert result.failure.startswith("ServerError")
+    assert "judge" in format_results([result])
+
+
+def test_streaming_judges_in_batches_like_batch_mode():
+    batch = run_benchmark("batch", 60, latency_scale=0, accept_ratio=0.1)
+    streaming = run_benchmark("streaming", 60, latency_scale=0, accept_ratio=0.1)
+
+    assert streaming.failure is None
+    assert streaming.calls["judge"] <= batch.calls["judge"]
+    assert streaming.tweets == batch.tweets
+
+
+def test_budgeted_runs_download_only_what_they_summarize(monkeypatch):
+    monkeypatch.setenv("TOKEN_BUDGET", "60000")
+
+    batch = run_benchmark("batch", 100, latency_scale=0)
+    streaming = run_benchmark("streaming", 100, latency_scale=0)
+
+    assert batch.calls["download"] == batch.calls["summarize"] > 1
+    assert streaming.calls["download"] == streaming.calls["summarize"] == batch.calls["summarize"]
+
+
+def test_fake_services_must_define_their_error_types():
+    class Incomplete(FakeService):
+        def _throttled(self, retry_after):
+            return RuntimeError("429")
+
+    with pytest.raises(TypeError):
+        Incomplete(Recorder())
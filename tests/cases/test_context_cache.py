@@ -0,0 +1,122 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from google.genai import errors, types
+
+import context_cache
+from context_cache import ContextCache
+
+
+INSTRUCTION = "Judge papers. " * 400
+
+
+class FakeCaches:
+    def __init__(self, fail=False, min_chars=1000):
+        self.created = []
+        self.deleted = []
+        self.attempts = 0
+        self.fail = fail
+        self.min_chars = min_chars
+
+    def create(self, *, model, config):
+        self.attempts += 1
+        if self.fail or len(config.system_instruction) < self.min_chars:
+            raise errors.ClientError(400, {"error": {"code": 400, "message": "too few tokens"}})
+        name = f"cachedContents/{len(self.created) + 1}"
+        self.created.append((model, config.system_instruction, config.ttl))
+        return SimpleNamespace(name=name, expire_time=datetime.now(timezone.utc) + timedelta(hours=1))
+
+    def delete(self, *, name):
+        self.deleted.append(name)
+
+
+class RecordingModels:
+    def __init__(self, reject=(), status=404):
+        self.configs = []
+        self.reject = set(reject)
+        self.status = status
+
+    def generate_content(self, *, model, contents, config=None):
+        self.configs.append(config)
+        if config.cached_content in self.reject:
+            raise errors.ClientError(self.status, {"error": {"code": self.status, "message": "rejected"}})
+        return SimpleNamespace(text="{}")
+
+
+def _client(caches=None, models=None):
+    return SimpleNamespace(caches=caches or FakeCaches(), models=models or RecordingModels())
+
+
+def _call(cache, model="judge", instruction=INSTRUCTION):
+    config = types.GenerateContentConfig(system_instruction=instruction)
+    return cache.models.generate_content(model=model, contents=["paper"], config=config)
+
+
+def test_instruction_is_cached_once_and_referenced_on_every_call():
+    client = _client()
+    cache = ContextCache(client, models={"judge"}, ttl=600)
+
+    for _ in range(3):
+        _call(cache)
+    _call(cache, model="summary")
+
+    assert client.caches.created == [("judge", INSTRUCTION, "600s")]
+    assert [config.cached_content for config in client.models.configs[:3]] == ["cachedContents/1"] * 3
+    assert all(config.system_instruction is None for config in client.models.configs[:3])
+    assert client.models.configs[3].system_instruction == INSTRUCTION
+
+    cache.close()
+    assert client.caches.deleted == ["cachedContents/1"]
+
+
+def test_handle_is_refreshed_near_expiry_and_when_the_prompt_changes():
+    now = [datetime.now(timezone.utc).timestamp()]
+    client = _client()
+    cache = ContextCache(client, models={"judge"}, margin=300, clock=lambda: now[0])
+
+    _call(cache)
+    _call(cache, instruction=INSTRUCTION + "Be strict.")
+    now[0] += 3600 - 200
+    _call(cache)
+
+    assert len(client.caches.created) == 3
+    assert client.caches.created[1][1].endswith("Be strict.")
+    assert client.caches.deleted == ["cachedContents/1"]
+    assert client.models.configs[-1].cached_content == "cachedContents/3"
+
+
+def test_falls_back_to_inline_instruction():
+    short = _client()
+    cache = ContextCache(short, models={"judge"})
+    _call(cache, instruction="Short instruction.")
+    _call(cache, instruction="Short instruction.")
+    assert short.caches.attempts == 0
+    assert [config.system_instruction for config in short.models.configs] == ["Short instruction."] * 2
+
+    failing = _client(caches=FakeCaches(fail=True))
+    cache = ContextCache(failing, models={"judge"})
+    _call(cache)
+    _call(cache)
+    assert [config.system_instruction for config in failing.models.configs] == [INSTRUCTION] * 2
+
+    rejected = _client(models=RecordingModels(reject={"cachedContents/1"}))
+    _call(ContextCache(rejected, models={"judge"}))
+    assert [config.cached_content for config in rejected.models.configs] == ["cachedContents/1", None]
+    assert rejected.models.configs[1].system_instruction == INSTRUCTION
+    assert rejected.caches.deleted == ["cachedContents/1"]
+
+
+def test_bad_requests_on_the_cached_path_are_not_retried_inline():
+    client = _client(models=RecordingModels(reject={"cachedContents/1"}, status=400))
+    cache = ContextCache(client, models={"judge"})
+
+    with pytest.raises(errors.ClientError):
+        _call(cache)
+
+    assert len(client.models.configs) == 1
+
+
+def test_cacheable_requires_the_api_minimum():
+    assert context_cache.cacheable(INSTRUCTION)
+    assert not context_cache.cacheable("x" * 4 * (context_cache.MIN_CACHED_TOKENS - 1))
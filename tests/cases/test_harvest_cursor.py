@@ -0,0 +1,30 @@
+from datetime import datetime, timedelta, timezone
+
+from harvest_cursor import HarvestCursor
+
+
+T0 = datetime(2026, 10, 16, 18, 30, 15, tzinfo=timezone.utc)
+
+
+def test_first_window_uses_lookback(tmp_path):
+    cursor = HarvestCursor(tmp_path / "cursor.json", lookback=timedelta(days=1))
+
+    assert cursor.window(now=T0) == (T0 - timedelta(days=1), T0)
+    assert cursor.is_new("2410.00001v1", T0 - timedelta(days=30))
+
+
+def test_cursor_round_trip_skips_seen_boundary_papers(tmp_path):
+    path = tmp_path / "cursor.json"
+    cursor = HarvestCursor(path)
+    cursor.advance([("a", T0 - timedelta(hours=1)), ("b", T0), ("c", T0 - timedelta(seconds=10))])
+    cursor.save()
+
+    reloaded = HarvestCursor(path)
+    start, _ = reloaded.window(now=T0 + timedelta(days=1))
+
+    assert start == T0.replace(second=0)
+    assert reloaded.boundary_ids == {"b", "c"}
+    assert not reloaded.is_new("b", T0)
+    assert not reloaded.is_new("a", T0 - timedelta(hours=1))
+    assert reloaded.is_new("d", T0 - timedelta(seconds=5))
+    assert reloaded.is_new("e", T0 + timedelta(minutes=3))
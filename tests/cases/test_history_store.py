@@ -0,0 +1,52 @@
+import json
+from types import SimpleNamespace
+
+from history_store import HistoryStore, main
+
+
+def _paper(arxiv_id, category, title="Paper"):
+    return SimpleNamespace(entry_id=f"http://arxiv.org/abs/{arxiv_id}", primary_category=category, title=title)
+
+
+def test_summaries_are_indexed_by_unversioned_id(tmp_path):
+    store = HistoryStore(tmp_path / "history.db")
+    store.record_summaries([{"Title": "A", "arxiv_id": "http://arxiv.org/abs/2401.00001v2"}], run_date="2026-10-01")
+
+    assert store.has_summary("2401.00001v3")
+    assert not store.has_summary("2401.00002v1")
+    assert store.summaries_for("http://arxiv.org/abs/2401.00001")[0]["Title"] == "A"
+
+
+def test_top_papers_filters_by_field_and_date(tmp_path):
+    store = HistoryStore(tmp_path / "history.db")
+    store.record_judgments(
+        [
+            (_paper("2401.00001v1", "cs.CV"), {"relevance_score": 6, "should_read": True}),
+            (_paper("2401.00002v1", "cs.CV"), {"relevance_score": 9, "should_read": True}),
+            (_paper("2401.00003v1", "cs.LG"), {"relevance_score": 10, "should_read": True}),
+        ],
+        run_date="2026-10-05",
+    )
+    store.record_judgments([(_paper("2309.00004v1", "cs.CV"), {"relevance_score": 10})], run_date="2026-09-01")
+
+    top = store.top_papers(field="cs.CV", since="2026-10-01")
+
+    assert [(row["arxiv_id"], row["relevance_score"]) for row in top] == [("2401.00002", 9), ("2401.00001", 6)]
+
+
+def test_import_cli_is_idempotent(tmp_path, capsys):
+    log_path = tmp_path / "log.jsonl"
+    log_path.write_text(
+        "\n".join(json.dumps({"Title": title, "arxiv_id": f"2401.0000{n}v1"}) for n, title in enumerate("AB")),
+        encoding="utf-8",
+    )
+    db = str(tmp_path / "history.db")
+
+    main(["--db", db, "import", str(log_path)])
+    main(["--db", db, "import", str(log_path)])
+    main(["--db", db, "seen", "2401.00001"])
+
+    out = capsys.readouterr().out
+    assert "Imported 2 summaries." in out
+    assert "Imported 0 summaries." in out
+    assert '"Title": "B"' in out
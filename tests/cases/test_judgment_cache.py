@@ -0,0 +1,33 @@
+import time
+
+from judgment_cache import JudgmentCache, profile_hash
+
+
+def test_profile_change_invalidates_entries(tmp_path):
+    path = tmp_path / "cache.json"
+    cache = JudgmentCache(path, profile=profile_hash("model", "interests"))
+    cache.put("0001.00001v1", {"should_read": True})
+    cache.save()
+
+    assert JudgmentCache(path, profile=profile_hash("model", "interests")).get("0001.00001v1") == {
+        "should_read": True
+    }
+    assert JudgmentCache(path, profile=profile_hash("model", "new interests")).get("0001.00001v1") is None
+
+
+def test_save_evicts_oldest_and_expired_entries(tmp_path, monkeypatch):
+    path = tmp_path / "cache.json"
+    cache = JudgmentCache(path, profile="p", max_entries=2, max_age_days=1)
+
+    now = time.time()
+    for offset, paper_id in enumerate(["a", "b", "c"]):
+        monkeypatch.setattr(time, "time", lambda offset=offset: now + offset)
+        cache.put(paper_id, {"id": paper_id})
+    cache.save()
+
+    reloaded = JudgmentCache(path, profile="p", max_entries=2, max_age_days=1)
+    assert reloaded.get("a") is None
+    assert reloaded.get("c") == {"id": "c"}
+
+    monkeypatch.setattr(time, "time", lambda: now + 2 * 86400)
+    assert reloaded.get("c") is None
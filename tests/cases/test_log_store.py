@@ -0,0 +1,32 @@
+import json
+
+from log_store import JsonlLogStore, main
+
+
+def test_append_recovers_from_torn_last_line(tmp_path):
+    path = tmp_path / "log.jsonl"
+    path.write_text('{"Title": "A"}\n{"Title": "B"', encoding="utf-8")
+
+    store = JsonlLogStore(path)
+    store.append([{"Title": "C"}])
+
+    assert [entry["Title"] for entry in store.entries()] == ["A", "C"]
+
+
+def test_compact_command_drops_duplicates_and_corrupt_lines(tmp_path):
+    path = tmp_path / "log.jsonl"
+    path.write_text('{"Title": "A"}\nnot json\n{"Title": "A"}\n\n{"Title": "B"}\n', encoding="utf-8")
+
+    main(["compact", "--path", str(path), "--legacy", str(tmp_path / "missing.json")])
+
+    assert [json.loads(line) for line in path.read_text().splitlines()] == [{"Title": "A"}, {"Title": "B"}]
+
+
+def test_migrate_converts_legacy_array_once(tmp_path):
+    legacy = tmp_path / "log.json"
+    legacy.write_text(json.dumps([{"Title": "A"}, {"Title": "B"}], indent=4), encoding="utf-8")
+    store = JsonlLogStore(tmp_path / "log.jsonl", legacy_path=legacy)
+
+    assert store.migrate() == 2
+    assert store.migrate() == 0
+    assert store.entries() == [{"Title": "A"}, {"Title": "B"}]
@@ -0,0 +1,48 @@
+import json
+
+from near_duplicates import NearDuplicateIndex
+
+
+ABSTRACT = (
+    "We introduce a self-evolving agent framework that continually adapts its memory and tool use "
+    "across tasks. The agent maintains an episodic buffer, distils reusable skills and revises its "
+    "prompting strategy online. Experiments on three interactive benchmarks show consistent gains "
+    "over static baselines while reducing catastrophic forgetting."
+)
+
+
+def test_resubmission_with_minor_edits_is_detected(tmp_path):
+    index = NearDuplicateIndex(tmp_path / "log.minhash.jsonl")
+    index.add("2401.00001v1", "Self-Evolving Agents", f"Self-Evolving Agents\n{ABSTRACT}")
+
+    revised = ABSTRACT.replace("three interactive", "four interactive")
+    match = index.find(f"Self-Evolving Agents Revisited\n{revised}")
+
+    assert match is not None
+    assert match[:2] == ("2401.00001v1", "Self-Evolving Agents")
+    assert match[2] >= 0.8
+    assert index.find("Graphene thermal transport\nWe measure phonon scattering in suspended graphene.") is None
+
+
+def test_signatures_persist_and_reload(tmp_path):
+    path = tmp_path / "log.minhash.jsonl"
+    index = NearDuplicateIndex(path)
+    assert index.add("2401.00001v1", "Agents", ABSTRACT)
+    assert not index.add("2401.00001v1", "Agents", ABSTRACT)
+
+    reloaded = NearDuplicateIndex(path)
+
+    assert len(reloaded) == 1
+    assert reloaded.find(ABSTRACT)[0] == "2401.00001v1"
+
+
+def test_log_titles_are_imported_once(tmp_path):
+    log_path = tmp_path / "log.jsonl"
+    log_path.write_text(json.dumps({"Title": "Self-Evolving Agents", "arxiv_id": "2401.00001v2"}) + "\n")
+    path = tmp_path / "log.minhash.jsonl"
+
+    assert NearDuplicateIndex(path).import_log(log_path) == 1
+    reloaded = NearDuplicateIndex(path)
+
+    assert reloaded.import_log(log_path) == 0
+    assert reloaded.find(ABSTRACT, "Self-evolving agents")[:2] == ("2401.00001v2", "Self-Evolving Agents")
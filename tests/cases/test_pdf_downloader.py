@@ -0,0 +1,123 @@
+import hashlib
+
+from pdf_downloader import PdfDownloader, safe_filename
+
+
+PDF_BYTES = b"%PDF-1.7 test document body"
+
+
+class FakeResponse:
+    def __init__(self, status_code, body, headers=None):
+        self.status_code = status_code
+        self._body = body
+        self.headers = headers or {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise OSError(f"HTTP {self.status_code}")
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self._body), 4):
+            yield self._body[start:start + 4]
+
+
+class FakeSession:
+    def __init__(self, responder):
+        self.responder = responder
+        self.requests = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.requests.append((url, dict(headers or {})))
+        return self.responder(headers or {})
+
+
+def _downloader(tmp_path, session):
+    return PdfDownloader(tmp_path, host_interval=0, attempts=1, session=session)
+
+
+def test_download_writes_atomically_with_checksum(tmp_path):
+    session = FakeSession(lambda headers: FakeResponse(200, PDF_BYTES, {"Content-Length": str(len(PDF_BYTES))}))
+
+    [result] = _downloader(tmp_path, session).download_all([("2401.00001v2", "https://arxiv.org/pdf/2401.00001v2")])
+
+    assert result.error is None
+    assert result.path == tmp_path / "2401.00001v2.pdf"
+    assert result.path.read_bytes() == PDF_BYTES
+    assert result.sha256 == hashlib.sha256(PDF_BYTES).hexdigest()
+    assert not (tmp_path / "2401.00001v2.pdf.part").exists()
+
+
+def test_download_resumes_partial_file(tmp_path):
+    (tmp_path / "2401.00001v1.pdf.part").write_bytes(PDF_BYTES[:10])
+
+    def responder(headers):
+        assert headers["Range"] == "bytes=10-"
+        return FakeResponse(206, PDF_BYTES[10:], {"Content-Range": f"bytes 10-{len(PDF_BYTES) - 1}/{len(PDF_BYTES)}"})
+
+    result = _downloader(tmp_path, FakeSession(responder)).download("2401.00001v1", "https://arxiv.org/pdf/x")
+
+    assert result.error is None
+    assert result.path.read_bytes() == PDF_BYTES
+
+
+def test_download_rejects_truncated_and_mismatched_files(tmp_path):
+    truncated = FakeSession(lambda headers: FakeResponse(200, PDF_BYTES[:8], {"Content-Length": "999"}))
+    result = _downloader(tmp_path, truncated).download("a", "https://arxiv.org/pdf/a")
+    assert "size mismatch" in result.error
+    assert not (tmp_path / "a.pdf").exists()
+
+    complete = FakeSession(lambda headers: FakeResponse(200, PDF_BYTES))
+    result = _downloader(tmp_path, complete).download("b", "https://arxiv.org/pdf/b", expected_sha256="0" * 64)
+    assert "checksum mismatch" in result.error
+    assert not (tmp_path / "b.pdf").exists()
+
+
+def test_safe_filename_uses_arxiv_id():
+    assert safe_filename("2401.00001v1") == "2401.00001v1.pdf"
+    assert safe_filename("hep-th/9901001v1") == "hep-th_9901001v1.pdf"
+
+
+def test_download_creates_missing_directory(tmp_path):
+    session = FakeSession(lambda headers: FakeResponse(200, PDF_BYTES))
+    downloader = PdfDownloader(tmp_path / "papers", host_interval=0, attempts=1, session=session)
+
+    result = downloader.download("2501.00001v1", "https://arxiv.org/pdf/2501.00001v1")
+
+    assert result.error is None
+    assert result.path == tmp_path / "papers" / "2501.00001v1.pdf"
+
+
+def test_download_to_memory_resumes_and_spills_large_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    calls = []
+
+    def responder(headers):
+        calls.append(headers.get("Range"))
+        if len(calls) == 1:
+            return FakeResponse(200, PDF_BYTES[:12], {"Content-Length": str(len(PDF_BYTES))})
+        return FakeResponse(206, PDF_BYTES[12:], {"Content-Range": f"bytes 12-{len(PDF_BYTES) - 1}/{len(PDF_BYTES)}"})
+
+    downloader = PdfDownloader(None, host_interval=0, attempts=2, session=FakeSession(responder), spill_threshold=16)
+    result = downloader.download("2401.00001v1", "https://arxiv.org/pdf/2401.00001v1")
+
+    assert result.error is None and result.path is None
+    assert calls == [None, "bytes=12-"]
+    assert result.buffer.spilled
+    assert result.buffer.getvalue() == PDF_BYTES
+    assert result.sha256 == hashlib.sha256(PDF_BYTES).hexdigest()
+    assert result.buffer.open().read() == PDF_BYTES
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_download_to_memory_rejects_non_pdf_payloads():
+    session = FakeSession(lambda headers: FakeResponse(200, b"<html>rate limited</html>"))
+    result = PdfDownloader(None, host_interval=0, attempts=1, session=session).download("a", "https://arxiv.org/pdf/a")
+
+    assert result.error == "downloaded file is not a PDF"
+    assert result.buffer is None
@@ -0,0 +1,86 @@
+import pdf_text
+
+
+def build_pdf(lines):
+    stream = "BT /F1 9 Tf 11 TL 40 800 Td " + " ".join(
+        f"({line.replace('(', '[').replace(')', ']')}) Tj T*" for line in lines
+    ) + " ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 1200] /Contents 4 0 R "
+        "/Resources << /Font << /F1 5 0 R >> >> >>",
+        f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    body = "%PDF-1.4\n"
+    offsets = []
+    for number, content in enumerate(objects, start=1):
+        offsets.append(len(body))
+        body += f"{number} 0 obj\n{content}\nendobj\n"
+    xref = len(body)
+    body += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    body += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    body += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    return body.encode("latin-1")
+
+
+def paper_lines():
+    filler = "lorem ipsum dolor sit amet " * 3
+    return [
+        "A Study of Things",
+        "Abstract",
+        *[f"abstract {filler}"] * 4,
+        "1 Introduction",
+        *[f"intro {filler}"] * 15,
+        "2 Related Work",
+        *[f"related {filler}"] * 15,
+        "3 Method",
+        *[f"method {filler}"] * 15,
+        "3.1 Training Details",
+        *[f"training {filler}"] * 5,
+        "4 Results",
+        *[f"results {filler}"] * 15,
+        "5 Conclusion",
+        *[f"conclusion {filler}"] * 3,
+        "References",
+        *[f"[1] citation {filler}"] * 10,
+    ]
+
+
+def test_select_sections_keeps_core_sections_and_drops_the_rest():
+    text = pdf_text.select_sections("\n".join(paper_lines()), max_tokens=100_000)
+
+    assert "intro lorem" in text and "method lorem" in text and "training lorem" in text
+    assert "results lorem" in text and "conclusion lorem" in text and "abstract lorem" in text
+    assert "related" not in text
+    assert "citation" not in text
+
+
+def test_select_sections_shares_the_token_cap_across_sections():
+    text = pdf_text.select_sections("\n".join(paper_lines()), max_tokens=300)
+
+    assert len(text) <= 300 * pdf_text.CHARS_PER_TOKEN + 100
+    assert "conclusion lorem" in text
+    assert "intro lorem" in text
+
+
+def test_extract_sections_reads_pdf_and_rejects_unparseable_files(tmp_path):
+    good = tmp_path / "good.pdf"
+    good.write_bytes(build_pdf(paper_lines()))
+    bad = tmp_path / "bad.pdf"
+    bad.write_bytes(b"%PDF-1.4\nnot really a pdf")
+
+    assert pdf_text.extract_many([good, bad], max_tokens=100_000, max_workers=2)[1] is None
+    text = pdf_text.extract_sections(good, max_tokens=100_000)
+    assert "method lorem" in text and "citation" not in text
+
+
+def test_extraction_pool_spawns_workers_instead_of_forking():
+    source = build_pdf(paper_lines())
+
+    with pdf_text.extraction_pool(1) as executor:
+        text = executor.submit(pdf_text.extract_sections, source, 100_000).result()
+        assert executor._mp_context.get_start_method() == "spawn"
+
+    assert "method lorem" in text
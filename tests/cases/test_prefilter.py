@@ -0,0 +1,44 @@
+import numpy as np
+
+import prefilter
+
+
+INTERESTS = """
+- Strong Interests:
+    - Continual learning and self-evolving agents
+- Moderate Interests:
+    - Neural architecture search
+- Avoids / Not currently focused on:
+    - Protein structure prediction
+"""
+
+
+def test_parse_interests_weights_by_section():
+    assert prefilter.parse_interests(INTERESTS) == [
+        ("Continual learning and self-evolving agents", 1.0),
+        ("Neural architecture search", 0.5),
+        ("Protein structure prediction", -1.0),
+    ]
+
+
+def test_bm25_scores_rank_and_penalise_in_one_pass():
+    documents = [
+        "A continual learning benchmark for self-evolving agents.",
+        "Efficient neural architecture search on a budget.",
+        "Graphene thermal transport measurements.",
+        "Protein structure prediction with neural architecture search.",
+    ]
+
+    scores = prefilter.bm25_scores(documents, prefilter.parse_interests(INTERESTS))
+
+    assert scores.shape == (4,)
+    assert scores[0] > scores[1] > scores[2] == 0.0
+    assert scores[3] < scores[1]
+
+
+def test_select_applies_top_k_and_threshold_in_original_order():
+    scores = np.array([0.5, 3.0, 0.0, 2.0, 1.0])
+
+    assert prefilter.select(scores, top_k=2) == [1, 3]
+    assert prefilter.select(scores, min_score=0.75) == [1, 3, 4]
+    assert prefilter.select(scores, top_k=10, min_score=0.0) == [0, 1, 3, 4]
@@ -0,0 +1,136 @@
+import io
+from types import SimpleNamespace
+
+import pytest
+from google.genai import errors
+
+from resilient_client import AimdLimiter, ResilientClient, TokenBucket, backoff_delay, retry_after
+
+
+def _throttled(delay="3s"):
+    return errors.ClientError(
+        429,
+        {
+            "error": {
+                "code": 429,
+                "status": "RESOURCE_EXHAUSTED",
+                "details": [{"@type": "type.googleapis.com/google.rpc.RetryInfo", "retryDelay": delay}],
+            }
+        },
+    )
+
+
+class FlakyModels:
+    def __init__(self, failures):
+        self.failures = list(failures)
+        self.calls = 0
+
+    def generate_content(self, *, model, contents):
+        self.calls += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        return SimpleNamespace(text=f"{model}:{contents[0]}")
+
+
+def test_retries_transient_errors_honoring_retry_after():
+    sleeps = []
+    models = FlakyModels([_throttled("3s"), errors.ServerError(503, {"error": {"code": 503}})])
+    client = ResilientClient(SimpleNamespace(models=models), requests_per_minute=6000, sleep=sleeps.append)
+
+    response = client.models.generate_content(model="judge", contents=["paper"])
+
+    assert response.text == "judge:paper"
+    assert models.calls == 3
+    assert 3 <= sleeps[0] <= 4
+    assert client.limiter("judge").limit < 4
+
+
+def test_upload_retries_rewind_file_objects():
+    reads = []
+
+    class FlakyFiles:
+        def upload(self, *, file, config=None):
+            reads.append(file.read())
+            if len(reads) == 1:
+                raise errors.ServerError(503, {"error": {"code": 503}})
+            return "handle"
+
+    client = ResilientClient(SimpleNamespace(files=FlakyFiles()), requests_per_minute=6000, sleep=lambda delay: None)
+
+    assert client.files.upload(file=io.BytesIO(b"%PDF body")) == "handle"
+    assert reads == [b"%PDF body", b"%PDF body"]
+
+
+def test_non_retryable_errors_and_exhausted_attempts_raise():
+    sleeps = []
+    bad_request = errors.ClientError(400, {"error": {"code": 400}})
+    client = ResilientClient(SimpleNamespace(models=FlakyModels([bad_request])), sleep=sleeps.append)
+    with pytest.raises(errors.ClientError):
+        client.models.generate_content(model="judge", contents=["paper"])
+    assert sleeps == []
+
+    client = ResilientClient(
+        SimpleNamespace(models=FlakyModels([_throttled()] * 3)), max_attempts=3, sleep=sleeps.append
+    )
+    with pytest.raises(errors.ClientError):
+        client.models.generate_content(model="judge", contents=["paper"])
+    assert len(sleeps) == 2
+
+
+def test_uploads_go_through_the_same_retry_path():
+    attempts = []
+
+    def upload(file):
+        attempts.append(file)
+        if len(attempts) == 1:
+            raise ConnectionError("reset")
+        return "handle"
+
+    client = ResilientClient(SimpleNamespace(files=SimpleNamespace(upload=upload)), sleep=lambda delay: None)
+
+    assert client.files.upload(file="paper.pdf") == "handle"
+    assert attempts == ["paper.pdf", "paper.pdf"]
+
+
+def test_aimd_limiter_halves_on_throttle_and_grows_additively():
+    now = [0.0]
+    limiter = AimdLimiter(initial=8, cooldown=5, clock=lambda: now[0])
+
+    limiter.acquire()
+    limiter.release(throttled=True)
+    limiter.acquire()
+    limiter.release(throttled=True)
+    assert limiter.limit == 4
+
+    now[0] = 10
+    limiter.acquire()
+    limiter.release(throttled=True)
+    assert limiter.limit == 2
+
+    for _ in range(4):
+        limiter.acquire()
+        limiter.release()
+    assert 3 < limiter.limit < 4
+
+
+def test_token_bucket_paces_requests():
+    now = [0.0]
+    sleeps = []
+
+    def sleep(delay):
+        sleeps.append(delay)
+        now[0] += delay
+
+    bucket = TokenBucket(rate_per_second=2, capacity=1, clock=lambda: now[0], sleep=sleep)
+    for _ in range(3):
+        bucket.acquire()
+
+    assert sleeps == [0.5, 0.5]
+
+
+def test_retry_hints_and_backoff_bounds():
+    assert retry_after(_throttled("1.5s")) == 1.5
+    assert retry_after(SimpleNamespace(response=SimpleNamespace(headers={"retry-after": "7"}))) == 7
+    assert retry_after(ValueError()) is None
+    assert 2 <= backoff_delay(2) <= 4
+    assert backoff_delay(30) <= 60
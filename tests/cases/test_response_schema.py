@@ -0,0 +1,61 @@
+import json
+
+import response_schema
+from response_schema import PaperSummary, ResponseValidator, Verdict
+
+
+VERDICT = {"title": "Paper", "id": "2401.00001", "should_read": True, "relevance_score": 8}
+
+
+def test_valid_response_passes_without_reasking():
+    validator = ResponseValidator(max_repairs=2)
+    asked = []
+
+    verdict = validator.resolve("judge", Verdict, f"```json\n{json.dumps(VERDICT)}\n```", lambda *args: asked.append(args))
+
+    assert verdict.relevance_score == 8
+    assert asked == []
+    assert validator.failure_rate() == 0.0
+
+
+def test_invalid_response_is_repaired_once_with_the_error():
+    validator = ResponseValidator(max_repairs=2)
+    prompts = []
+
+    def reask(prompt, previous):
+        prompts.append((prompt, previous))
+        return json.dumps(VERDICT)
+
+    broken = json.dumps({**VERDICT, "relevance_score": 42})
+    verdict = validator.resolve("judge", Verdict, broken, reask)
+
+    assert verdict.id == "2401.00001"
+    assert len(prompts) == 1
+    assert "relevance_score" in prompts[0][0]
+    assert prompts[0][1] == broken
+    assert validator.stats["judge"] == {"checked": 1, "invalid": 1, "repaired": 1, "dropped": 0}
+
+
+def test_repairs_stop_at_the_run_cap():
+    validator = ResponseValidator(max_repairs=1)
+    calls = []
+
+    def reask(prompt, previous):
+        calls.append(prompt)
+        return "still not json"
+
+    assert validator.resolve("judge", Verdict, "not json", reask) is None
+    assert validator.resolve("judge", Verdict, "not json", reask) is None
+
+    assert len(calls) == 1
+    assert validator.failure_rate() == 1.0
+    assert "1 of 1 repairs used" in validator.report()
+
+
+def test_summary_round_trips_legacy_keys():
+    document = {"Title": "Paper", "Key Contributions": "- one", "Should Read Fully?": "Yes"}
+
+    summary, error = response_schema.validate(PaperSummary, json.dumps(document))
+
+    assert error is None
+    assert json.loads(response_schema.dumps(summary, exclude_unset=True)) == document
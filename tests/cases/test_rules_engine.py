@@ -0,0 +1,46 @@
+import pytest
+from types import SimpleNamespace
+
+from rules_engine import RuleSet
+
+
+RULES = [
+    {"name": "watched", "action": "accept", "authors": ["Ada  Lovelace"]},
+    {"name": "bio", "action": "reject", "categories": ["q-bio.BM"], "keywords": ["protein folding"]},
+    {"name": "continual", "action": "accept", "score": 8, "patterns": [r"continual(ly)?[- ]learn\w*"]},
+]
+
+
+def _paper(title="Paper", summary="", category="cs.LG", authors=()):
+    return SimpleNamespace(
+        title=title,
+        summary=summary,
+        primary_category=category,
+        authors=[SimpleNamespace(name=name) for name in authors],
+    )
+
+
+def test_first_matching_rule_in_file_order_wins():
+    rules = RuleSet(RULES)
+
+    assert rules.decide(_paper(summary="Continual learning for protein folding")).name == "bio"
+    assert rules.decide(_paper(summary="protein folding", authors=["ada lovelace"])).name == "watched"
+    assert rules.decide(_paper(title="Continually-learned adapters")).score == 8
+    assert rules.decide(_paper(category="Q-BIO.BM")).action == "reject"
+    assert rules.decide(_paper(summary="Graph neural networks")) is None
+
+
+def test_keywords_respect_word_boundaries():
+    rules = RuleSet([{"name": "rl", "action": "reject", "keywords": ["RL"]}])
+
+    assert rules.decide(_paper(summary="Offline RL in robotics")) is not None
+    assert rules.decide(_paper(summary="Curling analytics")) is None
+
+
+def test_invalid_rules_are_rejected_at_compile_time(tmp_path):
+    with pytest.raises(ValueError, match="action"):
+        RuleSet([{"name": "oops", "action": "maybe"}])
+
+    path = tmp_path / "rules.json"
+    path.write_text('{"rules": [{"action": "accept", "keywords": ["diffusion"]}]}')
+    assert RuleSet.load(path).decide(_paper(summary="Diffusion models")).name == "rule-0"
@@ -0,0 +1,65 @@
+import threading
+
+from stage_pipeline import Stage, run_stages
+
+
+def test_items_flow_to_next_stage_before_upstream_finishes():
+    first_item_finished = threading.Event()
+
+    def slow_producer(item):
+        if item == 2:
+            assert first_item_finished.wait(timeout=5), "stage 2 never saw item 0 while stage 1 was busy"
+        return item * 10
+
+    def consumer(item):
+        if item == 0:
+            first_item_finished.set()
+        return item + 1
+
+    results = run_stages(range(3), [Stage("produce", slow_producer), Stage("consume", consumer)], queue_size=1)
+
+    assert results == [1, 11, 21]
+
+
+def test_dropped_and_failed_items_are_skipped_in_stable_order(capsys):
+    def maybe_drop(item):
+        return None if item == 1 else item
+
+    def maybe_fail(item):
+        if item == 3:
+            raise RuntimeError("boom")
+        return f"item-{item}"
+
+    results = run_stages(
+        range(6),
+        [Stage("drop", maybe_drop, workers=3), Stage("fail", maybe_fail, workers=2), Stage("noop", lambda x: x)],
+        queue_size=2,
+    )
+
+    assert results == ["item-0", "item-2", "item-4", "item-5"]
+    assert "Stage 'fail' failed: boom" in capsys.readouterr().out
+
+
+def test_fan_out_stage_splits_batches_in_stable_order():
+    results = run_stages(
+        [[1, 2, 3], [4], [5, 6]],
+        [Stage("batch", lambda batch: [item for item in batch if item != 2], workers=2, fan_out=True),
+         Stage("double", lambda item: item * 2, workers=3)],
+        queue_size=1,
+    )
+
+    assert results == [2, 6, 8, 10, 12]
+
+
+def test_failed_items_are_reported_to_the_caller():
+    failures = []
+
+    def fail_on_two(item):
+        if item == 2:
+            raise ValueError("bad item")
+        return item
+
+    results = run_stages(range(4), [Stage("check", fail_on_two, workers=2)], failures=failures)
+
+    assert results == [0, 1, 3]
+    assert [(name, item, str(exc)) for name, item, exc in failures] == [("check", 2, "bad item")]
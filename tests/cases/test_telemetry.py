@@ -0,0 +1,56 @@
+import json
+import threading
+
+import pytest
+
+import telemetry
+
+
+def test_spans_nest_and_counters_accumulate(tmp_path):
+    tracer = telemetry.start_run()
+    try:
+        with telemetry.span("outer") as outer:
+            outer["papers"] = 2
+            with telemetry.span("inner"):
+                telemetry.count("api_calls", 2)
+
+        worker = threading.Thread(target=lambda: telemetry.count("api_calls"))
+        worker.start()
+        worker.join()
+    finally:
+        finished = telemetry.finish_run(tmp_path / "trace.json")
+
+    assert finished is tracer
+    payload = json.loads((tmp_path / "trace.json").read_text())
+    spans = {span["name"]: span for span in payload["spans"]}
+    assert spans["inner"]["parent_id"] == spans["outer"]["span_id"]
+    assert spans["outer"]["parent_id"] == payload["root_span"]["span_id"]
+    assert spans["outer"]["attributes"] == {"papers": 2}
+    assert payload["counters"] == {"api_calls": 3}
+    assert payload["stages"]["inner"]["count"] == 1
+
+
+def test_failed_spans_are_marked_and_reraised(tmp_path):
+    telemetry.start_run()
+
+    @telemetry.traced("explode")
+    def explode():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        explode()
+    tracer = telemetry.finish_run(tmp_path / "trace.json")
+
+    [span] = tracer.spans
+    assert span["status"] == "error"
+    assert "boom" in span["error"]
+
+
+def test_inactive_telemetry_is_a_no_op(tmp_path):
+    with telemetry.span("ignored") as attributes:
+        attributes["bytes"] = 10
+    telemetry.count("ignored")
+
+    assert telemetry.active() is None
+    assert telemetry.finish_run(tmp_path / "trace.json") is None
+    assert not (tmp_path / "trace.json").exists()
@@ -0,0 +1,33 @@
+from title_index import TitleIndex, ngrams
+
+
+def test_ngrams_cover_short_and_long_text():
+    assert ngrams("") == set()
+    assert ngrams("ab") == {"ab"}
+    assert ngrams("abcd") == {"abc", "bcd"}
+
+
+def test_closest_prefers_exact_then_best_overlap():
+    index = TitleIndex(cutoff=0.5)
+    index.add("multiviewdiffusion", "cameo")
+    index.add("unifiedreasoning", "onethinker")
+
+    assert index.closest("unifiedreasoning") == ("unifiedreasoning", 1.0)
+    assert index.closest("unifiedreasonings")[0] == "unifiedreasoning"
+    assert index.closest("somethingelse") is None
+
+
+def test_pop_closest_removes_matched_entry():
+    index = TitleIndex()
+    index.add("paperone", "first")
+
+    assert index.pop_closest("paperonee") == "first"
+    assert len(index) == 0
+    assert index.pop_closest("paperonee") is None
+
+
+def test_cutoff_rejects_weak_matches():
+    index = TitleIndex(cutoff=0.8)
+    index.add("diffusionmodelsforvideo", "video")
+
+    assert index.closest("diffusionmodelsforaudio") is None
@@ -0,0 +1,91 @@
+import threading
+from types import SimpleNamespace
+
+from token_budget import DeferralQueue, MeteredClient, TokenLedger
+
+
+def _usage(prompt, output, cached=0):
+    return SimpleNamespace(
+        prompt_token_count=prompt,
+        candidates_token_count=output,
+        cached_content_token_count=cached,
+        total_token_count=prompt + output,
+    )
+
+
+def test_ledger_totals_tokens_and_cost_per_model():
+    ledger = TokenLedger(prices={"judge": {"input": 1.0, "output": 2.0, "cached": 0.5}})
+    ledger.record("judge", _usage(1_000_000, 500_000, cached=200_000))
+    ledger.record("judge", None)
+
+    assert ledger.total_tokens() == 1_500_000
+    assert ledger.total_cost() == 0.8 + 0.1 + 1.0
+    assert ledger.average_call("judge") == (500_000, 250_000)
+    assert "judge: 2 calls" in ledger.report()
+
+
+def test_plan_admits_in_order_until_the_cap():
+    ledger = TokenLedger(max_tokens=1_000)
+    ledger.record("judge", _usage(300, 100))
+
+    assert ledger.plan("judge", [(100, 50)] * 10) == 4
+    assert ledger.plan("judge", [(100, 50)] * 10, reserve=0.5) == 0
+    assert TokenLedger().plan("judge", [(10**9, 0)]) == 1
+
+
+def test_reservations_count_against_the_budget_until_released():
+    ledger = TokenLedger(max_tokens=1_000)
+
+    assert ledger.admit("judge", [(300, 100)] * 3) == 2
+    assert ledger.plan("judge", [(100, 0)]) == 1
+    assert ledger.reserve("summary", (300, 0)) is None
+
+    ledger.release("judge", [(300, 100)] * 2)
+    ledger.record("summary", _usage(100, 50))
+
+    assert ledger.reserve("summary", (300, 0)) == (100, 50)
+
+
+def test_waiting_reservation_replans_once_in_flight_calls_settle():
+    ledger = TokenLedger(max_tokens=1_000)
+    first = ledger.reserve("summary", (600, 0))
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(ledger.reserve("summary", (600, 0), wait=True)))
+    waiter.start()
+
+    ledger.record("summary", _usage(150, 50))
+    ledger.release("summary", [first])
+    waiter.join(timeout=5)
+
+    assert results == [(150, 50)]
+
+
+def test_plan_respects_cost_cap():
+    ledger = TokenLedger(max_cost=1.0, prices={"m": {"input": 1.0, "output": 1.0, "cached": 0.0}})
+
+    assert ledger.plan("m", [(400_000, 0), (400_000, 0), (400_000, 0)]) == 2
+
+
+def test_metered_client_records_usage_and_passes_through():
+    ledger = TokenLedger()
+
+    class Models:
+        def generate_content(self, *, model, contents):
+            return SimpleNamespace(text="ok", usage_metadata=_usage(10, 5))
+
+    client = MeteredClient(SimpleNamespace(models=Models(), files="files"), ledger)
+
+    assert client.models.generate_content(model="judge", contents=["x"]).text == "ok"
+    assert client.files == "files"
+    assert ledger.models["judge"]["total"] == 15
+
+
+def test_deferral_queue_round_trip(tmp_path):
+    queue = DeferralQueue(tmp_path / "deferred.json")
+    queue.extend(["0001.00001v1", "0002.00002v1", "0001.00001v1"])
+    queue.save()
+
+    reloaded = DeferralQueue(tmp_path / "deferred.json")
+    assert reloaded.take() == ["0001.00001v1", "0002.00002v1"]
+    reloaded.save()
+    assert DeferralQueue(tmp_path / "deferred.json").paper_ids == []
@@ -0,0 +1,23 @@
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from upload_cache import UploadCache, content_hash
+
+
+def test_persisted_handles_are_reused_until_they_expire(tmp_path):
+    path = tmp_path / "uploads.json"
+    expires = datetime.fromtimestamp(time.time() + 2 * 3600, tz=timezone.utc)
+    handle = SimpleNamespace(name="files/abc", uri="https://example/files/abc", mime_type="application/pdf",
+                             expiration_time=expires)
+
+    cache = UploadCache(path)
+    assert cache.fetch(b"pdf", lambda: handle) is handle
+    cache.save()
+
+    reloaded = UploadCache(path)
+    restored = reloaded.fetch(b"pdf", lambda: (_ for _ in ()).throw(AssertionError("re-uploaded")))
+    assert restored.uri == "https://example/files/abc"
+
+    near_expiry = UploadCache(path, margin=3 * 3600)
+    assert near_expiry.get(content_hash(b"pdf")) is None
@@ -0,0 +1,167 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+import requests
+import tweepy
+
+import x_tweet_module
+from outbox import PostOutbox
+
+
+class FakeXClient:
+    def __init__(self, throttle_first=False, crash_after=None):
+        self.session = requests.Session()
+        self.tweets = []
+        self.throttle_first = throttle_first
+        self.crash_after = crash_after
+        self._lock = threading.Lock()
+
+    def create_tweet(self, text, user_auth=True, in_reply_to_tweet_id=None):
+        with self._lock:
+            if self.crash_after is not None and len(self.tweets) >= self.crash_after:
+                raise RuntimeError("process killed")
+            if self.throttle_first:
+                self.throttle_first = False
+                response = requests.Response()
+                response.status_code = 429
+                response.reason = "Too Many Requests"
+                response._content = b'{"title": "Too Many Requests"}'
+                response.headers.update({"x-rate-limit-remaining": "0", "x-rate-limit-reset": "0"})
+                raise tweepy.TooManyRequests(response)
+            tweet_id = str(len(self.tweets) + 1)
+            self.tweets.append((tweet_id, text, in_reply_to_tweet_id))
+
+        response = requests.Response()
+        response.headers.update({"x-rate-limit-remaining": "50", "x-rate-limit-reset": "9999999999"})
+        for hook in self.session.hooks["response"]:
+            hook(response)
+        return SimpleNamespace(data={"id": tweet_id})
+
+
+def _entries(count):
+    return [
+        {
+            "title": f"Paper {index}",
+            "results_summary": f"Result {index}. " + " ".join(["word"] * 54),
+            "arxiv_id": f"000{index}.0000{index}",
+        }
+        for index in range(count)
+    ]
+
+
+def test_post_publishes_threads_concurrently_with_ordered_replies():
+    client = FakeXClient()
+
+    responses = x_tweet_module.post(client, _entries(6), dry_run=False, max_workers=3)
+
+    assert len(responses) == len(client.tweets) == 18
+    by_id = {tweet_id: (text, parent) for tweet_id, text, parent in client.tweets}
+    for tweet_id, text, parent in client.tweets:
+        if text.startswith("Paper"):
+            assert parent is None
+        elif text.startswith("Result"):
+            assert by_id[parent][0] == f"Paper {text.split()[1].rstrip('.')}"
+        else:
+            assert by_id[parent][0].startswith("Result")
+    assert client.session.hooks["response"] == []
+
+
+def test_build_thread_packs_short_lines_into_one_tweet():
+    item = {
+        "title": "Paper",
+        "results_summary": "Faster training.",
+        "key_contributions": "- A new loss\n- A new dataset\n- An ablation",
+        "arxiv_id": "2401.00001v2",
+    }
+
+    assert x_tweet_module._build_thread(item) == [
+        "Paper\n\nFaster training.\n\nA new loss\nA new dataset\nAn ablation\n\nhttps://arxiv.org/abs/2401.00001"
+    ]
+
+
+def test_build_thread_breaks_long_text_at_word_boundaries():
+    words = [f"word{index}" for index in range(100)]
+    thread = x_tweet_module._build_thread({"title": "Paper", "summary": " ".join(words)})
+
+    assert all(x_tweet_module.tweet_length(tweet) <= x_tweet_module.TWEET_LIMIT for tweet in thread)
+    assert " ".join(thread).replace("\n\n", " ").split() == ["Paper", *words]
+
+
+def test_tweet_length_uses_weighted_counting():
+    assert x_tweet_module.tweet_length("see https://example.com/" + "a" * 200) == 4 + 23
+    assert x_tweet_module.tweet_length("深度学习 — ok") == 8 + 5
+    assert x_tweet_module.tweet_length("é" * 10) == 10
+
+
+def test_post_dry_run_makes_no_calls(capsys):
+    client = FakeXClient()
+
+    assert x_tweet_module.post(client, _entries(2)) == []
+    assert client.tweets == []
+    assert "Tweet: Paper 1" in capsys.readouterr().out
+
+
+def test_scheduler_waits_for_reset_when_window_is_exhausted():
+    now = [100.0]
+    sleeps = []
+
+    def sleep(delay):
+        sleeps.append(delay)
+        now[0] += delay
+
+    scheduler = x_tweet_module.RateLimitScheduler(clock=lambda: now[0], sleep=sleep)
+    response = SimpleNamespace(headers={"x-rate-limit-remaining": "1", "x-rate-limit-reset": "130"})
+    scheduler.observe(response)
+
+    scheduler.acquire()
+    scheduler.acquire()
+
+    assert sleeps == [31]
+    assert scheduler.remaining is None
+
+
+def test_rate_limited_tweet_is_retried_after_waiting():
+    client = FakeXClient(throttle_first=True)
+    now = [100.0]
+    sleeps = []
+
+    def sleep(delay):
+        sleeps.append(delay)
+        now[0] += delay
+
+    scheduler = x_tweet_module.RateLimitScheduler(clock=lambda: now[0], sleep=sleep)
+
+    responses = x_tweet_module.post(client, _entries(1), dry_run=False, scheduler=scheduler)
+
+    assert len(responses) == 3
+    assert sleeps == [x_tweet_module.RATE_LIMIT_FALLBACK_WAIT + 1]
+
+
+def test_outbox_resumes_a_crashed_thread_from_the_last_posted_reply(tmp_path):
+    path = tmp_path / "outbox.jsonl"
+    crashed = FakeXClient(crash_after=2)
+
+    with pytest.raises(RuntimeError):
+        x_tweet_module.post(crashed, _entries(1), dry_run=False, outbox=PostOutbox(path))
+
+    client = FakeXClient()
+    client.tweets = list(crashed.tweets)
+    responses = x_tweet_module.post(client, [], dry_run=False, outbox=PostOutbox(path))
+
+    assert len(responses) == 1
+    assert client.tweets[2] == ("3", "https://arxiv.org/abs/0000.00000", "2")
+    assert PostOutbox(path).pending() == []
+
+
+def test_outbox_skips_published_threads_without_calling_the_api(tmp_path, capsys):
+    path = tmp_path / "outbox.jsonl"
+    x_tweet_module.post(FakeXClient(), _entries(2), dry_run=False, outbox=PostOutbox(path))
+
+    client = FakeXClient()
+    regenerated = [dict(entry, results_summary="Reworded result.") for entry in _entries(2)]
+    responses = x_tweet_module.post(client, regenerated, dry_run=False, outbox=PostOutbox(path))
+
+    assert responses == []
+    assert client.tweets == []
+    assert "Skipped already published thread" in capsys.readouterr().out
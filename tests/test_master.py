@@ -1,3 +1,4 @@
+import json
 from types import SimpleNamespace
 
 import pytest
@@ -7,8 +8,9 @@ import main
 import x_tweet_module
 
 
-def test_main_happy_path(monkeypatch):
+def test_main_happy_path(tmp_path, monkeypatch):
     monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.chdir(tmp_path)
 
     monkeypatch.setattr(x_tweet_module, "authenticate", lambda: "auth")
 
@@ -22,51 +24,78 @@ def test_main_happy_path(monkeypatch):
 
     search_calls = []
 
-    def fake_search(client):
+    stores = []
+
+    def fake_search(client, **kwargs):
         search_calls.append(client)
+        stores.append(kwargs["pdfs"])
         return ["paper-object"]
 
+    def fake_summarize(result, client, **kwargs):
+        stores.append(kwargs["pdfs"])
+        return ["summary-json"]
+
     monkeypatch.setattr(arxiv_pipeline, "search_papers", fake_search)
-    monkeypatch.setattr(
-        arxiv_pipeline,
-        "summarize_reading_list",
-        lambda result, client: ["summary-json"],
-    )
+    monkeypatch.setattr(arxiv_pipeline, "summarize_reading_list", fake_summarize)
     monkeypatch.setattr(
         arxiv_pipeline,
         "judge_papers",
-        lambda papers, client: [{"id": "http://arxiv.org/abs/0001.00001v1"}],
+        lambda papers, client, **kwargs: [{"id": "http://arxiv.org/abs/0001.00001v1"}],
     )
     monkeypatch.setattr(
         arxiv_pipeline,
         "parse_summary",
-        lambda summaries, reading: [["Title: Example", "arxiv_id: http://arxiv.org/abs/0001.00001v1"]],
+        lambda summaries, reading, **kwargs: [["Title: Example", "arxiv_id: http://arxiv.org/abs/0001.00001v1"]],
     )
 
     posted = {}
 
-    def fake_post(auth, data, dry_run=True):
+    def fake_post(auth, data, dry_run=True, **kwargs):
         posted["payload"] = (auth, data, dry_run)
+        posted["outbox"] = kwargs.get("outbox")
 
     monkeypatch.setattr(x_tweet_module, "post", fake_post)
 
-    remove_called = {"called": False}
+    main.main()
+
+    assert [client._client._client for client in search_calls] == [stub_client]
+    assert posted["payload"][0] == "auth"
+    assert posted["payload"][2] is True
+    assert posted["outbox"].path == arxiv_pipeline.OUTBOX_PATH
+    assert stores[0] is stores[1]
+    assert not (tmp_path / "papers").exists()
+    assert json.loads((tmp_path / ".cache" / "trace.json").read_text())["root_span"]["name"] == "run"
+
 
-    def fake_remove():
-        remove_called["called"] = True
+def test_main_streaming_mode(tmp_path, monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setenv("PIPELINE_MODE", "streaming")
+    monkeypatch.setenv("DRY_RUN", "false")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(x_tweet_module, "authenticate", lambda: "auth")
+    monkeypatch.setattr(main.genai, "Client", lambda *, api_key: "client")
 
-    monkeypatch.setattr(arxiv_pipeline, "remove_downloaded_papers", fake_remove)
+    posted = []
+    monkeypatch.setattr(
+        x_tweet_module, "post", lambda auth, data, dry_run=True, **kwargs: posted.append((auth, data, dry_run))
+    )
+
+    def fake_stream(client, publish, **kwargs):
+        assert client._client._client == "client"
+        publish([["Title: Example"]])
+        return [["Title: Example"]]
+
+    monkeypatch.setattr(arxiv_pipeline, "stream_reading_list", fake_stream)
+    monkeypatch.setattr(arxiv_pipeline, "search_papers", lambda *args, **kwargs: pytest.fail("batch path used"))
 
     main.main()
 
-    assert search_calls == [stub_client]
-    assert posted["payload"][0] == "auth"
-    assert posted["payload"][2] is True
-    assert remove_called["called"] is True
+    assert posted == [("auth", [["Title: Example"]], False)]
 
 
-def test_main_requires_gemini_key(monkeypatch):
+def test_main_requires_gemini_key(tmp_path, monkeypatch):
     monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    monkeypatch.chdir(tmp_path)
     monkeypatch.setattr(x_tweet_module, "authenticate", lambda: "auth")
 
     with pytest.raises(ValueError, match="GEMINI_API_KEY"):
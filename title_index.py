@@ -0,0 +1,69 @@
+from collections import Counter
+
+
+NGRAM_SIZE = 3
+DEFAULT_CUTOFF = 0.8
+
+
+class TitleIndex:
+    def __init__(self, cutoff: float = DEFAULT_CUTOFF):
+        self.cutoff = cutoff
+        self._values: dict[str, object] = {}
+        self._grams: dict[str, set[str]] = {}
+        self._postings: dict[str, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._values
+
+    def add(self, key: str, value) -> None:
+        if key in self._values:
+            self.pop(key)
+        grams = ngrams(key)
+        self._values[key] = value
+        self._grams[key] = grams
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(key)
+
+    def pop(self, key: str, default=None):
+        if key not in self._values:
+            return default
+        for gram in self._grams.pop(key):
+            postings = self._postings[gram]
+            postings.discard(key)
+            if not postings:
+                del self._postings[gram]
+        return self._values.pop(key)
+
+    def closest(self, key: str) -> tuple[str, float] | None:
+        if key in self._values:
+            return key, 1.0
+
+        grams = ngrams(key)
+        if not grams:
+            return None
+
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+
+        scored = [
+            (2 * overlap / (len(grams) + len(self._grams[candidate])), candidate)
+            for candidate, overlap in shared.items()
+        ]
+        if not scored:
+            return None
+        score, candidate = min(scored, key=lambda item: (-item[0], item[1]))
+        return (candidate, score) if score >= self.cutoff else None
+
+    def pop_closest(self, key: str):
+        match = self.closest(key)
+        return self.pop(match[0]) if match else None
+
+
+def ngrams(text: str, size: int = NGRAM_SIZE) -> set[str]:
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[index:index + size] for index in range(len(text) - size + 1)}
@@ -0,0 +1,219 @@
+import json
+import os
+import threading
+from pathlib import Path
+
+import telemetry
+
+
+PRICES_PER_MILLION = {
+    "gemini-2.5-flash-lite": {"input": 0.10, "output": 0.40, "cached": 0.025},
+    "gemini-2.5-flash": {"input": 0.30, "output": 2.50, "cached": 0.075},
+}
+DEFAULT_PRICES = {"input": 0.30, "output": 2.50, "cached": 0.075}
+USAGE_FIELDS = ("prompt", "output", "cached", "total")
+
+
+class TokenLedger:
+    def __init__(
+        self,
+        max_tokens: int | None = None,
+        max_cost: float | None = None,
+        prices: dict[str, dict[str, float]] | None = None,
+    ):
+        self.max_tokens = max_tokens
+        self.max_cost = max_cost
+        self.prices = prices or PRICES_PER_MILLION
+        self.models: dict[str, dict[str, float]] = {}
+        self.deferred: list[str] = []
+        self._reserved = {"calls": 0, "tokens": 0, "cost": 0.0}
+        self._lock = threading.RLock()
+        self._settled = threading.Condition(self._lock)
+
+    @property
+    def budgeted(self) -> bool:
+        return self.max_tokens is not None or self.max_cost is not None
+
+    def record(self, model: str, usage) -> None:
+        prompt = _usage_value(usage, "prompt_token_count")
+        cached = _usage_value(usage, "cached_content_token_count")
+        output = _usage_value(usage, "candidates_token_count") + _usage_value(usage, "thoughts_token_count")
+        total = _usage_value(usage, "total_token_count") or prompt + output
+
+        with self._lock:
+            entry = self.models.setdefault(model, {"calls": 0, **{field: 0 for field in USAGE_FIELDS}})
+            entry["calls"] += 1
+            entry["prompt"] += prompt
+            entry["output"] += output
+            entry["cached"] += cached
+            entry["total"] += total
+
+        telemetry.count("tokens.prompt", prompt)
+        telemetry.count("tokens.output", output)
+        telemetry.count("tokens.cached", cached)
+
+    def total_tokens(self) -> int:
+        with self._lock:
+            return int(sum(entry["total"] for entry in self.models.values()))
+
+    def total_cost(self) -> float:
+        with self._lock:
+            return sum(self._entry_cost(model, entry) for model, entry in self.models.items())
+
+    def average_call(self, model: str) -> tuple[int, int] | None:
+        with self._lock:
+            entry = self.models.get(model)
+            if not entry or not entry["calls"] or not entry["total"]:
+                return None
+            return int(entry["prompt"] / entry["calls"]), int(entry["output"] / entry["calls"])
+
+    def estimate_cost(self, model: str, input_tokens: int, output_tokens: int) -> float:
+        prices = self.prices.get(model, DEFAULT_PRICES)
+        return (input_tokens * prices["input"] + output_tokens * prices["output"]) / 1_000_000
+
+    def plan(self, model: str, estimates: list[tuple[int, int]], reserve: float = 0.0) -> int:
+        if not self.budgeted:
+            return len(estimates)
+
+        with self._lock:
+            tokens = self.total_tokens() + self._reserved["tokens"]
+            cost = self.total_cost() + self._reserved["cost"]
+
+        for admitted, (input_tokens, output_tokens) in enumerate(estimates):
+            tokens += input_tokens + output_tokens
+            cost += self.estimate_cost(model, input_tokens, output_tokens)
+            if not self._within(tokens, cost, reserve):
+                return admitted
+        return len(estimates)
+
+    def admit(self, model: str, estimates: list[tuple[int, int]], reserve: float = 0.0) -> int:
+        with self._lock:
+            admitted = self.plan(model, estimates, reserve)
+            self._hold(model, estimates[:admitted], 1)
+            return admitted
+
+    def reserve(self, model: str, default: tuple[int, int], wait: bool = False) -> tuple[int, int] | None:
+        with self._settled:
+            while True:
+                estimate = self.average_call(model) or default
+                if self.plan(model, [estimate]):
+                    self._hold(model, [estimate], 1)
+                    return estimate
+                if not wait or not self._reserved["calls"]:
+                    return None
+                self._settled.wait()
+
+    def release(self, model: str, estimates: list[tuple[int, int]]) -> None:
+        with self._settled:
+            self._hold(model, estimates, -1)
+            self._settled.notify_all()
+
+    def defer(self, paper_ids: list[str]) -> None:
+        with self._lock:
+            self.deferred.extend(paper_id for paper_id in paper_ids if paper_id not in self.deferred)
+
+    def report(self) -> str:
+        lines = []
+        with self._lock:
+            models = {model: dict(entry) for model, entry in sorted(self.models.items())}
+        for model, entry in models.items():
+            lines.append(
+                f"{model}: {entry['calls']} calls, {entry['prompt']:,.0f} prompt + {entry['output']:,.0f} output tokens "
+                f"({entry['cached']:,.0f} cached), ${self._entry_cost(model, entry):.4f}"
+            )
+
+        limits = []
+        if self.max_tokens is not None:
+            limits.append(f"{self.total_tokens():,} of {self.max_tokens:,} tokens")
+        if self.max_cost is not None:
+            limits.append(f"${self.total_cost():.4f} of ${self.max_cost:.2f}")
+        summary = f"Run total: {self.total_tokens():,} tokens, ${self.total_cost():.4f}"
+        if limits:
+            summary += f" (budget: {', '.join(limits)})"
+        if self.deferred:
+            summary += f"; deferred {len(self.deferred)} papers to the next run"
+        lines.append(summary)
+        return "\n".join(lines)
+
+    def _hold(self, model: str, estimates: list[tuple[int, int]], sign: int) -> None:
+        for input_tokens, output_tokens in estimates:
+            self._reserved["calls"] += sign
+            self._reserved["tokens"] += sign * (input_tokens + output_tokens)
+            self._reserved["cost"] += sign * self.estimate_cost(model, input_tokens, output_tokens)
+
+    def _within(self, tokens: int, cost: float, reserve: float = 0.0) -> bool:
+        if self.max_tokens is not None and tokens > self.max_tokens * (1 - reserve):
+            return False
+        return self.max_cost is None or cost <= self.max_cost * (1 - reserve)
+
+    def _entry_cost(self, model: str, entry: dict[str, float]) -> float:
+        prices = self.prices.get(model, DEFAULT_PRICES)
+        uncached = max(0, entry["prompt"] - entry["cached"])
+        return (
+            uncached * prices["input"] + entry["cached"] * prices["cached"] + entry["output"] * prices["output"]
+        ) / 1_000_000
+
+
+class MeteredClient:
+    def __init__(self, client, ledger: TokenLedger):
+        self._client = client
+        self.ledger = ledger
+
+    @property
+    def models(self):
+        return _MeteredModels(self._client.models, self.ledger)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+class _MeteredModels:
+    def __init__(self, models, ledger: TokenLedger):
+        self._models = models
+        self._ledger = ledger
+
+    def generate_content(self, *, model, **kwargs):
+        response = self._models.generate_content(model=model, **kwargs)
+        self._ledger.record(model, getattr(response, "usage_metadata", None))
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self._models, name)
+
+
+class DeferralQueue:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.paper_ids: list[str] = []
+        self._load()
+
+    def take(self) -> list[str]:
+        paper_ids, self.paper_ids = self.paper_ids, []
+        return paper_ids
+
+    def extend(self, paper_ids: list[str]) -> None:
+        self.paper_ids.extend(paper_id for paper_id in paper_ids if paper_id not in self.paper_ids)
+
+    def save(self) -> None:
+        if not self.paper_ids and not self.path.exists():
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(self.paper_ids, indent=4), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            paper_ids = json.loads(self.path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError) as exc:
+            print(f"Ignoring unreadable deferral queue {self.path}: {exc}")
+            return
+        if isinstance(paper_ids, list):
+            self.paper_ids = [str(paper_id) for paper_id in paper_ids]
+
+
+def _usage_value(usage, name: str) -> int:
+    value = getattr(usage, name, None) if usage is not None else None
+    return int(value) if isinstance(value, (int, float)) else 0
@@ -0,0 +1,104 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from google.genai import types
+
+
+REMOTE_FILE_TTL = 48 * 3600
+EXPIRY_MARGIN = 3600
+
+
+class UploadCache:
+    def __init__(self, path: Path | None = None, ttl: float = REMOTE_FILE_TTL, margin: float = EXPIRY_MARGIN):
+        self.path = Path(path) if path else None
+        self.ttl = ttl
+        self.margin = margin
+        self._handles: dict[str, tuple[object, float]] = {}
+        self._records: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._key_locks: dict[str, threading.Lock] = {}
+        self._load()
+
+    def fetch(self, data: bytes, upload):
+        return self.fetch_digest(content_hash(data), upload)
+
+    def fetch_digest(self, digest: str, upload):
+        with self._key_lock(digest):
+            handle = self.get(digest)
+            if handle is None:
+                handle = upload()
+                self.put(digest, handle)
+            return handle
+
+    def get(self, digest: str):
+        with self._lock:
+            cached = self._handles.get(digest)
+            if cached is None:
+                return None
+            handle, expires_at = cached
+            if time.time() >= expires_at - self.margin:
+                self._handles.pop(digest, None)
+                self._records.pop(digest, None)
+                return None
+            return handle
+
+    def put(self, digest: str, handle) -> None:
+        expires_at = _expiration(handle) or time.time() + self.ttl
+        with self._lock:
+            self._handles[digest] = (handle, expires_at)
+            uri = getattr(handle, "uri", None)
+            if uri:
+                self._records[digest] = {
+                    "name": getattr(handle, "name", None),
+                    "uri": uri,
+                    "mime_type": getattr(handle, "mime_type", None) or "application/pdf",
+                    "expires_at": expires_at,
+                }
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        with self._lock:
+            now = time.time()
+            records = {key: value for key, value in self._records.items() if value["expires_at"] - self.margin > now}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp_path.write_text(json.dumps(records), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+
+    def _key_lock(self, digest: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(digest, threading.Lock())
+
+    def _load(self) -> None:
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            records = json.loads(self.path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError):
+            return
+        if not isinstance(records, dict):
+            return
+
+        for digest, record in records.items():
+            if not isinstance(record, dict) or "uri" not in record or "expires_at" not in record:
+                continue
+            handle = types.File(name=record.get("name"), uri=record["uri"], mime_type=record.get("mime_type"))
+            self._handles[digest] = (handle, record["expires_at"])
+            self._records[digest] = record
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _expiration(handle) -> float | None:
+    expiration = getattr(handle, "expiration_time", None)
+    if isinstance(expiration, datetime):
+        return expiration.timestamp()
+    return None
@@ -1,13 +1,24 @@
 import json
 import os
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Iterable, List
 
 import tweepy
 
+import telemetry
+from outbox import PostOutbox
+
 
 TWEET_LIMIT = 280
+URL_LENGTH = 23
+URL_PATTERN = re.compile(r"https?://\S+")
+POST_MAX_WORKERS = 4
+RATE_LIMIT_RETRIES = 3
+RATE_LIMIT_FALLBACK_WAIT = 60.0
 REQUIRED_KEYS = [
     "BEARER_TOKEN",
     "API_KEY",
@@ -39,40 +50,147 @@ def authenticate() -> tweepy.Client:
     return client
 
 
-def post(client: tweepy.Client, data, dry_run: bool = True) -> list:
+class RateLimitScheduler:
+    def __init__(self, clock=time.time, sleep=time.sleep):
+        self.remaining: int | None = None
+        self.reset_at: float | None = None
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    def observe(self, response, *args, **kwargs) -> None:
+        headers = getattr(response, "headers", None) or {}
+        try:
+            remaining = int(headers["x-rate-limit-remaining"])
+            reset_at = float(headers["x-rate-limit-reset"])
+        except (KeyError, TypeError, ValueError):
+            return
+        with self._lock:
+            self.remaining = remaining
+            self.reset_at = reset_at
+
+    def throttled(self, response=None) -> None:
+        self.observe(response)
+        with self._lock:
+            self.remaining = 0
+            if self.reset_at is None or self.reset_at <= self._clock():
+                self.reset_at = self._clock() + RATE_LIMIT_FALLBACK_WAIT
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = self._clock()
+                if self.reset_at is not None and self.reset_at <= now:
+                    self.remaining, self.reset_at = None, None
+                if self.remaining is None or self.remaining > 0:
+                    if self.remaining is not None:
+                        self.remaining -= 1
+                    return
+                wait = self.reset_at - now + 1
+            print(f"X rate limit window exhausted, waiting {wait:.0f}s for it to reset.")
+            telemetry.count("throttled.x")
+            self._sleep(wait)
+
+
+@telemetry.traced("x.post")
+def post(
+    client: tweepy.Client,
+    data,
+    dry_run: bool = True,
+    max_workers: int = POST_MAX_WORKERS,
+    scheduler: RateLimitScheduler | None = None,
+    outbox: PostOutbox | None = None,
+) -> list:
     entries = _normalize_entries(data)
-    if not entries:
+    threads = [(_build_link(entry), _build_thread(entry)) for entry in entries]
+    if outbox is not None and not dry_run:
+        threads = outbox.schedule(threads)
+    else:
+        threads = [(None, thread) for _, thread in threads]
+    if not threads:
         print("No data to post.")
         return []
 
-    responses = []
-    for entry in entries:
-        thread = _build_thread(entry)
+    for _, thread in threads:
         for index, tweet in enumerate(thread):
             prefix = "Tweet" if index == 0 else f"Reply {index}"
             print(f"{prefix}: {tweet}")
 
-        if dry_run:
-            continue
+    if dry_run:
+        return []
 
-        try:
-            first = client.create_tweet(text=thread[0], user_auth=True)
-            responses.append(first)
-            last_id = first.data["id"]
-
-            for tweet in thread[1:]:
-                reply = client.create_tweet(text=tweet, in_reply_to_tweet_id=last_id, user_auth=True)
-                responses.append(reply)
-                last_id = reply.data["id"]
-        except tweepy.TweepyException as exc:
-            if "duplicate" in str(exc).lower():
-                print(f"Skipped duplicate content: {thread[0][:50]}...")
-            else:
-                print(f"Failed to post thread: {exc}")
+    scheduler = scheduler or RateLimitScheduler()
+    hooks = getattr(getattr(client, "session", None), "hooks", None)
+    if hooks is not None:
+        hooks.setdefault("response", []).append(scheduler.observe)
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            posted = list(
+                executor.map(lambda planned: _post_thread(client, planned[1], scheduler, outbox, planned[0]), threads)
+            )
+    finally:
+        if hooks is not None:
+            hooks["response"].remove(scheduler.observe)
+
+    return [response for thread_responses in posted for response in thread_responses]
+
+
+def _post_thread(
+    client: tweepy.Client,
+    thread: List[str],
+    scheduler: RateLimitScheduler,
+    outbox: PostOutbox | None = None,
+    key: str | None = None,
+) -> list:
+    posted_ids = outbox.posted_ids(key) if outbox is not None else []
+    last_id = posted_ids[-1] if posted_ids else None
+    if posted_ids:
+        print(f"Resuming thread after {len(posted_ids)} posted tweets: {thread[0][:50]}...")
 
+    responses = []
+    try:
+        for index in range(len(posted_ids), len(thread)):
+            response = _create_tweet(client, thread[index], last_id, scheduler)
+            last_id = response.data["id"]
+            if outbox is not None:
+                outbox.record(key, index, last_id)
+            responses.append(response)
+    except tweepy.TweepyException as exc:
+        if "duplicate" in str(exc).lower():
+            print(f"Skipped duplicate content: {thread[0][:50]}...")
+            if outbox is not None:
+                outbox.close(key, "duplicate")
+        else:
+            print(f"Failed to post thread: {exc}")
     return responses
 
 
+def _create_tweet(
+    client: tweepy.Client,
+    text: str,
+    in_reply_to: str | None = None,
+    scheduler: RateLimitScheduler | None = None,
+):
+    for attempt in range(RATE_LIMIT_RETRIES + 1):
+        if scheduler is not None:
+            scheduler.acquire()
+        try:
+            return _send_tweet(client, text, in_reply_to)
+        except tweepy.TooManyRequests as exc:
+            if scheduler is None or attempt == RATE_LIMIT_RETRIES:
+                raise
+            scheduler.throttled(exc.response)
+
+
+def _send_tweet(client: tweepy.Client, text: str, in_reply_to: str | None = None):
+    with telemetry.span("x.create_tweet", reply=in_reply_to is not None):
+        telemetry.count("api_calls.x.create_tweet")
+        telemetry.count("bytes.posted", len(text.encode("utf-8")))
+        if in_reply_to is None:
+            return client.create_tweet(text=text, user_auth=True)
+        return client.create_tweet(text=text, in_reply_to_tweet_id=in_reply_to, user_auth=True)
+
+
 def _collect_credentials() -> dict:
     values = {key: os.getenv(key) for key in REQUIRED_KEYS}
     missing = [key for key, value in values.items() if not value]
@@ -133,51 +251,101 @@ def _kv_pairs_to_dict(pairs: Iterable[str]) -> dict:
 
 
 def _build_thread(item: dict) -> List[str]:
-    tweets: List[str] = []
+    blocks: List[List[str]] = []
 
     title = item.get("title") or item.get("Title") or "Untitled"
     field = item.get("field_&_subfield") or item.get("field")
-    first_line = f"{title} — {field}" if field else title
-    tweets.append(first_line[:TWEET_LIMIT])
+    blocks.append([f"{title} — {field}" if field else title])
 
     for key in ("results_summary", "methodology", "one_sentence_summary", "summary"):
-        _extend_tweets(tweets, item.get(key))
+        _extend_blocks(blocks, item.get(key))
 
     for key in ("why_it_matters", "why_it_matters?", "reasoning"):
         if key in item:
-            _extend_tweets(tweets, item[key])
+            _extend_blocks(blocks, item[key])
             break
 
     contributions = _extract_contributions(item)
     if contributions:
-        _extend_tweets(tweets, "\n".join(contributions))
+        _extend_blocks(blocks, "\n".join(contributions))
 
     link = _build_link(item)
     if link:
-        tweets.append(link)
+        blocks.append([link])
 
-    return tweets
+    return _pack_tweets(blocks)
 
 
-def _extend_tweets(tweets: List[str], text: str | None) -> None:
+def _extend_blocks(blocks: List[List[str]], text: str | None) -> None:
     if not text:
         return
 
-    for chunk in _split_text(text):
-        tweets.append(chunk)
+    lines = _split_text(text)
+    if lines:
+        blocks.append(lines)
 
 
 def _split_text(text: str) -> List[str]:
-    parts: List[str] = []
-    for segment in text.replace("\r", "").split("\n"):
-        content = segment.strip()
-        if not content:
-            continue
-        while len(content) > TWEET_LIMIT:
-            parts.append(content[:TWEET_LIMIT])
-            content = content[TWEET_LIMIT:]
-        parts.append(content)
-    return parts
+    return [segment.strip() for segment in text.replace("\r", "").split("\n") if segment.strip()]
+
+
+def _pack_tweets(blocks: List[List[str]]) -> List[str]:
+    tweets: List[str] = []
+    current = ""
+    for block in blocks:
+        for position, line in enumerate(block):
+            separator = "\n" if position else "\n\n"
+            candidate = f"{current}{separator}{line}" if current else line
+            if tweet_length(candidate) <= TWEET_LIMIT:
+                current = candidate
+                continue
+            if tweet_length(line) <= TWEET_LIMIT:
+                tweets.append(current)
+                current = line
+                continue
+
+            for word in line.split():
+                for piece in _cut_word(word):
+                    candidate = f"{current}{separator}{piece}" if current else piece
+                    if tweet_length(candidate) <= TWEET_LIMIT:
+                        current = candidate
+                    else:
+                        if current:
+                            tweets.append(current)
+                        current = piece
+                    separator = " "
+
+    if current:
+        tweets.append(current)
+    return tweets
+
+
+def _cut_word(word: str) -> List[str]:
+    pieces = []
+    while tweet_length(word) > TWEET_LIMIT:
+        size = TWEET_LIMIT
+        while tweet_length(word[:size]) > TWEET_LIMIT:
+            size -= 1
+        pieces.append(word[:size])
+        word = word[size:]
+    pieces.append(word)
+    return pieces
+
+
+def tweet_length(text: str) -> int:
+    length = 0
+    position = 0
+    for match in URL_PATTERN.finditer(text):
+        length += sum(_char_weight(char) for char in text[position:match.start()]) + URL_LENGTH
+        position = match.end()
+    return length + sum(_char_weight(char) for char in text[position:])
+
+
+def _char_weight(char: str) -> int:
+    code = ord(char)
+    if code <= 0x10FF or 0x2000 <= code <= 0x200D or 0x2010 <= code <= 0x201F or 0x2032 <= code <= 0x2037:
+        return 1
+    return 2
 
 
 def _extract_contributions(item: dict) -> List[str]: